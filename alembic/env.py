@@ -10,7 +10,7 @@ sys.path.insert(0, BASE_DIR)
 sys.path.insert(0, os.path.join(BASE_DIR, "backend"))
 
 from backend.app.api.core.db import Base
-from backend.app.api.models import user, event, group, chat, attendance
+from backend.app.api.models import user, event, group, chat, attendance, geocode, session
 
 config = context.config
 
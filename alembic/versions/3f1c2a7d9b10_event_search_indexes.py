@@ -0,0 +1,59 @@
+"""event search indexes
+
+Revision ID: 3f1c2a7d9b10
+Revises: 
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f1c2a7d9b10'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+EVENT_SEARCH_DOCUMENT = (
+    "setweight(to_tsvector('russian', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('russian', coalesce(description, '')), 'B')"
+)
+
+TRGM_INDEXES = [
+    ("ix_events_title_trgm", "events", "title"),
+    ("ix_users_name_trgm", "users", "name"),
+    ("ix_users_email_trgm", "users", "email"),
+    ("ix_groups_name_trgm", "groups", "name"),
+    ("ix_groups_description_trgm", "groups", "description"),
+]
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return
+    # On a fresh database the tables (and these indexes) are created by the
+    # application on startup, so there is nothing to migrate yet.
+    if not sa.inspect(bind).has_table("events"):
+        return
+
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_events_search_document "
+        f"ON events USING gin (({EVENT_SEARCH_DOCUMENT}))"
+    )
+    for name, table, column in TRGM_INDEXES:
+        op.execute(
+            f"CREATE INDEX IF NOT EXISTS {name} "
+            f"ON {table} USING gin ({column} gin_trgm_ops)"
+        )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    for name, _, _ in TRGM_INDEXES:
+        op.execute(f"DROP INDEX IF EXISTS {name}")
+    op.execute("DROP INDEX IF EXISTS ix_events_search_document")
@@ -0,0 +1,45 @@
+"""catalog composite indexes
+
+Revision ID: 8b2e4d6f1a37
+Revises: 3f1c2a7d9b10
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8b2e4d6f1a37'
+down_revision = '3f1c2a7d9b10'
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ("ix_events_category_date", "events", ["category_id", "date", "id"]),
+    ("ix_events_date_id", "events", ["date", "id"]),
+    ("ix_events_price_id", "events", ["price", "id"]),
+    ("ix_events_title_id", "events", ["title", "id"]),
+    ("ix_events_created_at_id", "events", ["created_at", "id"]),
+    ("ix_events_organizer_id", "events", ["organizer_id"]),
+    ("ix_attendance_user_event", "attendance", ["user_id", "event_id"]),
+    ("ix_attendance_event_id", "attendance", ["event_id"]),
+    ("ix_chat_messages_group_timestamp", "chat_messages", ["group_id", "timestamp"]),
+    ("ix_group_members_group_user", "group_members", ["group_id", "user_id"]),
+    ("ix_groups_event_id", "groups", ["event_id"]),
+]
+
+
+def upgrade() -> None:
+    # On a fresh database the tables (and these indexes) are created by the
+    # application on startup, so there is nothing to migrate yet.
+    if not sa.inspect(op.get_bind()).has_table("events"):
+        return
+
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, if_not_exists=True)
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table, if_exists=True)
@@ -0,0 +1,32 @@
+"""event latitude/longitude index
+
+Revision ID: a4d9e2b7c183
+Revises: f3a8c2d6e914
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a4d9e2b7c183'
+down_revision = 'f3a8c2d6e914'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if not sa.inspect(op.get_bind()).has_table("events"):
+        return
+
+    op.create_index(
+        "ix_events_lat_lon",
+        "events",
+        ["latitude", "longitude"],
+        if_not_exists=True
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_events_lat_lon", table_name="events")
@@ -0,0 +1,29 @@
+"""user avatar variants
+
+Revision ID: b8e1f4c2a957
+Revises: a4d9e2b7c183
+Create Date: 2026-10-18 17:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b8e1f4c2a957'
+down_revision = 'a4d9e2b7c183'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table("users"):
+        return
+
+    if "avatar_variants" not in {c["name"] for c in inspector.get_columns("users")}:
+        op.add_column("users", sa.Column("avatar_variants", sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("users", "avatar_variants")
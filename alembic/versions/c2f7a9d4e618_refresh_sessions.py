@@ -0,0 +1,40 @@
+"""refresh sessions table
+
+Revision ID: c2f7a9d4e618
+Revises: b8e1f4c2a957
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c2f7a9d4e618'
+down_revision = 'b8e1f4c2a957'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table("refresh_sessions"):
+        op.create_table(
+            "refresh_sessions",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("token_hash", sa.String(length=64), nullable=False),
+            sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+            sa.Column("user_agent", sa.String(length=255), nullable=True),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+            sa.Column("last_used_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+            sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+            sa.UniqueConstraint("token_hash"),
+        )
+
+    op.create_index("ix_refresh_sessions_id", "refresh_sessions", ["id"], if_not_exists=True)
+    op.create_index("ix_refresh_sessions_user_id", "refresh_sessions", ["user_id"], if_not_exists=True)
+    op.create_index("ix_refresh_sessions_expires_at", "refresh_sessions", ["expires_at"], if_not_exists=True)
+
+
+def downgrade() -> None:
+    op.drop_table("refresh_sessions")
@@ -0,0 +1,47 @@
+"""denormalized participant and member counters
+
+Revision ID: c5a9e1f3d284
+Revises: 8b2e4d6f1a37
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c5a9e1f3d284'
+down_revision = '8b2e4d6f1a37'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table("events"):
+        return
+
+    if "participants_count" not in {c["name"] for c in inspector.get_columns("events")}:
+        op.add_column(
+            "events",
+            sa.Column("participants_count", sa.Integer(), server_default="0", nullable=False)
+        )
+    if "members_count" not in {c["name"] for c in inspector.get_columns("groups")}:
+        op.add_column(
+            "groups",
+            sa.Column("members_count", sa.Integer(), server_default="0", nullable=False)
+        )
+
+    op.execute(
+        "UPDATE events SET participants_count = "
+        "(SELECT count(*) FROM attendance WHERE attendance.event_id = events.id)"
+    )
+    op.execute(
+        "UPDATE groups SET members_count = "
+        "(SELECT count(*) FROM group_members WHERE group_members.group_id = groups.id)"
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("groups", "members_count")
+    op.drop_column("events", "participants_count")
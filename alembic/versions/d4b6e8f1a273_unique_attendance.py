@@ -0,0 +1,43 @@
+"""unique attendance per user and event
+
+Revision ID: d4b6e8f1a273
+Revises: c2f7a9d4e618
+Create Date: 2026-10-18 20:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd4b6e8f1a273'
+down_revision = 'c2f7a9d4e618'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table("attendance"):
+        return
+
+    # Дубли, появившиеся из-за гонки, удаляются (остаётся самая ранняя запись),
+    # после чего счётчик участников пересчитывается заново.
+    op.execute(
+        "DELETE FROM attendance WHERE id NOT IN "
+        "(SELECT min(id) FROM attendance GROUP BY user_id, event_id)"
+    )
+    op.execute(
+        "UPDATE events SET participants_count = "
+        "(SELECT count(*) FROM attendance WHERE attendance.event_id = events.id)"
+    )
+
+    op.drop_index("ix_attendance_user_event", table_name="attendance", if_exists=True)
+    op.create_index(
+        "ix_attendance_user_event", "attendance", ["user_id", "event_id"], unique=True
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_attendance_user_event", table_name="attendance", if_exists=True)
+    op.create_index("ix_attendance_user_event", "attendance", ["user_id", "event_id"])
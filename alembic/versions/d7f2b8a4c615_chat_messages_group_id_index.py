@@ -0,0 +1,43 @@
+"""chat messages (group_id, id) index
+
+Revision ID: d7f2b8a4c615
+Revises: c5a9e1f3d284
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd7f2b8a4c615'
+down_revision = 'c5a9e1f3d284'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if not sa.inspect(op.get_bind()).has_table("chat_messages"):
+        return
+
+    op.create_index(
+        "ix_chat_messages_group_id_id",
+        "chat_messages",
+        ["group_id", "id"],
+        if_not_exists=True
+    )
+    op.drop_index(
+        "ix_chat_messages_group_timestamp",
+        table_name="chat_messages",
+        if_exists=True
+    )
+
+
+def downgrade() -> None:
+    op.create_index(
+        "ix_chat_messages_group_timestamp",
+        "chat_messages",
+        ["group_id", "timestamp"],
+        if_not_exists=True
+    )
+    op.drop_index("ix_chat_messages_group_id_id", table_name="chat_messages", if_exists=True)
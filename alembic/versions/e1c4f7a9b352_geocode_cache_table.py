@@ -0,0 +1,40 @@
+"""geocode cache table
+
+Revision ID: e1c4f7a9b352
+Revises: d7f2b8a4c615
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e1c4f7a9b352'
+down_revision = 'd7f2b8a4c615'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if sa.inspect(op.get_bind()).has_table("geocode_cache"):
+        return
+
+    op.create_table(
+        "geocode_cache",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("kind", sa.String(length=10), nullable=False),
+        sa.Column("key", sa.String(length=500), nullable=False),
+        sa.Column("latitude", sa.Float(), nullable=True),
+        sa.Column("longitude", sa.Float(), nullable=True),
+        sa.Column("address", sa.String(length=500), nullable=True),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.UniqueConstraint("kind", "key", name="uq_geocode_cache_kind_key"),
+    )
+    op.create_index("ix_geocode_cache_id", "geocode_cache", ["id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_geocode_cache_id", table_name="geocode_cache")
+    op.drop_table("geocode_cache")
@@ -0,0 +1,57 @@
+"""event geocode status
+
+Revision ID: f3a8c2d6e914
+Revises: e1c4f7a9b352
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f3a8c2d6e914'
+down_revision = 'e1c4f7a9b352'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table("events"):
+        return
+
+    columns = {c["name"] for c in inspector.get_columns("events")}
+    if "geocode_status" not in columns:
+        op.add_column(
+            "events",
+            sa.Column("geocode_status", sa.String(length=20), server_default="pending", nullable=False)
+        )
+    if "geocode_attempts" not in columns:
+        op.add_column(
+            "events",
+            sa.Column("geocode_attempts", sa.Integer(), server_default="0", nullable=False)
+        )
+    if "geocode_next_attempt_at" not in columns:
+        op.add_column(
+            "events",
+            sa.Column("geocode_next_attempt_at", sa.DateTime(timezone=True), nullable=True)
+        )
+
+    op.execute(
+        "UPDATE events SET geocode_status = 'done' "
+        "WHERE latitude IS NOT NULL AND longitude IS NOT NULL"
+    )
+    op.create_index(
+        "ix_events_geocode_queue",
+        "events",
+        ["geocode_status", "geocode_next_attempt_at"],
+        if_not_exists=True
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_events_geocode_queue", table_name="events")
+    op.drop_column("events", "geocode_next_attempt_at")
+    op.drop_column("events", "geocode_attempts")
+    op.drop_column("events", "geocode_status")
@@ -8,17 +8,75 @@ class Settings:
         "DATABASE_URL", 
         "postgresql://postgres:password@db:5432/eventtogether"
     )
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "20"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "40"))
 
     SECRET_KEY: str = os.getenv("SECRET_KEY", "your-secret-key-change-this")
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    REFRESH_TOKEN_EXPIRE_DAYS: int = int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", "365"))
+    SESSION_SWEEP_INTERVAL: float = float(os.getenv("SESSION_SWEEP_INTERVAL", "3600"))
+    USER_CACHE_TTL: float = float(os.getenv("USER_CACHE_TTL", "30"))
+    USER_CACHE_SIZE: int = int(os.getenv("USER_CACHE_SIZE", "10000"))
+    PASSWORD_HASH_WORKERS: int = int(os.getenv("PASSWORD_HASH_WORKERS", "0"))
+    PASSWORD_HASH_QUEUE: int = int(os.getenv("PASSWORD_HASH_QUEUE", "64"))
 
     S3_ENDPOINT: str = os.getenv("S3_ENDPOINT", "http://minio:9000")
     S3_ACCESS_KEY: str = os.getenv("S3_ACCESS_KEY", "minioadmin")
     S3_SECRET_KEY: str = os.getenv("S3_SECRET_KEY", "minioadmin")
     S3_BUCKET: str = os.getenv("S3_BUCKET", "events-bucket")
     S3_PUBLIC_URL: str = os.getenv("S3_PUBLIC_URL", "http://localhost:9000")
+    S3_MAX_POOL_CONNECTIONS: int = int(os.getenv("S3_MAX_POOL_CONNECTIONS", "20"))
+    S3_CONNECT_TIMEOUT: float = float(os.getenv("S3_CONNECT_TIMEOUT", "3"))
+    S3_READ_TIMEOUT: float = float(os.getenv("S3_READ_TIMEOUT", "30"))
+    S3_MULTIPART_PART_SIZE: int = int(os.getenv("S3_MULTIPART_PART_SIZE", str(5 * 1024 * 1024)))
+    AVATAR_MAX_SIZE: int = int(os.getenv("AVATAR_MAX_SIZE", str(5 * 1024 * 1024)))
+    AVATAR_VARIANT_SIZES: tuple = tuple(
+        int(size) for size in os.getenv("AVATAR_VARIANT_SIZES", "64,128,256").split(",")
+    )
+    AVATAR_UPLOAD_URL_TTL: int = int(os.getenv("AVATAR_UPLOAD_URL_TTL", "600"))
+    IMAGE_WORKERS: int = int(os.getenv("IMAGE_WORKERS", "2"))
 
     YANDEX_MAPS_API_KEY: str = os.getenv("YANDEX_MAPS_API_KEY", "")
+    MAPS_HTTP_TIMEOUT: float = float(os.getenv("MAPS_HTTP_TIMEOUT", "10"))
+    MAPS_HTTP_CONNECT_TIMEOUT: float = float(os.getenv("MAPS_HTTP_CONNECT_TIMEOUT", "3"))
+    MAPS_HTTP_MAX_CONNECTIONS: int = int(os.getenv("MAPS_HTTP_MAX_CONNECTIONS", "20"))
+    MAPS_HTTP_MAX_KEEPALIVE: int = int(os.getenv("MAPS_HTTP_MAX_KEEPALIVE", "10"))
+    MAPS_HTTP_CONCURRENCY: int = int(os.getenv("MAPS_HTTP_CONCURRENCY", "10"))
+    NEARBY_MAX_RADIUS_KM: float = float(os.getenv("NEARBY_MAX_RADIUS_KM", "200"))
+    MAPS_BATCH_MAX_ITEMS: int = int(os.getenv("MAPS_BATCH_MAX_ITEMS", "100"))
+    MAP_CLUSTER_GRID: int = int(os.getenv("MAP_CLUSTER_GRID", "4"))
+    MAP_MAX_TILES: int = int(os.getenv("MAP_MAX_TILES", "64"))
+    MAP_TILE_CACHE_TTL: float = float(os.getenv("MAP_TILE_CACHE_TTL", "60"))
+    MAP_TILE_CACHE_SIZE: int = int(os.getenv("MAP_TILE_CACHE_SIZE", "5000"))
+    GEOCODE_CACHE_TTL: int = int(os.getenv("GEOCODE_CACHE_TTL", str(30 * 24 * 3600)))
+    GEOCODE_CACHE_SIZE: int = int(os.getenv("GEOCODE_CACHE_SIZE", "10000"))
+    GEOCODE_REVERSE_PRECISION: int = int(os.getenv("GEOCODE_REVERSE_PRECISION", "4"))
+    GEOCODE_WORKER_ENABLED: bool = os.getenv("GEOCODE_WORKER_ENABLED", "true").lower() == "true"
+    GEOCODE_WORKER_INTERVAL: float = float(os.getenv("GEOCODE_WORKER_INTERVAL", "30"))
+    GEOCODE_WORKER_BATCH: int = int(os.getenv("GEOCODE_WORKER_BATCH", "20"))
+    GEOCODE_MAX_ATTEMPTS: int = int(os.getenv("GEOCODE_MAX_ATTEMPTS", "5"))
+    GEOCODE_RETRY_DELAY: float = float(os.getenv("GEOCODE_RETRY_DELAY", "60"))
+    GEOCODE_RETRY_MAX_DELAY: float = float(os.getenv("GEOCODE_RETRY_MAX_DELAY", "3600"))
+    GEOCODE_CLAIM_TIMEOUT: float = float(os.getenv("GEOCODE_CLAIM_TIMEOUT", "300"))
+
+    REDIS_URL: str = os.getenv("REDIS_URL", "")
+    BROKER_RETRY_DELAY: float = float(os.getenv("BROKER_RETRY_DELAY", "1"))
+    BROKER_RETRY_MAX_DELAY: float = float(os.getenv("BROKER_RETRY_MAX_DELAY", "30"))
+
+    CATEGORY_REGISTRY_MAX_AGE: float = float(os.getenv("CATEGORY_REGISTRY_MAX_AGE", "300"))
+
+    RESPONSE_CACHE_TTL: float = float(os.getenv("RESPONSE_CACHE_TTL", "30"))
+    RESPONSE_CACHE_SIZE: int = int(os.getenv("RESPONSE_CACHE_SIZE", "2000"))
+    RESPONSE_CACHE_MAX_AGE: int = int(os.getenv("RESPONSE_CACHE_MAX_AGE", "10"))
+
+    RATE_LIMIT_ENABLED: bool = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
+    RATE_LIMIT_TRUST_FORWARDED: bool = os.getenv("RATE_LIMIT_TRUST_FORWARDED", "false").lower() == "true"
+    RATE_LIMIT_LOGIN_IP: str = os.getenv("RATE_LIMIT_LOGIN_IP", "20/60")
+    RATE_LIMIT_LOGIN_ACCOUNT: str = os.getenv("RATE_LIMIT_LOGIN_ACCOUNT", "5/60")
+    RATE_LIMIT_REFRESH_IP: str = os.getenv("RATE_LIMIT_REFRESH_IP", "60/60")
+    RATE_LIMIT_REGISTER_IP: str = os.getenv("RATE_LIMIT_REGISTER_IP", "10/3600")
+
+    MEMBERSHIP_CACHE_TTL: float = float(os.getenv("MEMBERSHIP_CACHE_TTL", "5"))
 
 settings = Settings()
\ No newline at end of file
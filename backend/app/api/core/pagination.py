@@ -0,0 +1,71 @@
+import base64
+import json
+import math
+from datetime import datetime
+from typing import Any, Optional, Tuple
+from fastapi import HTTPException
+from sqlalchemy import and_, or_
+
+def encode_cursor(sort_by: str, order: str, value: Any, last_id: int) -> str:
+    if isinstance(value, datetime):
+        value = {"dt": value.isoformat()}
+    payload = {"s": sort_by, "o": order, "v": value, "id": last_id}
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+DATETIME_SORTS = {"date", "created_at"}
+
+def _valid_value(sort_by: str, value: Any, nullable: bool) -> bool:
+    """Значение курсора должно иметь тип колонки сортировки; None — только у nullable-колонок."""
+    if value is None:
+        return nullable
+    if sort_by in DATETIME_SORTS:
+        return isinstance(value, datetime)
+    if sort_by == "price":
+        return isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value)
+    if sort_by == "title":
+        return isinstance(value, str)
+    return False
+
+def decode_cursor(cursor: str, sort_by: str, order: str, nullable: bool = False) -> Tuple[Any, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        value = payload["v"]
+        if isinstance(value, dict):
+            value = datetime.fromisoformat(value["dt"])
+        last_id = int(payload["id"])
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    if payload.get("s") != sort_by or payload.get("o") != order:
+        raise HTTPException(
+            status_code=400,
+            detail="Cursor does not match the requested sort_by/order"
+        )
+    if not _valid_value(sort_by, value, nullable):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return value, last_id
+
+# NULL в nullable-колонке считается больше любого значения, как по умолчанию
+# в PostgreSQL: при asc такие строки идут последними, при desc — первыми.
+
+def keyset_condition(sort_column, id_column, order: str, value: Any, last_id: int, nullable: bool = False):
+    if value is None:
+        if order == "desc":
+            return or_(and_(sort_column.is_(None), id_column < last_id), sort_column.isnot(None))
+        return and_(sort_column.is_(None), id_column > last_id)
+
+    if order == "desc":
+        return or_(sort_column < value, and_(sort_column == value, id_column < last_id))
+    condition = or_(sort_column > value, and_(sort_column == value, id_column > last_id))
+    if nullable:
+        condition = or_(condition, sort_column.is_(None))
+    return condition
+
+def keyset_order_by(sort_column, id_column, order: str, nullable: bool = False):
+    if order == "desc":
+        column = sort_column.desc().nulls_first() if nullable else sort_column.desc()
+        return column, id_column.desc()
+    column = sort_column.asc().nulls_last() if nullable else sort_column.asc()
+    return column, id_column.asc()
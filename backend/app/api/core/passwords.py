@@ -0,0 +1,92 @@
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+from app.api.core.config import settings
+from app.api.core.security import get_password_hash, verify_password
+
+class PasswordHasherBusy(Exception):
+    """Очередь на хеширование переполнена — запрос нужно отклонить, а не ждать."""
+
+class PasswordHasher:
+    """bcrypt в отдельном ограниченном пуле потоков.
+
+    bcrypt отпускает GIL, поэтому потоки не блокируют event loop. Число
+    одновременно ожидающих задач ограничено max_workers + max_queue; сверх
+    этого вызов сразу получает PasswordHasherBusy.
+    """
+
+    def __init__(self, max_workers: int, max_queue: int):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self.total_wait = 0.0
+        self.total_run = 0.0
+        self.max_wait = 0.0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="bcrypt")
+        return self._executor
+
+    async def _submit(self, func: Callable[..., Any], *args) -> Any:
+        if self._pending >= self.max_workers + self.max_queue:
+            self.rejected += 1
+            raise PasswordHasherBusy()
+
+        self._pending += 1
+        submitted = time.perf_counter()
+        timings = {}
+
+        def run():
+            started = time.perf_counter()
+            try:
+                return func(*args)
+            finally:
+                timings["wait"] = started - submitted
+                timings["run"] = time.perf_counter() - started
+
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), run)
+        finally:
+            self._pending -= 1
+            if timings:
+                self.completed += 1
+                self.total_wait += timings["wait"]
+                self.total_run += timings["run"]
+                self.max_wait = max(self.max_wait, timings["wait"])
+
+    async def hash(self, password: str) -> str:
+        return await self._submit(get_password_hash, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._submit(verify_password, plain_password, hashed_password)
+
+    def stats(self) -> Dict[str, Any]:
+        completed = self.completed or 1
+        return {
+            "workers": self.max_workers,
+            "queue_limit": self.max_queue,
+            "running": min(self._pending, self.max_workers),
+            "queued": max(0, self._pending - self.max_workers),
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "avg_wait_ms": round(self.total_wait / completed * 1000, 2),
+            "max_wait_ms": round(self.max_wait * 1000, 2),
+            "avg_run_ms": round(self.total_run / completed * 1000, 2),
+        }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+password_hasher = PasswordHasher(
+    max_workers=settings.PASSWORD_HASH_WORKERS or min(4, os.cpu_count() or 1),
+    max_queue=settings.PASSWORD_HASH_QUEUE
+)
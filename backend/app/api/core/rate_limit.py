@@ -0,0 +1,169 @@
+import math
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+from fastapi import HTTPException, Request, status
+from app.api.core.config import settings
+
+def parse_rate(spec: str) -> Tuple[int, float]:
+    """'10/60' -> ёмкость 10 запросов, полностью восполняется за 60 секунд."""
+    capacity, period = spec.split("/", 1)
+    return int(capacity), float(period)
+
+class RateLimitBackend:
+    """Хранилище token bucket'ов: take возвращает 0, если токен выдан, иначе сколько секунд ждать."""
+
+    async def take(self, key: str, capacity: int, period: float) -> float:
+        raise NotImplementedError
+
+    async def reset(self) -> None:
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        pass
+
+def _refill(tokens: float, updated: float, now: float, capacity: int, period: float) -> float:
+    return min(float(capacity), tokens + (now - updated) * capacity / period)
+
+def _wait_time(tokens: float, capacity: int, period: float) -> float:
+    return (1 - tokens) * period / capacity
+
+class InMemoryRateLimitBackend(RateLimitBackend):
+    """Бэкенд одного процесса; старые бакеты вытесняются по LRU."""
+
+    def __init__(self, max_keys: int = 100000, clock=time.monotonic):
+        self.max_keys = max_keys
+        self.clock = clock
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+
+    async def take(self, key: str, capacity: int, period: float) -> float:
+        now = self.clock()
+        tokens, updated = self._buckets.pop(key, (float(capacity), now))
+        tokens = _refill(tokens, updated, now, capacity, period)
+
+        retry_after = 0.0
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            retry_after = _wait_time(tokens, capacity, period)
+
+        self._buckets[key] = (tokens, now)
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return retry_after
+
+    async def reset(self) -> None:
+        self._buckets.clear()
+
+class RedisRateLimitBackend(RateLimitBackend):
+    """Общие для всех воркеров бакеты в Redis: хеш tokens/ts под WATCH/MULTI."""
+
+    def __init__(self, url: Optional[str] = None, client=None, prefix: str = "ratelimit:", clock=time.time):
+        self.url = url
+        self.prefix = prefix
+        self.clock = clock
+        self._redis = client
+
+    def _client(self):
+        if self._redis is None:
+            import redis.asyncio as redis
+
+            self._redis = redis.from_url(self.url, decode_responses=True)
+        return self._redis
+
+    async def take(self, key: str, capacity: int, period: float) -> float:
+        bucket_key = f"{self.prefix}{key}"
+        result = {}
+
+        async def attempt(pipe):
+            now = self.clock()
+            tokens, updated = await pipe.hmget(bucket_key, "tokens", "ts")
+            if tokens is None or updated is None:
+                tokens = float(capacity)
+            else:
+                tokens = _refill(float(tokens), float(updated), now, capacity, period)
+
+            result["retry_after"] = 0.0
+            if tokens >= 1:
+                tokens -= 1
+            else:
+                result["retry_after"] = _wait_time(tokens, capacity, period)
+
+            pipe.multi()
+            pipe.hset(bucket_key, mapping={"tokens": tokens, "ts": now})
+            pipe.pexpire(bucket_key, int(period * 1000) + 1000)
+
+        await self._client().transaction(attempt, bucket_key)
+        return result["retry_after"]
+
+    async def reset(self) -> None:
+        client = self._client()
+        async for key in client.scan_iter(match=f"{self.prefix}*"):
+            await client.delete(key)
+
+    async def close(self) -> None:
+        if self._redis is not None:
+            await self._redis.aclose()
+            self._redis = None
+
+class RateLimit:
+    """Лимит на один эндпоинт: bucket на IP и, если передан account, на аккаунт.
+
+    Используется как зависимость (только IP) или вызовом hit(request, account)
+    внутри эндпоинта, когда аккаунт известен лишь из тела запроса.
+    """
+
+    def __init__(self, name: str, per_ip: Optional[str], per_account: Optional[str] = None, backend=None):
+        self.name = name
+        self.per_ip = parse_rate(per_ip) if per_ip else None
+        self.per_account = parse_rate(per_account) if per_account else None
+        self._backend = backend
+
+    @property
+    def backend(self) -> RateLimitBackend:
+        return self._backend or rate_limit_backend
+
+    async def __call__(self, request: Request) -> None:
+        await self.hit(request)
+
+    async def hit(self, request: Request, account: Optional[str] = None) -> None:
+        if not settings.RATE_LIMIT_ENABLED:
+            return
+
+        # Недоступный backend (например, Redis) не должен ронять логин для всех:
+        # ошибка логируется, а запрос пропускается без ограничения.
+        try:
+            retry_after = 0.0
+            if self.per_ip:
+                retry_after = await self.backend.take(f"{self.name}:ip:{client_ip(request)}", *self.per_ip)
+            if self.per_account and account and retry_after == 0:
+                key = f"{self.name}:account:{account.strip().lower()}"
+                retry_after = await self.backend.take(key, *self.per_account)
+        except Exception as e:
+            print(f"Rate limit backend error: {e!r}")
+            return
+
+        if retry_after > 0:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many requests, try again later",
+                headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+            )
+
+def client_ip(request: Request) -> str:
+    if settings.RATE_LIMIT_TRUST_FORWARDED:
+        forwarded = request.headers.get("x-forwarded-for")
+        if forwarded:
+            return forwarded.split(",")[0].strip()
+    return request.client.host if request.client else "unknown"
+
+def create_rate_limit_backend(url: str) -> RateLimitBackend:
+    if url.startswith("redis://") or url.startswith("rediss://"):
+        return RedisRateLimitBackend(url)
+    return InMemoryRateLimitBackend()
+
+rate_limit_backend = create_rate_limit_backend(settings.REDIS_URL)
+
+login_rate_limit = RateLimit("login", settings.RATE_LIMIT_LOGIN_IP, settings.RATE_LIMIT_LOGIN_ACCOUNT)
+refresh_rate_limit = RateLimit("refresh", settings.RATE_LIMIT_REFRESH_IP)
+register_rate_limit = RateLimit("register", settings.RATE_LIMIT_REGISTER_IP)
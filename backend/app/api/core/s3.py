@@ -1,67 +1,244 @@
+import asyncio
+import re
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 import boto3
 from botocore.client import Config
 from app.api.core.config import settings
-from io import BytesIO
+from typing import Any, AsyncIterator, Dict, Optional
+
+IMAGE_EXTENSIONS = {
+    "image/jpeg": ".jpg",
+    "image/png": ".png",
+    "image/webp": ".webp",
+}
+
+AVATAR_KEY_PATTERN = re.compile(r"^avatars/(\d+)/[0-9a-f-]{36}\.(jpg|png|webp)$")
+
+class UploadValidationError(ValueError):
+    pass
+
+_client = None
+_client_lock = threading.Lock()
+
+# boto3 блокирующий: все обращения к S3 из async-кода идут через этот пул,
+# размер которого совпадает с пулом соединений клиента.
+s3_executor = ThreadPoolExecutor(
+    max_workers=settings.S3_MAX_POOL_CONNECTIONS,
+    thread_name_prefix="s3"
+)
 
 def get_s3_client():
+    """Общий на процесс клиент S3: boto3-клиенты потокобезопасны и держат пул соединений."""
+    global _client
+    if _client is not None:
+        return _client
+
     if not settings.S3_ENDPOINT:
         raise ValueError("S3_ENDPOINT is not set!")
-        
-    return boto3.client(
-        's3',
-        endpoint_url=settings.S3_ENDPOINT,
-        aws_access_key_id=settings.S3_ACCESS_KEY,
-        aws_secret_access_key=settings.S3_SECRET_KEY,
-        config=Config(signature_version='s3v4'),
-        region_name='us-east-1'
-    )
 
-def upload_avatar(file_bytes, user_id: int, filename: str, content_type: str) -> str:
+    with _client_lock:
+        if _client is None:
+            _client = boto3.client(
+                's3',
+                endpoint_url=settings.S3_ENDPOINT,
+                aws_access_key_id=settings.S3_ACCESS_KEY,
+                aws_secret_access_key=settings.S3_SECRET_KEY,
+                config=Config(
+                    signature_version='s3v4',
+                    max_pool_connections=settings.S3_MAX_POOL_CONNECTIONS,
+                    connect_timeout=settings.S3_CONNECT_TIMEOUT,
+                    read_timeout=settings.S3_READ_TIMEOUT,
+                    retries={'max_attempts': 3, 'mode': 'standard'}
+                ),
+                region_name='us-east-1'
+            )
+    return _client
+
+def reset_s3_client():
+    global _client
+    with _client_lock:
+        _client = None
+
+def public_url(key: str) -> str:
+    return f"{settings.S3_PUBLIC_URL.rstrip('/')}/{settings.S3_BUCKET}/{key}"
+
+def avatar_key_from_url(file_url: str) -> str:
+    path = file_url.split('?')[0]
+    for base in (settings.S3_PUBLIC_URL, settings.S3_ENDPOINT):
+        prefix = f"{base.rstrip('/')}/{settings.S3_BUCKET}/"
+        if path.startswith(prefix):
+            return path[len(prefix):]
+    return path.split('/')[-1]
+
+async def run_in_s3_executor(func, *args, **kwargs):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(s3_executor, partial(func, *args, **kwargs))
+
+def sniff_image_type(header: bytes) -> Optional[str]:
+    """Определить тип изображения по сигнатуре, не доверяя Content-Type клиента."""
+    if header.startswith(b"\xff\xd8\xff"):
+        return "image/jpeg"
+    if header.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "image/png"
+    if header[:4] == b"RIFF" and header[8:12] == b"WEBP":
+        return "image/webp"
+    return None
+
+async def stream_avatar_upload(
+    chunks: AsyncIterator[bytes],
+    user_id: int,
+    max_size: int = settings.AVATAR_MAX_SIZE,
+    part_size: int = settings.S3_MULTIPART_PART_SIZE
+) -> str:
+    """Загрузить аватар из потока чанков.
+
+    Тип проверяется по первым байтам, размер — по мере чтения, так что
+    неподходящий файл отклоняется без дочитывания. В памяти держится не больше
+    одной части multipart-загрузки; файл, уместившийся в одну часть, уходит
+    обычным put_object.
+    """
     client = get_s3_client()
-    
-    import re
-    clean_filename = re.sub(r'[^\w\.-]', '_', filename)
-    key = f"avatars/{user_id}/{clean_filename}"
-    
-    if isinstance(file_bytes, BytesIO):
-        file_obj = file_bytes
-        file_obj.seek(0)
-    elif isinstance(file_bytes, bytes):
-        file_obj = BytesIO(file_bytes)
-    else:
-        raise TypeError(f"Expected bytes or BytesIO, got {type(file_bytes)}")
+    buffer = bytearray()
+    total = 0
+    key = None
+    content_type = None
+    upload_id = None
+    parts = []
 
-    try:
-        client.upload_fileobj(
-            file_obj, 
-            settings.S3_BUCKET,
-            key,
-            ExtraArgs={'ContentType': content_type}
+    async def flush_part(data: bytes) -> None:
+        nonlocal upload_id
+        if upload_id is None:
+            created = await run_in_s3_executor(
+                client.create_multipart_upload,
+                Bucket=settings.S3_BUCKET,
+                Key=key,
+                ContentType=content_type
+            )
+            upload_id = created["UploadId"]
+        part_number = len(parts) + 1
+        uploaded = await run_in_s3_executor(
+            client.upload_part,
+            Bucket=settings.S3_BUCKET,
+            Key=key,
+            UploadId=upload_id,
+            PartNumber=part_number,
+            Body=data
         )
-        print(f"File uploaded to: {settings.S3_BUCKET}/{key}")
-    except Exception as e:
-        print(f"S3 Upload Error: {e}")
+        parts.append({"ETag": uploaded["ETag"], "PartNumber": part_number})
+
+    try:
+        async for chunk in chunks:
+            if not chunk:
+                continue
+            total += len(chunk)
+            if total > max_size:
+                raise UploadValidationError(f"Максимальный размер файла — {max_size // (1024 * 1024)}MB")
+            buffer.extend(chunk)
+
+            if content_type is None and len(buffer) >= 12:
+                content_type = sniff_image_type(bytes(buffer[:12]))
+                if content_type is None:
+                    raise UploadValidationError("Разрешены только JPEG, PNG, WebP")
+                key = f"avatars/{user_id}/{uuid.uuid4()}{IMAGE_EXTENSIONS[content_type]}"
+
+            while content_type is not None and len(buffer) >= part_size:
+                await flush_part(bytes(buffer[:part_size]))
+                del buffer[:part_size]
+
+        if content_type is None:
+            content_type = sniff_image_type(bytes(buffer))
+            if content_type is None:
+                raise UploadValidationError("Разрешены только JPEG, PNG, WebP")
+            key = f"avatars/{user_id}/{uuid.uuid4()}{IMAGE_EXTENSIONS[content_type]}"
+
+        if upload_id is None:
+            await run_in_s3_executor(
+                client.put_object,
+                Bucket=settings.S3_BUCKET,
+                Key=key,
+                Body=bytes(buffer),
+                ContentType=content_type
+            )
+        else:
+            if buffer:
+                await flush_part(bytes(buffer))
+            await run_in_s3_executor(
+                client.complete_multipart_upload,
+                Bucket=settings.S3_BUCKET,
+                Key=key,
+                UploadId=upload_id,
+                MultipartUpload={"Parts": parts}
+            )
+    except BaseException:
+        if upload_id is not None:
+            try:
+                await run_in_s3_executor(
+                    client.abort_multipart_upload,
+                    Bucket=settings.S3_BUCKET,
+                    Key=key,
+                    UploadId=upload_id
+                )
+            except Exception as e:
+                print(f"S3 abort multipart error: {e}")
         raise
-    
-    public_url = f"http://localhost:9000/{settings.S3_BUCKET}/{key}"
-    print(f"📷 Public URL: {public_url}")
-    
-    return public_url
 
-def delete_avatar(file_url: str) -> bool:
+    return public_url(key)
+
+def create_avatar_upload(user_id: int, content_type: str) -> Dict[str, Any]:
+    """Подписанная POST-форма для загрузки аватара напрямую в S3.
+
+    Политика фиксирует ключ, Content-Type и допустимый размер, так что S3
+    сам отклонит чужой ключ или слишком большой файл.
+    """
+    if content_type not in IMAGE_EXTENSIONS:
+        raise UploadValidationError("Разрешены только JPEG, PNG, WebP")
+
+    key = f"avatars/{user_id}/{uuid.uuid4()}{IMAGE_EXTENSIONS[content_type]}"
+    presigned = get_s3_client().generate_presigned_post(
+        Bucket=settings.S3_BUCKET,
+        Key=key,
+        Fields={"Content-Type": content_type},
+        Conditions=[
+            {"Content-Type": content_type},
+            ["content-length-range", 1, settings.AVATAR_MAX_SIZE]
+        ],
+        ExpiresIn=settings.AVATAR_UPLOAD_URL_TTL
+    )
+    return {
+        "url": f"{settings.S3_PUBLIC_URL.rstrip('/')}/{settings.S3_BUCKET}",
+        "fields": presigned["fields"],
+        "key": key,
+        "expires_in": settings.AVATAR_UPLOAD_URL_TTL
+    }
+
+def verify_uploaded_avatar(user_id: int, key: str) -> str:
+    """Проверить загруженный напрямую объект и вернуть его публичный URL.
+
+    Неподходящий объект удаляется, чтобы не занимать место в бакете.
+    """
+    match = AVATAR_KEY_PATTERN.match(key)
+    if not match or int(match.group(1)) != user_id:
+        raise UploadValidationError("Некорректный ключ аватара")
+
     client = get_s3_client()
     try:
-        prefix = f"{settings.S3_ENDPOINT}/{settings.S3_BUCKET}/"
-        if prefix in file_url:
-            key = file_url.split('?')[0].replace(prefix, "")
-        else:
-            key = file_url.split('?')[0].split('/')[-1]
-            
-        client.delete_object(
-            Bucket=settings.S3_BUCKET, 
-            Key=key
+        head = client.head_object(Bucket=settings.S3_BUCKET, Key=key)
+    except client.exceptions.ClientError:
+        raise UploadValidationError("Файл не загружен")
+
+    header = b""
+    if 0 < head["ContentLength"] <= settings.AVATAR_MAX_SIZE:
+        obj = client.get_object(Bucket=settings.S3_BUCKET, Key=key, Range="bytes=0-11")
+        header = obj["Body"].read()
+
+    content_type = sniff_image_type(header)
+    if content_type is None or IMAGE_EXTENSIONS[content_type] != f".{match.group(2)}":
+        client.delete_object(Bucket=settings.S3_BUCKET, Key=key)
+        raise UploadValidationError(
+            f"Разрешены только JPEG, PNG, WebP до {settings.AVATAR_MAX_SIZE // (1024 * 1024)}MB"
         )
-        return True
-    except Exception as e:
-        print(f"Error deleting avatar: {e}")
-        return False
\ No newline at end of file
+
+    return public_url(key)
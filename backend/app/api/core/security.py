@@ -3,9 +3,11 @@ from typing import Optional
 from jose import JWTError, jwt
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.api.core.db import get_db
 from app.api.models.user import User
+from app.api.services.user_cache import load_user
 import os
 from dotenv import load_dotenv
 import bcrypt
@@ -31,6 +33,10 @@ def get_password_hash(password: str) -> str:
     hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
     return hashed.decode('utf-8')
 
+def access_token_claims(user: User) -> dict:
+    """Роль в токен не кладётся: права проверяются по актуальной записи пользователя."""
+    return {"sub": user.email, "user_id": user.id}
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
     if expires_delta:
@@ -45,65 +51,40 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
-def create_refresh_token(user_id: int, email: str):
-    expire = datetime.utcnow() + timedelta(days=365)
-    to_encode = {
-        "sub": email,
-        "user_id": user_id,
-        "exp": expire,
-        "type": "refresh"
-    }
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
-    return encoded_jwt
-
-async def get_current_user(
-    token: str = Depends(oauth2_scheme), 
-    db: Session = Depends(get_db)
-) -> User:
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
+async def get_user_from_access_token(token: str, db: AsyncSession) -> Optional[User]:
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         email: str = payload.get("sub")
         token_type: str = payload.get("type")
 
         if email is None or token_type != "access":
-            raise credentials_exception
+            return None
             
     except JWTError:
-        raise credentials_exception
+        return None
     
-    user = db.query(User).filter(User.email == email).first()
+    user_id = payload.get("user_id")
+    if user_id is not None:
+        user = await load_user(db, user_id)
+    else:
+        result = await db.execute(select(User).where(User.email == email))
+        user = result.scalars().first()
     if user is None or not user.is_active:
-        raise credentials_exception
+        return None
     return user
 
-def verify_refresh_token_in_db(refresh_token: str, db: Session) -> Optional[User]:
-    try:
-        payload = jwt.decode(refresh_token, SECRET_KEY, algorithms=[ALGORITHM])
-        
-        if payload.get("type") != "refresh":
-            return None
-            
-        email: str = payload.get("sub")
-        if email is None:
-            return None
-            
-        user = db.query(User).filter(User.email == email).first()
-        
-        if not user or not user.is_active:
-            return None
-            
-        if user.refresh_token != refresh_token:
-            return None
-            
-        return user
-        
-    except JWTError:
-        return None
+async def get_current_user(
+    token: str = Depends(oauth2_scheme), 
+    db: AsyncSession = Depends(get_db)
+) -> User:
+    user = await get_user_from_access_token(token, db)
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return user
 
 async def get_current_admin(current_user: User = Depends(get_current_user)):
     if current_user.role != "admin":
@@ -0,0 +1,86 @@
+from typing import AsyncIterator, Iterable, List
+from fastapi import Request
+from multipart.multipart import MultipartParser, parse_options_header
+from app.api.core.s3 import UploadValidationError
+
+# Запас на заголовки частей и boundary сверх размера самого файла.
+MULTIPART_OVERHEAD = 16 * 1024
+
+def check_content_length(request: Request, max_size: int) -> bool:
+    """False, если заявленный Content-Length заведомо больше допустимого тела."""
+    content_length = request.headers.get("content-length")
+    if content_length is None or not content_length.isdigit():
+        return True
+    return int(content_length) <= max_size + MULTIPART_OVERHEAD
+
+async def iter_form_file(request: Request, field: str, allowed_types: Iterable[str]) -> AsyncIterator[bytes]:
+    """Байты файла из поля field multipart-тела по мере их получения.
+
+    Тело не буферизуется: каждый чанк request.stream() сразу разбирается,
+    поэтому потребитель может прервать загрузку на первых байтах, а остаток
+    тела так и не будет прочитан.
+    """
+    content_type, params = parse_options_header(request.headers.get("content-type", ""))
+    boundary = params.get(b"boundary")
+    if content_type != b"multipart/form-data" or not boundary:
+        raise UploadValidationError("Ожидается multipart/form-data")
+
+    allowed = {value.encode() for value in allowed_types}
+    state = {"field": b"", "value": b"", "headers": {}, "current": False, "found": False, "done": False}
+    pending: List[bytes] = []
+
+    def on_part_begin():
+        state["headers"] = {}
+        state["current"] = False
+
+    def on_header_field(data, start, end):
+        state["field"] += data[start:end]
+
+    def on_header_value(data, start, end):
+        state["value"] += data[start:end]
+
+    def on_header_end():
+        state["headers"][state["field"].lower()] = state["value"]
+        state["field"] = b""
+        state["value"] = b""
+
+    def on_headers_finished():
+        _, disposition = parse_options_header(state["headers"].get(b"content-disposition", b""))
+        if disposition.get(b"name") != field.encode() or state["found"]:
+            return
+        part_type, _ = parse_options_header(state["headers"].get(b"content-type", b""))
+        if part_type not in allowed:
+            raise UploadValidationError("Разрешены только JPEG, PNG, WebP")
+        state["current"] = True
+        state["found"] = True
+
+    def on_part_data(data, start, end):
+        if state["current"]:
+            pending.append(data[start:end])
+
+    def on_part_end():
+        if state["current"]:
+            state["current"] = False
+            state["done"] = True
+
+    parser = MultipartParser(boundary, {
+        "on_part_begin": on_part_begin,
+        "on_part_data": on_part_data,
+        "on_part_end": on_part_end,
+        "on_header_field": on_header_field,
+        "on_header_value": on_header_value,
+        "on_header_end": on_header_end,
+        "on_headers_finished": on_headers_finished,
+    })
+
+    async for chunk in request.stream():
+        parser.write(chunk)
+        for data in pending:
+            yield data
+        pending.clear()
+        if state["done"]:
+            return
+
+    parser.finalize()
+    if not state["found"]:
+        raise UploadValidationError(f"Поле {field} не передано")
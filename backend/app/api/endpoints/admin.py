@@ -1,14 +1,22 @@
 from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session, joinedload, selectinload
-from sqlalchemy import or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+from sqlalchemy import func, or_, select
 from app.api.core.db import get_db
 from app.api.models.user import User
-from app.api.models.event import Event
+from app.api.models.event import Event, GEOCODE_PENDING
 from app.api.models.group import Group
 from app.api.schemas.group import GroupCatalog, GroupUpdate
 from app.api.schemas.user import UserResponse, UserUpdate
 from app.api.schemas.event import EventResponse, EventUpdate
+from app.api.core.passwords import password_hasher
+from app.api.services.counters import recalculate_counters
+from app.api.services.search import build_event_search
+from app.api.services.user_cache import invalidate_user
+from app.api.services.clusters import invalidate_point
+from app.api.services.geocoding import geocoding_worker
+from app.api.services.response_cache import invalidate_events, response_cache
 from app.api.core.security import get_current_admin, get_current_moderator, check_admin_or_moderator
 
 router = APIRouter()
@@ -18,27 +26,28 @@ async def get_all_users(
     skip: int = 0,
     limit: int = 100,
     search: Optional[str] = Query(None),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     admin: User = Depends(get_current_admin)
 ):
-    query = db.query(User)
+    query = select(User)
     if search:
-        query = query.filter(
+        query = query.where(
             or_(
                 User.name.ilike(f"%{search}%"),
                 User.email.ilike(f"%{search}%")
             )
         )
-    users = query.offset(skip).limit(limit).all()
+    result = await db.execute(query.offset(skip).limit(limit))
+    users = result.scalars().all()
     return users
 
 @router.get("/users/{user_id}", response_model=UserResponse)
 async def get_user(
     user_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     admin: User = Depends(get_current_admin)
 ):
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await db.get(User, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     return user
@@ -47,25 +56,26 @@ async def get_user(
 async def update_user_role(
     user_id: int,
     new_role: str = Query(..., description="user, moderator or admin"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     admin: User = Depends(get_current_admin)
 ):
     valid_roles = ["user", "moderator", "admin"]
     if new_role not in valid_roles:
         raise HTTPException(status_code=400, detail=f"Invalid role. Must be one of: {valid_roles}")
     
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await db.get(User, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
     if user.role == "admin" and new_role != "admin":
-        admin_count = db.query(User).filter(User.role == "admin").count()
+        admin_count = await db.scalar(select(func.count()).select_from(User).where(User.role == "admin"))
         if admin_count <= 1:
             raise HTTPException(status_code=400, detail="Cannot remove the last admin")
     
     user.role = new_role
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    await db.refresh(user)
+    await invalidate_user(user.id)
     
     return user
 
@@ -73,10 +83,10 @@ async def update_user_role(
 async def update_user(
     user_id: int,
     user_data: UserUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     admin: User = Depends(get_current_admin)
 ):
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await db.get(User, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
@@ -84,42 +94,43 @@ async def update_user(
     for field, value in update_data.items():
         setattr(user, field, value)
     
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    await db.refresh(user)
     return user
 
 
 @router.delete("/users/{user_id}")
 async def delete_user(
     user_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     admin: User = Depends(get_current_admin)
 ):
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await db.get(User, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     if user.role == "admin":
         raise HTTPException(status_code=400, detail="Cannot delete admin user")
     
-    db.delete(user)
-    db.commit()
+    await db.delete(user)
+    await db.commit()
     return {"message": f"User {user_id} deleted successfully"}
 
 
 @router.post("/users/{user_id}/toggle-active")
 async def toggle_user_active(
     user_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     admin: User = Depends(get_current_admin)
 ):
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await db.get(User, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     if user.role == "admin":
         raise HTTPException(status_code=400, detail="Cannot deactivate admin user")
     
     user.is_active = not user.is_active
-    db.commit()
+    await db.commit()
+    await invalidate_user(user.id)
     return {"message": f"User {user_id} {'activated' if user.is_active else 'deactivated'}"}
 
 
@@ -128,46 +139,64 @@ async def get_all_events(
     skip: int = 0,
     limit: int = 100,
     search: Optional[str] = Query(None),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(check_admin_or_moderator)
 ):
-    query = db.query(Event)
-    if search:
-        query = query.filter(Event.title.ilike(f"%{search}%"))
-    events = query.offset(skip).limit(limit).all()
+    query = select(Event)
+    if search and search.strip():
+        condition, rank = build_event_search(db.bind.dialect.name, search)
+        query = query.where(condition).order_by(rank.desc(), Event.id.desc())
+    result = await db.execute(query.offset(skip).limit(limit))
+    events = result.scalars().all()
     return events
 
 @router.put("/events/{event_id}", response_model=EventResponse)
 async def admin_update_event(
     event_id: int,
     event_data: EventUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(check_admin_or_moderator)
 ):
-    event = db.query(Event).filter(Event.id == event_id).first()
+    event = await db.get(Event, event_id)
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
     
     update_data = event_data.dict(exclude_unset=True)
+    location_changed = "location" in update_data and update_data["location"] != event.location
     for field, value in update_data.items():
         setattr(event, field, value)
+
+    old_coords = (event.latitude, event.longitude)
+    if location_changed:
+        event.latitude = None
+        event.longitude = None
+        event.geocode_status = GEOCODE_PENDING
+        event.geocode_attempts = 0
+        event.geocode_next_attempt_at = None
     
-    db.commit()
-    db.refresh(event)
+    await db.commit()
+    await db.refresh(event)
+    if location_changed:
+        invalidate_point(*old_coords)
+        geocoding_worker.notify()
+    await invalidate_events(event_id)
     return event
 
 @router.delete("/events/{event_id}")
 async def admin_delete_event(
     event_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(check_admin_or_moderator)
 ):
-    event = db.query(Event).filter(Event.id == event_id).first()
+    event = await db.get(Event, event_id)
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
     
-    db.delete(event)
-    db.commit()
+    coords = (event.latitude, event.longitude)
+    await db.delete(event)
+    await db.commit()
+    invalidate_point(*coords)
+    await invalidate_events(event_id)
     return {"message": f"Event {event_id} deleted successfully"}
 
 
@@ -176,21 +205,19 @@ async def get_all_groups(
     skip: int = 0,
     limit: int = 100,
     search: Optional[str] = Query(None),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(check_admin_or_moderator)
 ):
-    query = db.query(Group).options(
-        joinedload(Group.organizer),
-        selectinload(Group.members)
-    )
+    query = select(Group).options(joinedload(Group.organizer))
     if search:
-        query = query.filter(
+        query = query.where(
             or_(
                 Group.name.ilike(f"%{search}%"),
                 Group.description.ilike(f"%{search}%")
             )
         )
-    groups = query.offset(skip).limit(limit).all()
+    result = await db.execute(query.offset(skip).limit(limit))
+    groups = result.scalars().unique().all()
     
     result = []
     for group in groups:
@@ -211,13 +238,13 @@ async def get_all_groups(
 async def admin_update_group(
     group_id: int,
     group_data: GroupUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(check_admin_or_moderator)
 ):
-    group = db.query(Group).options(
-        joinedload(Group.organizer),
-        selectinload(Group.members)
-    ).filter(Group.id == group_id).first()
+    result = await db.execute(
+        select(Group).options(joinedload(Group.organizer)).where(Group.id == group_id)
+    )
+    group = result.scalars().first()
     if not group:
         raise HTTPException(status_code=404, detail="Group not found")
     
@@ -225,8 +252,7 @@ async def admin_update_group(
     for field, value in update_data.items():
         setattr(group, field, value)
     
-    db.commit()
-    db.refresh(group)
+    await db.commit()
     
     return {
         "id": group.id,
@@ -243,31 +269,44 @@ async def admin_update_group(
 @router.delete("/groups/{group_id}")
 async def admin_delete_group(
     group_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(check_admin_or_moderator)
 ):
-    group = db.query(Group).filter(Group.id == group_id).first()
+    group = await db.get(Group, group_id)
     if not group:
         raise HTTPException(status_code=404, detail="Group not found")
     
-    db.delete(group)
-    db.commit()
+    await db.delete(group)
+    await db.commit()
     return {"message": f"Group {group_id} deleted successfully"}
 
 @router.post("/groups/{group_id}/toggle-status")
 async def toggle_group_status(
     group_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(check_admin_or_moderator)
 ):
-    group = db.query(Group).filter(Group.id == group_id).first()
+    group = await db.get(Group, group_id)
     if not group:
         raise HTTPException(status_code=404, detail="Group not found")
     
     group.is_open = not group.is_open
-    db.commit()
+    await db.commit()
     
     return {
         "message": f"Group status updated to {'open' if group.is_open else 'closed'}",
         "is_open": group.is_open
-    }
\ No newline at end of file
+    }
+
+@router.post("/maintenance/recalculate-counters")
+async def recalculate_counters_endpoint(
+    db: AsyncSession = Depends(get_db),
+    admin: User = Depends(get_current_admin)
+):
+    result = await recalculate_counters(db)
+    await response_cache.invalidate_all()
+    return result
+
+@router.get("/metrics/password-hasher")
+async def password_hasher_metrics(admin: User = Depends(get_current_admin)):
+    return password_hasher.stats()
@@ -1,47 +1,51 @@
 from typing import List
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.api.core.db import get_db
 from app.api.models.attendance import Attendance
 from app.api.models.event import Event
 from app.api.models.user import User
 from app.api.schemas.attendance import AttendanceRecord, AttendanceCreate
 from app.api.core.security import get_current_user
+from app.api.services.response_cache import invalidate_events
 
 router = APIRouter()
 
 @router.get("/my", response_model=List[AttendanceRecord])
 async def get_my_attendance(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    attendance_records = db.query(Attendance).filter(Attendance.user_id == current_user.id).all()
-    
-    records = []
-    for record in attendance_records:
-        records.append(AttendanceRecord(
-            event_id=record.event_id,
-            event_title=record.event.title,
-            attended=record.attended,
-            date=record.date
-        ))
+    result = await db.execute(
+        select(Attendance.event_id, Event.title, Attendance.attended, Attendance.date)
+        .join(Event, Event.id == Attendance.event_id)
+        .where(Attendance.user_id == current_user.id)
+    )
     
-    return records
+    return [
+        AttendanceRecord(event_id=event_id, event_title=title, attended=attended, date=date)
+        for event_id, title, attended, date in result.all()
+    ]
 
 @router.post("/", response_model=AttendanceRecord)
 async def create_attendance_record(
     attendance_data: AttendanceCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    event = db.query(Event).filter(Event.id == attendance_data.event_id).first()
-    if not event:
+    event_title = await db.scalar(select(Event.title).where(Event.id == attendance_data.event_id))
+    if event_title is None:
         raise HTTPException(status_code=404, detail="Event not found")
     
-    existing_record = db.query(Attendance).filter(
-        Attendance.user_id == current_user.id,
-        Attendance.event_id == attendance_data.event_id
-    ).first()
+    result = await db.execute(
+        select(Attendance).where(
+            Attendance.user_id == current_user.id,
+            Attendance.event_id == attendance_data.event_id
+        )
+    )
+    existing_record = result.scalars().first()
     
     if existing_record:
         raise HTTPException(status_code=400, detail="Attendance record already exists")
@@ -52,13 +56,25 @@ async def create_attendance_record(
         attended=attendance_data.attended
     )
     
-    db.add(db_attendance)
-    db.commit()
-    db.refresh(db_attendance)
+    # Вставка и инкремент в одной транзакции: при гонке уникальный индекс
+    # отклонит вторую запись до того, как счётчик будет увеличен.
+    try:
+        db.add(db_attendance)
+        await db.flush()
+        await db.execute(
+            update(Event)
+            .where(Event.id == attendance_data.event_id)
+            .values(participants_count=Event.participants_count + 1)
+        )
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(status_code=400, detail="Attendance record already exists")
+    await invalidate_events(attendance_data.event_id)
     
     return AttendanceRecord(
         event_id=db_attendance.event_id,
-        event_title=event.title,
+        event_title=event_title,
         attended=db_attendance.attended,
         date=db_attendance.date
     )
@@ -67,18 +83,21 @@ async def create_attendance_record(
 async def update_attendance(
     event_id: int,
     attended: bool,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    attendance_record = db.query(Attendance).filter(
-        Attendance.user_id == current_user.id,
-        Attendance.event_id == event_id
-    ).first()
+    result = await db.execute(
+        select(Attendance).where(
+            Attendance.user_id == current_user.id,
+            Attendance.event_id == event_id
+        )
+    )
+    attendance_record = result.scalars().first()
     
     if not attendance_record:
         raise HTTPException(status_code=404, detail="Attendance record not found")
     
     attendance_record.attended = attended
-    db.commit()
+    await db.commit()
     
     return {"message": f"Attendance for event {event_id} updated to {attended}"}
\ No newline at end of file
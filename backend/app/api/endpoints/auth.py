@@ -1,31 +1,46 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.api.core.db import get_db
 from app.api.models.user import User
-from app.api.schemas.user import UserCreate, UserResponse, Token, TokenRefresh
+from app.api.schemas.user import UserCreate, UserResponse, Token, TokenRefresh, SessionResponse
 from app.api.core.security import (
     get_current_user, 
     create_access_token, 
-    create_refresh_token, 
-    verify_refresh_token_in_db
+    access_token_claims
 )
+from app.api.core.passwords import password_hasher, PasswordHasherBusy
+from app.api.core.rate_limit import login_rate_limit, refresh_rate_limit, register_rate_limit
 from app.api.services.auth import AuthService
+from app.api.services.sessions import SessionService, get_session_service
 
 router = APIRouter(tags=["authentication"])
 
-@router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-async def register(user_data: UserCreate, db: Session = Depends(get_db)):
-    auth_service = AuthService(db)
-    
-    existing_user = db.query(User).filter(User.email == user_data.email).first()
+@router.post(
+    "/register",
+    response_model=UserResponse,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(register_rate_limit)]
+)
+async def register(user_data: UserCreate, db: AsyncSession = Depends(get_db)):
+    result = await db.execute(select(User).where(User.email == user_data.email))
+    existing_user = result.scalars().first()
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
         )
     
-    hashed_password = auth_service.get_password_hash(user_data.password)
+    try:
+        hashed_password = await password_hasher.hash(user_data.password)
+    except PasswordHasherBusy:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Server is busy, try again later",
+            headers={"Retry-After": "1"},
+        )
     db_user = User(
         email=user_data.email,
         name=user_data.name,
@@ -33,16 +48,28 @@ async def register(user_data: UserCreate, db: Session = Depends(get_db)):
         role="user"
     )
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    await db.refresh(db_user)
     
     return db_user
 
 @router.post("/login", response_model=Token)
-async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
+async def login(
+    request: Request,
+    form_data: OAuth2PasswordRequestForm = Depends(),
+    db: AsyncSession = Depends(get_db)
+):
+    await login_rate_limit.hit(request, account=form_data.username)
     auth_service = AuthService(db)
     
-    user = auth_service.authenticate_user(form_data.username, form_data.password)
+    try:
+        user = await auth_service.authenticate_user(form_data.username, form_data.password)
+    except PasswordHasherBusy:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Server is busy, try again later",
+            headers={"Retry-After": "1"},
+        )
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -50,11 +77,8 @@ async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session =
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    access_token = create_access_token(data={"sub": user.email, "user_id": user.id})
-    refresh_token = create_refresh_token(user.id, user.email)
-
-    user.refresh_token = refresh_token
-    db.commit()
+    access_token = create_access_token(data=access_token_claims(user))
+    refresh_token = await auth_service.create_refresh_token(user, request.headers.get("user-agent"))
     
     return {
         "access_token": access_token,
@@ -62,22 +86,22 @@ async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session =
         "token_type": "bearer"
     }
 
-@router.post("/refresh", response_model=Token)
-async def refresh_token_endpoint(token_data: TokenRefresh, db: Session = Depends(get_db)):
-    user = verify_refresh_token_in_db(token_data.refresh_token, db)
+@router.post("/refresh", response_model=Token, dependencies=[Depends(refresh_rate_limit)])
+async def refresh_token_endpoint(
+    token_data: TokenRefresh,
+    sessions: SessionService = Depends(get_session_service)
+):
+    rotated = await sessions.rotate(token_data.refresh_token)
     
-    if not user:
+    if not rotated:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Session expired or invalid (logged out from another device)",
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    new_access_token = create_access_token(data={"sub": user.email, "user_id": user.id})
-    new_refresh_token = create_refresh_token(user.id, user.email)
-
-    user.refresh_token = new_refresh_token
-    db.commit()
+    user, new_refresh_token = rotated
+    new_access_token = create_access_token(data=access_token_claims(user))
     
     return {
         "access_token": new_access_token,
@@ -89,22 +113,38 @@ async def refresh_token_endpoint(token_data: TokenRefresh, db: Session = Depends
 async def logout(
     token_data: TokenRefresh,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    sessions: SessionService = Depends(get_session_service)
 ):
-    current_user.refresh_token = None
-    db.commit()
+    await sessions.revoke(token_data.refresh_token, user_id=current_user.id)
     
     return {"message": "Successfully logged out"}
 
 @router.post("/logout-all")
 async def logout_all_sessions(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    sessions: SessionService = Depends(get_session_service)
+):
+    revoked = await sessions.revoke_all(current_user.id)
+    
+    return {"message": "All sessions revoked", "revoked": revoked}
+
+@router.get("/sessions", response_model=List[SessionResponse])
+async def list_sessions(
+    current_user: User = Depends(get_current_user),
+    sessions: SessionService = Depends(get_session_service)
+):
+    return await sessions.list_for_user(current_user.id)
+
+@router.delete("/sessions/{session_id}")
+async def revoke_session(
+    session_id: int,
+    current_user: User = Depends(get_current_user),
+    sessions: SessionService = Depends(get_session_service)
 ):
-    current_user.refresh_token = None
-    db.commit()
+    if not await sessions.revoke_by_id(current_user.id, session_id):
+        raise HTTPException(status_code=404, detail="Session not found")
     
-    return {"message": "All sessions revoked"}
+    return {"message": "Session revoked"}
 
 @router.get("/me", response_model=UserResponse)
 async def get_current_user_profile(current_user: User = Depends(get_current_user)):
@@ -1,56 +1,64 @@
 from typing import List
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.api.core.db import get_db
 from app.api.models.category import Category
+from app.api.models.event import Event
 from app.api.models.user import User
 from app.api.schemas.category import CategoryCreate, CategoryUpdate, CategoryResponse
 from app.api.core.security import check_admin_or_moderator
+from app.api.services.categories import category_registry
+from app.api.services.response_cache import response_cache
 
 router = APIRouter()
 
 @router.get("/", response_model=List[CategoryResponse])
 async def get_categories(
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Получить все категории (доступно всем)"""
-    categories = db.query(Category).order_by(Category.name).all()
-    return categories
+    return await category_registry.all(db)
 
 @router.post("/", response_model=CategoryResponse)
 async def create_category(
     category_data: CategoryCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(check_admin_or_moderator)
 ):
     """Создать новую категорию (только админ/модератор)"""
-    existing_category = db.query(Category).filter(Category.name == category_data.name).first()
+    result = await db.execute(select(Category).where(Category.name == category_data.name))
+    existing_category = result.scalars().first()
     if existing_category:
         raise HTTPException(status_code=400, detail="Category with this name already exists")
     
     db_category = Category(**category_data.dict())
     db.add(db_category)
-    db.commit()
-    db.refresh(db_category)
+    await db.commit()
+    await db.refresh(db_category)
+    await category_registry.invalidate(db)
     return db_category
 
 @router.put("/{category_id}", response_model=CategoryResponse)
 async def update_category(
     category_id: int,
     category_data: CategoryUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(check_admin_or_moderator)
 ):
     """Обновить категорию (только админ/модератор)"""
-    category = db.query(Category).filter(Category.id == category_id).first()
+    category = await db.get(Category, category_id)
     if not category:
         raise HTTPException(status_code=404, detail="Category not found")
     
     if category_data.name and category_data.name != category.name:
-        existing_category = db.query(Category).filter(
-            Category.name == category_data.name,
-            Category.id != category_id
-        ).first()
+        result = await db.execute(
+            select(Category).where(
+                Category.name == category_data.name,
+                Category.id != category_id
+            )
+        )
+        existing_category = result.scalars().first()
         if existing_category:
             raise HTTPException(status_code=400, detail="Category with this name already exists")
     
@@ -58,27 +66,31 @@ async def update_category(
     for field, value in update_data.items():
         setattr(category, field, value)
     
-    db.commit()
-    db.refresh(category)
+    await db.commit()
+    await db.refresh(category)
+    await category_registry.invalidate(db)
+    await response_cache.invalidate_all()
     return category
 
 @router.delete("/{category_id}")
 async def delete_category(
     category_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(check_admin_or_moderator)
 ):
     """Удалить категорию (только админ/модератор)"""
-    category = db.query(Category).filter(Category.id == category_id).first()
+    category = await db.get(Category, category_id)
     if not category:
         raise HTTPException(status_code=404, detail="Category not found")
     
-    if category.events:
+    has_events = await db.scalar(select(Event.id).where(Event.category_id == category_id).limit(1))
+    if has_events:
         raise HTTPException(
             status_code=400, 
             detail="Cannot delete category with events. Reassign events first."
         )
     
-    db.delete(category)
-    db.commit()
+    await db.delete(category)
+    await db.commit()
+    await category_registry.invalidate(db)
     return {"message": f"Category {category_id} deleted successfully"}
\ No newline at end of file
@@ -1,43 +1,85 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+import asyncio
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, status, Query, WebSocket, WebSocketDisconnect
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
 from app.api.core.db import get_db
 from app.api.models.chat import ChatMessage
 from app.api.models.group import Group
 from app.api.models.user import User
 from app.api.schemas.chat import ChatMessage as ChatMessageSchema, ChatMessageCreate
-from app.api.core.security import get_current_user
+from app.api.core.security import get_current_user, get_user_from_access_token
+from app.api.services.broker import broker
+from app.api.services.membership import MembershipService, get_membership_service
+from app.api.services.user_cache import load_user
 
 router = APIRouter()
 
+def chat_channel(group_id: int) -> str:
+    return f"chat:{group_id}"
+
+async def _wait_for_disconnect(websocket: WebSocket) -> None:
+    try:
+        while True:
+            await websocket.receive_text()
+    except WebSocketDisconnect:
+        pass
+
+async def _can_receive(db: AsyncSession, group_id: int, user_id: int) -> bool:
+    """Повторная проверка перед доставкой: вышедший из группы или деактивированный
+    пользователь отключается. Пока записи в кэшах свежие, БД не запрашивается."""
+    try:
+        user = await load_user(db, user_id)
+        if user is None or not user.is_active:
+            return False
+        return await MembershipService(db).is_member(group_id, user_id)
+    finally:
+        await db.close()
+
 @router.get("/groups/{group_id}/messages", response_model=List[ChatMessageSchema])
 async def get_chat_messages(
     group_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    after_id: Optional[int] = Query(None, ge=0, description="Только сообщения новее этого id"),
+    before_id: Optional[int] = Query(None, ge=1, description="Только сообщения старше этого id"),
+    limit: int = Query(50, ge=1, le=200),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+    membership: MembershipService = Depends(get_membership_service)
 ):
-    group = db.query(Group).filter(Group.id == group_id).first()
+    group = await db.get(Group, group_id)
     if not group:
         raise HTTPException(status_code=404, detail="Group not found")
     
-    if current_user not in group.members:
+    if not await membership.is_member(group_id, current_user.id):
         raise HTTPException(status_code=403, detail="Not a member of this group")
     
-    messages = db.query(ChatMessage).filter(ChatMessage.group_id == group_id).order_by(ChatMessage.timestamp).all()
-    return messages
+    query = select(ChatMessage).options(joinedload(ChatMessage.user)).where(ChatMessage.group_id == group_id)
+    if before_id is not None:
+        query = query.where(ChatMessage.id < before_id)
+
+    if after_id is not None:
+        query = query.where(ChatMessage.id > after_id).order_by(ChatMessage.id.asc())
+        result = await db.execute(query.limit(limit))
+        return result.scalars().all()
+
+    result = await db.execute(query.order_by(ChatMessage.id.desc()).limit(limit))
+    messages = result.scalars().all()
+    return list(reversed(messages))
 
 @router.post("/groups/{group_id}/messages", response_model=ChatMessageSchema)
 async def create_chat_message(
     group_id: int,
     message_data: ChatMessageCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+    membership: MembershipService = Depends(get_membership_service)
 ):
-    group = db.query(Group).filter(Group.id == group_id).first()
+    group = await db.get(Group, group_id)
     if not group:
         raise HTTPException(status_code=404, detail="Group not found")
     
-    if current_user not in group.members:
+    if not await membership.is_member(group_id, current_user.id):
         raise HTTPException(status_code=403, detail="Not a member of this group")
     
     db_message = ChatMessage(
@@ -47,6 +89,52 @@ async def create_chat_message(
     )
     
     db.add(db_message)
-    db.commit()
-    db.refresh(db_message)
-    return db_message
\ No newline at end of file
+    await db.commit()
+    await db.refresh(db_message, ['timestamp', 'user'])
+
+    payload = ChatMessageSchema.model_validate(db_message).model_dump(mode="json")
+    await broker.publish(chat_channel(group_id), payload)
+    return db_message
+
+@router.websocket("/groups/{group_id}/ws")
+async def chat_websocket(
+    websocket: WebSocket,
+    group_id: int,
+    token: Optional[str] = Query(None),
+    db: AsyncSession = Depends(get_db),
+    membership: MembershipService = Depends(get_membership_service)
+):
+    if token is None:
+        authorization = websocket.headers.get("authorization", "")
+        if authorization.lower().startswith("bearer "):
+            token = authorization[7:]
+
+    user = await get_user_from_access_token(token, db) if token else None
+    if user is None:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    if not await membership.is_member(group_id, user.id):
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    await db.close()
+    await websocket.accept()
+
+    async with broker.subscribe(chat_channel(group_id)) as queue:
+        receiver = asyncio.create_task(_wait_for_disconnect(websocket))
+        try:
+            while True:
+                getter = asyncio.create_task(queue.get())
+                done, _ = await asyncio.wait({getter, receiver}, return_when=asyncio.FIRST_COMPLETED)
+                if receiver in done:
+                    getter.cancel()
+                    break
+                if not await _can_receive(db, group_id, user.id):
+                    await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+                    break
+                await websocket.send_json(getter.result())
+        except WebSocketDisconnect:
+            pass
+        finally:
+            receiver.cancel()
@@ -1,51 +1,87 @@
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, Request, status, Query
 from datetime import datetime
-from sqlalchemy import asc, desc
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+from app.api.core.config import settings
 from app.api.core.db import get_db
-from app.api.models.event import Event
+from app.api.core.pagination import encode_cursor, decode_cursor, keyset_condition, keyset_order_by
+from app.api.models.event import Event, GEOCODE_PENDING
 from app.api.models.user import User
-from app.api.models.category import Category
-from app.api.schemas.event import Catalog, EventResponse, EventCreate, EventUpdate, CatalogResponse
+from app.api.schemas.event import Catalog, EventResponse, EventCreate, EventUpdate, CatalogResponse, NearbyResponse
 from app.api.core.security import get_current_user
 from app.api.dependencies import get_current_active_user, check_event_ownership
-from app.api.services.maps import yandex_maps_service
+from app.api.services.categories import category_registry
+from app.api.services.geocoding import geocoding_worker
+from app.api.services.search import build_event_search
+from app.api.services.geo import approx_distance_sq, approx_radius_sq, bounding_box_condition, haversine_km
+from app.api.services.clusters import invalidate_point
+from app.api.services.response_cache import CATALOG, EVENT, invalidate_events, normalize_params, response_cache
 
 router = APIRouter()
 
 @router.get("/", response_model=CatalogResponse)
 async def get_events_catalog(
+    request: Request,
     skip: int = Query(0, ge=0),
     limit: int = Query(10, ge=1, le=100),
     search: Optional[str] = Query(None),
     category_id: Optional[int] = Query(None),
-    sort_by: str = Query("date", regex="^(date|price|title|created_at)$"),
+    sort_by: str = Query("date", regex="^(date|price|title|created_at|relevance)$"),
     order: str = Query("asc", regex="^(asc|desc)$"),
     price_min: Optional[float] = Query(None, ge=0),
     price_max: Optional[float] = Query(None, ge=0),
     date_from: Optional[datetime] = Query(None),
     date_to: Optional[datetime] = Query(None),
-    db: Session = Depends(get_db)
+    pagination: str = Query("offset", regex="^(offset|cursor)$"),
+    cursor: Optional[str] = Query(None, description="next_cursor из предыдущей страницы"),
+    include_total: Optional[bool] = Query(None),
+    db: AsyncSession = Depends(get_db)
 ):
-    query = db.query(Event).join(User, Event.organizer_id == User.id).options(joinedload(Event.organizer))
+    cache_key = normalize_params({
+        "skip": skip, "limit": limit, "search": search, "category_id": category_id,
+        "sort_by": sort_by, "order": order, "price_min": price_min, "price_max": price_max,
+        "date_from": date_from, "date_to": date_to, "pagination": pagination,
+        "cursor": cursor, "include_total": include_total
+    })
+    cached = await response_cache.get(CATALOG, cache_key)
+    if cached is not None:
+        return cached.to_response(request)
+    generation = await response_cache.snapshot()
+
+    use_cursor = pagination == "cursor" or cursor is not None
+    if include_total is None:
+        include_total = not use_cursor
+
+    query = select(Event).join(User, Event.organizer_id == User.id)
     
-    if search:
-        query = query.filter(Event.title.ilike(f"%{search}%"))
+    rank = None
+    if search and search.strip():
+        condition, rank = build_event_search(db.bind.dialect.name, search)
+        query = query.where(condition)
+
+    if sort_by == "relevance":
+        if use_cursor:
+            raise HTTPException(status_code=400, detail="Cursor pagination does not support relevance sorting")
+        if rank is None:
+            sort_by = "date"
     if category_id:
-        query = query.filter(Event.category_id == category_id)
+        query = query.where(Event.category_id == category_id)
 
     if price_min is not None:
-        query = query.filter(Event.price >= price_min)
+        query = query.where(Event.price >= price_min)
     if price_max is not None:
-        query = query.filter(Event.price <= price_max)
+        query = query.where(Event.price <= price_max)
     
     if date_from:
-        query = query.filter(Event.date >= date_from)
+        query = query.where(Event.date >= date_from)
     if date_to:
-        query = query.filter(Event.date <= date_to)
+        query = query.where(Event.date <= date_to)
 
-    total = query.count()
+    total = None
+    if include_total:
+        total = await db.scalar(select(func.count()).select_from(query.subquery()))
 
     sort_column = {
         "date": Event.date,
@@ -53,10 +89,30 @@ async def get_events_catalog(
         "title": Event.title,
         "created_at": Event.created_at
     }.get(sort_by, Event.date)
+    nullable = sort_column.expression.nullable
     
-    query = query.order_by(desc(sort_column) if order == "desc" else asc(sort_column))
+    if sort_by == "relevance":
+        query = query.order_by(rank.desc(), Event.id.desc())
+    else:
+        query = query.order_by(*keyset_order_by(sort_column, Event.id, order, nullable))
+    query = query.options(joinedload(Event.organizer))
+
+    next_cursor = None
+    if use_cursor:
+        if cursor:
+            value, last_id = decode_cursor(cursor, sort_by, order, nullable)
+            query = query.where(keyset_condition(sort_column, Event.id, order, value, last_id, nullable))
 
-    events = query.offset(skip).limit(limit).all()
+        result = await db.execute(query.limit(limit + 1))
+        events = result.scalars().all()
+        if len(events) > limit:
+            events = events[:limit]
+            last = events[-1]
+            next_cursor = encode_cursor(sort_by, order, getattr(last, sort_column.key), last.id)
+        skip = 0
+    else:
+        result = await db.execute(query.offset(skip).limit(limit))
+        events = result.scalars().all()
 
     catalog_events = []
     for event in events:
@@ -69,29 +125,87 @@ async def get_events_catalog(
             "price": event.price,
             "organizer_name": event.organizer.name if event.organizer else "Неизвестно",
             "max_participants": event.max_participants,
+            "current_participants": event.participants_count,
             "category_id": event.category_id
         })
 
-    return CatalogResponse(
+    catalog = CatalogResponse(
         items=catalog_events,
         total=total,
         skip=skip,
-        limit=limit
+        limit=limit,
+        next_cursor=next_cursor
     )
+    cached = await response_cache.store(CATALOG, cache_key, catalog, generation)
+    return cached.to_response(request)
+
+@router.get("/nearby", response_model=NearbyResponse)
+async def get_nearby_events(
+    lat: float = Query(..., ge=-90, le=90),
+    lon: float = Query(..., ge=-180, le=180),
+    radius_km: float = Query(10, gt=0, le=settings.NEARBY_MAX_RADIUS_KM),
+    limit: int = Query(50, ge=1, le=200),
+    db: AsyncSession = Depends(get_db)
+):
+    # Кандидаты выбираются в SQL по приближённому расстоянию порциями по limit:
+    # точки внутри круга идут первыми, так что обычно хватает одного запроса.
+    distance_sq = approx_distance_sq(Event.latitude, Event.longitude, lat, lon)
+    candidates = (
+        select(Event)
+        .options(joinedload(Event.organizer))
+        .where(
+            bounding_box_condition(Event.latitude, Event.longitude, lat, lon, radius_km),
+            distance_sq <= approx_radius_sq(radius_km)
+        )
+        .order_by(distance_sq, Event.id)
+    )
+
+    nearby = []
+    offset = 0
+    while len(nearby) < limit:
+        result = await db.execute(candidates.offset(offset).limit(limit))
+        events = result.scalars().all()
+        for event in events:
+            distance = haversine_km(lat, lon, event.latitude, event.longitude)
+            if distance <= radius_km:
+                nearby.append((distance, event.id, event))
+        if len(events) < limit:
+            break
+        offset += limit
+    nearby.sort(key=lambda item: (item[0], item[1]))
+
+    items = []
+    for distance, _, event in nearby[:limit]:
+        items.append({
+            "id": event.id,
+            "title": event.title,
+            "description": event.description,
+            "date": event.date,
+            "location": event.location,
+            "price": event.price,
+            "organizer_name": event.organizer.name if event.organizer else "Неизвестно",
+            "max_participants": event.max_participants,
+            "current_participants": event.participants_count,
+            "category_id": event.category_id,
+            "latitude": event.latitude,
+            "longitude": event.longitude,
+            "distance_km": round(distance, 3)
+        })
+
+    return {"items": items}
 
 @router.post("/", response_model=EventResponse)
 async def create_event(
     event_data: EventCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
+    category_name = None
     if event_data.category_id:
-        category = db.query(Category).filter(Category.id == event_data.category_id).first()
-        if not category:
+        category_name = await category_registry.name(db, event_data.category_id)
+        if category_name is None:
             raise HTTPException(status_code=400, detail="Category not found")
     
-    coords = await yandex_maps_service.geocode_address(event_data.location)
-
     db_event = Event(
         title=event_data.title,
         description=event_data.description,
@@ -101,20 +215,13 @@ async def create_event(
         max_participants=event_data.max_participants,
         organizer_id=current_user.id,
         category_id=event_data.category_id,
-        latitude=coords["latitude"] if coords else None,
-        longitude=coords["longitude"] if coords else None,
+        geocode_status=GEOCODE_PENDING,
     )
     
     db.add(db_event)
-    db.commit()
-    db.refresh(db_event)
-    
-    category_name = None
-    if db_event.category_id:
-        category = db.query(Category).filter(Category.id == db_event.category_id).first()
-        category_name = category.name if category else None
-    
-    db.refresh(db_event, ['organizer'])
+    await db.commit()
+    geocoding_worker.notify()
+    await invalidate_events(db_event.id)
     
     return {
         "id": db_event.id,
@@ -127,24 +234,31 @@ async def create_event(
         "category_id": db_event.category_id,
         "category_name": category_name,
         "organizer_id": db_event.organizer_id,
-        "organizer_name": db_event.organizer.name if db_event.organizer else "Неизвестно",
-        "current_participants": 0,
-        "created_at": db_event.created_at
+        "organizer_name": current_user.name,
+        "current_participants": db_event.participants_count,
+        "created_at": db_event.created_at,
+        "latitude": db_event.latitude,
+        "longitude": db_event.longitude,
+        "geocode_status": db_event.geocode_status
     }
 
 @router.get("/{event_id}", response_model=EventResponse)
-async def get_event(event_id: int, db: Session = Depends(get_db)):
-    event = db.query(Event).options(joinedload(Event.organizer)).filter(Event.id == event_id).first()
+async def get_event(event_id: int, request: Request, db: AsyncSession = Depends(get_db)):
+    cached = await response_cache.get(EVENT, str(event_id))
+    if cached is not None:
+        return cached.to_response(request)
+    generation = await response_cache.snapshot()
+
+    result = await db.execute(
+        select(Event).options(joinedload(Event.organizer)).where(Event.id == event_id)
+    )
+    event = result.scalars().first()
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
     
-    current_participants = len(event.attendance_records) if event.attendance_records else 0
-    category_name = None
-    if event.category_id:
-        category = db.query(Category).filter(Category.id == event.category_id).first()
-        category_name = category.name if category else None
+    category_name = await category_registry.name(db, event.category_id)
     
-    return {
+    payload = EventResponse.model_validate({
         "id": event.id,
         "title": event.title,
         "description": event.description,
@@ -156,39 +270,59 @@ async def get_event(event_id: int, db: Session = Depends(get_db)):
         "category_name": category_name,
         "organizer_id": event.organizer_id,
         "organizer_name": event.organizer.name if event.organizer else "Неизвестно",
-        "current_participants": current_participants,
-        "created_at": event.created_at
-    }
+        "current_participants": event.participants_count,
+        "created_at": event.created_at,
+        "latitude": event.latitude,
+        "longitude": event.longitude,
+        "geocode_status": event.geocode_status
+    })
+    cached = await response_cache.store(EVENT, str(event_id), payload, generation)
+    return cached.to_response(request)
 
 @router.put("/{event_id}", response_model=EventResponse)
 async def update_event(
     event_id: int,
     event_data: EventUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(check_event_ownership)
 ):
-    event = db.query(Event).filter(Event.id == event_id).first()
+    event = await db.get(Event, event_id)
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
     
     update_data = event_data.dict(exclude_unset=True)
+    location_changed = "location" in update_data and update_data["location"] != event.location
     for field, value in update_data.items():
         setattr(event, field, value)
+
+    old_coords = (event.latitude, event.longitude)
+    if location_changed:
+        event.latitude = None
+        event.longitude = None
+        event.geocode_status = GEOCODE_PENDING
+        event.geocode_attempts = 0
+        event.geocode_next_attempt_at = None
     
-    db.commit()
-    db.refresh(event)
+    await db.commit()
+    await db.refresh(event)
+    if location_changed:
+        invalidate_point(*old_coords)
+        geocoding_worker.notify()
+    await invalidate_events(event_id)
     return event
 
 @router.delete("/{event_id}")
 async def delete_event(
     event_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(check_event_ownership)
 ):
-    event = db.query(Event).filter(Event.id == event_id).first()
+    event = await db.get(Event, event_id)
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
     
-    db.delete(event)
-    db.commit()
+    await db.delete(event)
+    await db.commit()
+    invalidate_point(event.latitude, event.longitude)
+    await invalidate_events(event_id)
     return {"message": f"Event {event_id} deleted successfully"}
\ No newline at end of file
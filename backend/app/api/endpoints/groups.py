@@ -1,33 +1,33 @@
 from typing import List
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session, joinedload, selectinload
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
 from app.api.core.db import get_db
-from app.api.models.group import Group, group_members
+from app.api.models.group import Group
 from app.api.models.user import User
 from app.api.models.event import Event
 from app.api.schemas.group import GroupCatalog, GroupResponse, GroupCreate, GroupUpdate
 from app.api.core.security import get_current_user
+from app.api.services.membership import MembershipService, get_membership_service
 from sqlalchemy import select
 
 router = APIRouter()
 
 @router.get("/", response_model=List[GroupCatalog])
 async def get_groups(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+    membership: MembershipService = Depends(get_membership_service)
 ):
     
-    groups = db.query(Group).options(
-        joinedload(Group.organizer),
-        selectinload(Group.members)
-    ).all()
+    result = await db.execute(select(Group).options(joinedload(Group.organizer)))
+    groups = result.scalars().all()
+    my_group_ids = await membership.group_ids_for_user(current_user.id)
     
     result = []
     for group in groups:
-        is_member = False
-        if current_user:
-            member_ids = [member.id for member in group.members]
-            is_member = current_user.id in member_ids
+        is_member = group.id in my_group_ids
         
         result.append({
             "id": group.id,
@@ -47,38 +47,43 @@ async def get_groups(
 @router.get("/{group_id}/check-membership")
 async def check_group_membership(
     group_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+    membership: MembershipService = Depends(get_membership_service)
 ):
-    group = db.query(Group).options(selectinload(Group.members)).filter(Group.id == group_id).first()
+    group = await db.get(Group, group_id)
     if not group:
         raise HTTPException(status_code=404, detail="Group not found")
 
-    is_member = any(member.id == current_user.id for member in group.members)
+    is_member = await membership.is_member(group_id, current_user.id)
     
     return {"is_member": is_member}
 
 @router.post("/", response_model=GroupResponse)
 async def create_group(
     group_data: GroupCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    event = db.query(Event).filter(Event.id == group_data.event_id).first()
+    event = await db.get(Event, group_data.event_id)
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
     
-    db_group = Group(**group_data.dict(), organizer_id=current_user.id)
-    db_group.members.append(current_user)
+    db_group = Group(
+        **group_data.dict(),
+        organizer_id=current_user.id,
+        members=[current_user],
+        members_count=1
+    )
     
     db.add(db_group)
-    db.commit()
-    db.refresh(db_group)
+    await db.commit()
+    await db.refresh(db_group, ['created_at'])
     return db_group
 
 @router.get("/{group_id}", response_model=GroupResponse)
-async def get_group(group_id: int, db: Session = Depends(get_db)):
-    group = db.query(Group).filter(Group.id == group_id).first()
+async def get_group(group_id: int, db: AsyncSession = Depends(get_db)):
+    group = await db.get(Group, group_id)
     if not group:
         raise HTTPException(status_code=404, detail="Group not found")
     return group
@@ -87,10 +92,10 @@ async def get_group(group_id: int, db: Session = Depends(get_db)):
 async def update_group(
     group_id: int,
     group_data: GroupUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    group = db.query(Group).filter(Group.id == group_id).first()
+    group = await db.get(Group, group_id)
     if not group:
         raise HTTPException(status_code=404, detail="Group not found")
     
@@ -101,68 +106,74 @@ async def update_group(
     for field, value in update_data.items():
         setattr(group, field, value)
     
-    db.commit()
-    db.refresh(group)
+    await db.commit()
     return group
 
 @router.delete("/{group_id}")
 async def delete_group(
     group_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    group = db.query(Group).filter(Group.id == group_id).first()
+    group = await db.get(Group, group_id)
     if not group:
         raise HTTPException(status_code=404, detail="Group not found")
     
     if group.organizer_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not authorized to delete this group")
     
-    db.delete(group)
-    db.commit()
+    await db.delete(group)
+    await db.commit()
     return {"message": f"Group {group_id} deleted successfully"}
 
 @router.post("/{group_id}/join")
 async def join_group(
     group_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+    membership: MembershipService = Depends(get_membership_service)
 ):
-    group = db.query(Group).options(selectinload(Group.members)).filter(Group.id == group_id).first()
+    group = await db.get(Group, group_id)
     if not group:
         raise HTTPException(status_code=404, detail="Group not found")
     
     if not group.is_open:
         raise HTTPException(status_code=400, detail="Group is closed")
     
-    member_ids = [member.id for member in group.members]
-    if current_user.id in member_ids:
+    if await membership.is_member(group_id, current_user.id, use_cache=False):
         raise HTTPException(status_code=400, detail="Already a member of this group")
     
-    if len(group.members) >= group.max_members:
+    # Параллельное вступление того же пользователя упирается в первичный ключ
+    # group_members уже на INSERT внутри add_member, а не на коммите.
+    try:
+        added = await membership.add_member(group_id, current_user.id)
+        if added:
+            await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(status_code=400, detail="Already a member of this group")
+    if not added:
         raise HTTPException(status_code=400, detail="Group is full")
-    
-    group.members.append(current_user)
-    db.commit()
     return {"message": f"Successfully joined group {group_id}"}
 
 @router.post("/{group_id}/leave")
 async def leave_group(
     group_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+    membership: MembershipService = Depends(get_membership_service)
 ):
-    group = db.query(Group).options(selectinload(Group.members)).filter(Group.id == group_id).first()
+    group = await db.get(Group, group_id)
     if not group:
         raise HTTPException(status_code=404, detail="Group not found")
 
-    member_ids = [member.id for member in group.members]
-    if current_user.id not in member_ids:
+    if not await membership.is_member(group_id, current_user.id, use_cache=False):
         raise HTTPException(status_code=400, detail="Not a member of this group")
     
     if group.organizer_id == current_user.id:
         raise HTTPException(status_code=400, detail="Organizer cannot leave the group")
     
-    group.members.remove(current_user)
-    db.commit()
+    if not await membership.remove_member(group_id, current_user.id):
+        raise HTTPException(status_code=400, detail="Not a member of this group")
+    await db.commit()
     return {"message": f"Successfully left group {group_id}"}
\ No newline at end of file
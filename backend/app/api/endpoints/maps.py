@@ -1,7 +1,13 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.api.core.db import get_db
 from app.api.services.maps import yandex_maps_service
-from typing import Optional
+from app.api.services.clusters import MAX_ZOOM, count_tiles, viewport_clusters
+from app.api.core.config import settings
+from app.api.core.security import get_current_admin, get_current_user
+from app.api.models.user import User
+from typing import List, Optional
 
 router = APIRouter()
 
@@ -13,6 +19,34 @@ class GeocodeResponse(BaseModel):
 class AddressResponse(BaseModel):
     address: str
 
+class BatchGeocodeRequest(BaseModel):
+    addresses: List[str] = Field(..., min_length=1, max_length=settings.MAPS_BATCH_MAX_ITEMS)
+
+class BatchGeocodeItem(BaseModel):
+    address: str
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
+    error: Optional[str] = None
+
+class BatchGeocodeResponse(BaseModel):
+    items: List[BatchGeocodeItem]
+
+class Point(BaseModel):
+    lat: float
+    lon: float
+
+class BatchReverseGeocodeRequest(BaseModel):
+    points: List[Point] = Field(..., min_length=1, max_length=settings.MAPS_BATCH_MAX_ITEMS)
+
+class BatchReverseGeocodeItem(BaseModel):
+    lat: float
+    lon: float
+    address: Optional[str] = None
+    error: Optional[str] = None
+
+class BatchReverseGeocodeResponse(BaseModel):
+    items: List[BatchReverseGeocodeItem]
+
 @router.get("/geocode", response_model=GeocodeResponse)
 async def geocode_address(
     address: str = Query(..., description="Адрес для геокодирования")
@@ -40,4 +74,71 @@ async def reverse_geocode(
             detail="Адрес по координатам не найден"
         )
     
-    return {"address": address}
\ No newline at end of file
+    return {"address": address}
+
+@router.post("/geocode/batch", response_model=BatchGeocodeResponse)
+async def geocode_batch(
+    request: BatchGeocodeRequest,
+    current_user: User = Depends(get_current_user)
+):
+    results = await yandex_maps_service.geocode_many(request.addresses)
+    
+    items = []
+    for address, result in zip(request.addresses, results):
+        if result:
+            items.append({"address": address, "latitude": result["latitude"], "longitude": result["longitude"]})
+        else:
+            items.append({"address": address, "error": "Адрес не найден или ошибка геокодирования"})
+    
+    return {"items": items}
+
+@router.post("/reverse-geocode/batch", response_model=BatchReverseGeocodeResponse)
+async def reverse_geocode_batch(
+    request: BatchReverseGeocodeRequest,
+    current_user: User = Depends(get_current_user)
+):
+    points = [(point.lat, point.lon) for point in request.points]
+    addresses = await yandex_maps_service.get_addresses_by_coords(points)
+    
+    items = []
+    for point, address in zip(request.points, addresses):
+        if address:
+            items.append({"lat": point.lat, "lon": point.lon, "address": address})
+        else:
+            items.append({"lat": point.lat, "lon": point.lon, "error": "Адрес по координатам не найден"})
+    
+    return {"items": items}
+
+class EventCluster(BaseModel):
+    latitude: float
+    longitude: float
+    count: int
+    event_id: Optional[int] = None
+
+class EventClustersResponse(BaseModel):
+    zoom: int
+    clusters: List[EventCluster]
+
+@router.get("/events/clusters", response_model=EventClustersResponse)
+async def event_clusters(
+    bbox: str = Query(..., description="min_lon,min_lat,max_lon,max_lat"),
+    zoom: int = Query(..., ge=0, le=MAX_ZOOM),
+    db: AsyncSession = Depends(get_db)
+):
+    try:
+        min_lon, min_lat, max_lon, max_lat = (float(value) for value in bbox.split(","))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="bbox должен иметь вид min_lon,min_lat,max_lon,max_lat")
+    
+    if not (-180 <= min_lon <= max_lon <= 180 and -90 <= min_lat <= max_lat <= 90):
+        raise HTTPException(status_code=400, detail="Некорректные границы bbox")
+    
+    if count_tiles(min_lon, min_lat, max_lon, max_lat, zoom) > settings.MAP_MAX_TILES:
+        raise HTTPException(status_code=400, detail="Слишком большая область для этого масштаба")
+    
+    clusters = await viewport_clusters(db, (min_lon, min_lat, max_lon, max_lat), zoom)
+    return {"zoom": zoom, "clusters": clusters}
+
+@router.get("/cache/stats")
+async def geocode_cache_stats(admin: User = Depends(get_current_admin)):
+    return yandex_maps_service.cache.stats()
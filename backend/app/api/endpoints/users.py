@@ -1,16 +1,54 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.api.core.db import get_db
 from app.api.models.user import User
-from app.api.schemas.user import UserResponse, UserUpdate
+from app.api.schemas.user import UserResponse, UserUpdate, AvatarUploadRequest, AvatarUploadResponse, AvatarConfirmRequest
 from app.api.core.security import get_current_user
-from app.api.core.s3 import upload_avatar, delete_avatar
-import uuid
-from pathlib import Path
-from io import BytesIO
+from app.api.core.config import settings
+from app.api.core.s3 import (
+    create_avatar_upload,
+    run_in_s3_executor,
+    stream_avatar_upload,
+    verify_uploaded_avatar,
+    UploadValidationError
+)
+from app.api.core.uploads import check_content_length, iter_form_file
+from app.api.services.images import delete_avatar_files, process_avatar
 
 router = APIRouter()
 
+AVATAR_TYPES = ("image/jpeg", "image/png", "image/webp")
+
+AVATAR_FORM_SCHEMA = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "properties": {"file": {"type": "string", "format": "binary"}},
+                    "required": ["file"]
+                }
+            }
+        }
+    }
+}
+
+async def _set_avatar(
+    current_user: User,
+    db: AsyncSession,
+    background_tasks: BackgroundTasks,
+    file_url: str
+) -> None:
+    old_url, old_variants = current_user.avatar_url, current_user.avatar_variants
+    
+    current_user.avatar_url = file_url
+    current_user.avatar_variants = None
+    await db.commit()
+    
+    await delete_avatar_files(old_url, old_variants)
+    background_tasks.add_task(process_avatar, current_user.id, file_url)
+
 @router.get("/me", response_model=UserResponse)
 async def get_current_user_profile(current_user: User = Depends(get_current_user)):
     return current_user
@@ -18,65 +56,89 @@ async def get_current_user_profile(current_user: User = Depends(get_current_user
 @router.put("/me", response_model=UserResponse)
 async def update_profile(
     user_data: UserUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     update_data = user_data.dict(exclude_unset=True)
     
     for field, value in update_data.items():
         setattr(current_user, field, value)
+    if "avatar_url" in update_data:
+        current_user.avatar_variants = None
     
-    db.commit()
-    db.refresh(current_user)
+    await db.commit()
+    await db.refresh(current_user)
     return current_user
 
 @router.delete("/me")
 async def delete_profile(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    db.delete(current_user)
-    db.commit()
+    await db.delete(current_user)
+    await db.commit()
     return {"message": "User deleted successfully"}
 
-@router.post("/me/avatar")
+@router.post("/me/avatar", openapi_extra=AVATAR_FORM_SCHEMA)
 async def upload_user_avatar(
-    file: UploadFile = File(...),
+    request: Request,
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    allowed_types = ["image/jpeg", "image/png", "image/webp"]
-    if file.content_type not in allowed_types:
-        raise HTTPException(400, detail="Разрешены только JPEG, PNG, WebP")
-    
-    contents = await file.read()
-    if len(contents) > 5 * 1024 * 1024:
-        raise HTTPException(400, detail="Максимальный размер файла — 5MB")
-    
-    ext = Path(file.filename).suffix or ".jpg"
-    filename = f"{uuid.uuid4()}{ext}"
-    
-    file_url = upload_avatar(BytesIO(contents), current_user.id, filename, file.content_type)
+    # Тело разбирается из request.stream() по мере получения, а не через
+    # UploadFile: иначе Starlette целиком сохранил бы его до вызова обработчика.
+    if not check_content_length(request, settings.AVATAR_MAX_SIZE):
+        raise HTTPException(413, detail=f"Максимальный размер файла — {settings.AVATAR_MAX_SIZE // (1024 * 1024)}MB")
     
-    if current_user.avatar_url:
-        delete_avatar(current_user.avatar_url)
+    try:
+        file_url = await stream_avatar_upload(
+            iter_form_file(request, "file", AVATAR_TYPES),
+            current_user.id
+        )
+    except UploadValidationError as e:
+        raise HTTPException(400, detail=str(e))
     
-    current_user.avatar_url = file_url
-    db.commit()
-    db.refresh(current_user)
+    await _set_avatar(current_user, db, background_tasks, file_url)
+    return {"avatar_url": file_url}
+
+@router.post("/me/avatar/upload-url", response_model=AvatarUploadResponse)
+async def create_avatar_upload_url(
+    request: AvatarUploadRequest,
+    current_user: User = Depends(get_current_user)
+):
+    try:
+        return await run_in_s3_executor(create_avatar_upload, current_user.id, request.content_type)
+    except UploadValidationError as e:
+        raise HTTPException(400, detail=str(e))
+
+@router.post("/me/avatar/confirm")
+async def confirm_avatar_upload(
+    request: AvatarConfirmRequest,
+    background_tasks: BackgroundTasks,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    try:
+        file_url = await run_in_s3_executor(verify_uploaded_avatar, current_user.id, request.key)
+    except UploadValidationError as e:
+        raise HTTPException(400, detail=str(e))
     
+    if file_url != current_user.avatar_url:
+        await _set_avatar(current_user, db, background_tasks, file_url)
     return {"avatar_url": file_url}
 
 @router.delete("/me/avatar")
 async def delete_user_avatar(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     if not current_user.avatar_url:
         raise HTTPException(404, detail="Аватар не найден")
     
-    delete_avatar(current_user.avatar_url)
+    await delete_avatar_files(current_user.avatar_url, current_user.avatar_variants)
     current_user.avatar_url = None
-    db.commit()
+    current_user.avatar_variants = None
+    await db.commit()
     
     return {"message": "Аватар удалён"}
\ No newline at end of file
@@ -1,10 +1,43 @@
-from sqlalchemy import Column, Integer, String, DateTime, Float, Text, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, Float, Text, ForeignKey, Index, text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.api.core.db import Base
 
+EVENT_SEARCH_CONFIG = "russian"
+
+GEOCODE_PENDING = "pending"
+GEOCODE_PROCESSING = "processing"
+GEOCODE_DONE = "done"
+GEOCODE_FAILED = "failed"
+
+EVENT_SEARCH_DOCUMENT = (
+    "setweight(to_tsvector('russian', coalesce({prefix}title, '')), 'A') || "
+    "setweight(to_tsvector('russian', coalesce({prefix}description, '')), 'B')"
+)
+
 class Event(Base):
     __tablename__ = "events"
+    __table_args__ = (
+        Index(
+            "ix_events_search_document",
+            text("(" + EVENT_SEARCH_DOCUMENT.format(prefix="") + ")"),
+            postgresql_using="gin"
+        ).ddl_if(dialect="postgresql"),
+        Index(
+            "ix_events_title_trgm",
+            "title",
+            postgresql_using="gin",
+            postgresql_ops={"title": "gin_trgm_ops"}
+        ).ddl_if(dialect="postgresql"),
+        Index("ix_events_category_date", "category_id", "date", "id"),
+        Index("ix_events_date_id", "date", "id"),
+        Index("ix_events_price_id", "price", "id"),
+        Index("ix_events_title_id", "title", "id"),
+        Index("ix_events_created_at_id", "created_at", "id"),
+        Index("ix_events_organizer_id", "organizer_id"),
+        Index("ix_events_geocode_queue", "geocode_status", "geocode_next_attempt_at"),
+        Index("ix_events_lat_lon", "latitude", "longitude"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(200), nullable=False)
@@ -14,10 +47,14 @@ class Event(Base):
 
     latitude = Column(Float, nullable=True)
     longitude = Column(Float, nullable=True)
+    geocode_status = Column(String(20), default=GEOCODE_PENDING, server_default=GEOCODE_PENDING, nullable=False)
+    geocode_attempts = Column(Integer, default=0, server_default="0", nullable=False)
+    geocode_next_attempt_at = Column(DateTime(timezone=True), nullable=True)
 
     price = Column(Float, default=0.0)
     organizer_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     max_participants = Column(Integer, nullable=False)
+    participants_count = Column(Integer, default=0, server_default="0", nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     category_id = Column(Integer, ForeignKey("categories.id"), nullable=True)
 
@@ -28,4 +65,8 @@ class Event(Base):
     
     @property
     def organizer_name(self):
-        return self.organizer.name if self.organizer else "Неизвестно"
\ No newline at end of file
+        return self.organizer.name if self.organizer else "Неизвестно"
+
+    @property
+    def current_participants(self):
+        return self.participants_count or 0
\ No newline at end of file
@@ -0,0 +1,18 @@
+from sqlalchemy import Column, Integer, String, DateTime, Float, UniqueConstraint
+from sqlalchemy.sql import func
+from app.api.core.db import Base
+
+class GeocodeCacheEntry(Base):
+    __tablename__ = "geocode_cache"
+    __table_args__ = (
+        UniqueConstraint("kind", "key", name="uq_geocode_cache_kind_key"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    kind = Column(String(10), nullable=False)
+    key = Column(String(500), nullable=False)
+    latitude = Column(Float, nullable=True)
+    longitude = Column(Float, nullable=True)
+    address = Column(String(500), nullable=True)
+    expires_at = Column(DateTime(timezone=True), nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
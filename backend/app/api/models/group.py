@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, ForeignKey, Table
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, ForeignKey, Table, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.api.core.db import Base
@@ -7,11 +7,27 @@ group_members = Table(
     'group_members',
     Base.metadata,
     Column('user_id', Integer, ForeignKey('users.id'), primary_key=True),
-    Column('group_id', Integer, ForeignKey('groups.id'), primary_key=True)
+    Column('group_id', Integer, ForeignKey('groups.id'), primary_key=True),
+    Index('ix_group_members_group_user', 'group_id', 'user_id')
 )
 
 class Group(Base):
     __tablename__ = "groups"
+    __table_args__ = (
+        Index(
+            "ix_groups_name_trgm",
+            "name",
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"}
+        ).ddl_if(dialect="postgresql"),
+        Index(
+            "ix_groups_description_trgm",
+            "description",
+            postgresql_using="gin",
+            postgresql_ops={"description": "gin_trgm_ops"}
+        ).ddl_if(dialect="postgresql"),
+        Index("ix_groups_event_id", "event_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     event_id = Column(Integer, ForeignKey("events.id"), nullable=False)
@@ -19,6 +35,7 @@ class Group(Base):
     description = Column(Text)
     max_members = Column(Integer, nullable=False)
     is_open = Column(Boolean, default=True)
+    members_count = Column(Integer, default=0, server_default="0", nullable=False)
     organizer_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     
@@ -27,10 +44,6 @@ class Group(Base):
     members = relationship("User", secondary=group_members, back_populates="groups")
     messages = relationship("ChatMessage", back_populates="group")
     
-    @property
-    def members_count(self):
-        return len(self.members) if self.members else 0
-    
     @property
     def organizer_name(self):
         return self.organizer.name if self.organizer else "Неизвестно"
\ No newline at end of file
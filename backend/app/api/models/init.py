@@ -3,5 +3,6 @@ from .event import Event
 from .group import Group
 from .chat import ChatMessage
 from .attendance import Attendance
+from .geocode import GeocodeCacheEntry
 
-__all__ = ["User", "Event", "Group", "ChatMessage", "Attendance"]
\ No newline at end of file
+__all__ = ["User", "Event", "Group", "ChatMessage", "Attendance", "GeocodeCacheEntry"]
\ No newline at end of file
@@ -1,47 +1,49 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import select, or_
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.api.models.user import User
 from typing import Optional, List
 
 class UserRepository:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
     
-    def get_by_email(self, email: str) -> Optional[User]:
-        return self.db.query(User).filter(User.email == email).first()
+    async def get_by_email(self, email: str) -> Optional[User]:
+        result = await self.db.execute(select(User).where(User.email == email))
+        return result.scalars().first()
     
-    def get_by_id(self, user_id: int) -> Optional[User]:
-        return self.db.query(User).filter(User.id == user_id).first()
+    async def get_by_id(self, user_id: int) -> Optional[User]:
+        return await self.db.get(User, user_id)
     
-    def create(self, email: str, name: str, hashed_password: str) -> User:
+    async def create(self, email: str, name: str, hashed_password: str) -> User:
         db_user = User(
             email=email,
             name=name,
             hashed_password=hashed_password
         )
         self.db.add(db_user)
-        self.db.commit()
-        self.db.refresh(db_user)
+        await self.db.commit()
+        await self.db.refresh(db_user)
         return db_user
     
-    def get_all(self, skip: int = 0, limit: int = 100, search: Optional[str] = None) -> List[User]:
-        query = self.db.query(User)
+    async def get_all(self, skip: int = 0, limit: int = 100, search: Optional[str] = None) -> List[User]:
+        query = select(User)
         if search:
-            from sqlalchemy import or_
-            query = query.filter(
+            query = query.where(
                 or_(
                     User.name.ilike(f"%{search}%"),
                     User.email.ilike(f"%{search}%")
                 )
             )
-        return query.offset(skip).limit(limit).all()
+        result = await self.db.execute(query.offset(skip).limit(limit))
+        return result.scalars().all()
     
-    def update(self, user: User, update_data: dict) -> User:
+    async def update(self, user: User, update_data: dict) -> User:
         for field, value in update_data.items():
             setattr(user, field, value)
-        self.db.commit()
-        self.db.refresh(user)
+        await self.db.commit()
+        await self.db.refresh(user)
         return user
     
-    def delete(self, user: User) -> None:
-        self.db.delete(user)
-        self.db.commit()
\ No newline at end of file
+    async def delete(self, user: User) -> None:
+        await self.db.delete(user)
+        await self.db.commit()
@@ -30,30 +30,44 @@ class Catalog(BaseModel):
     description: str
     date: datetime
     location: str
-    price: float
+    price: Optional[float] = None
     organizer_name: str
     max_participants: int
+    current_participants: int = 0
     category_id: Optional[int] = None
 
     class Config:
         from_attributes = True
 
+class NearbyEvent(Catalog):
+    latitude: float
+    longitude: float
+    distance_km: float
+
+class NearbyResponse(BaseModel):
+    items: List[NearbyEvent]
+
 class EventResponse(EventBase):
     id: int
+    price: Optional[float] = None
     organizer_id: int
     organizer_name: str
     current_participants: int = 0
     created_at: datetime
     category_name: Optional[str] = None
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
+    geocode_status: Optional[str] = None
 
     class Config:
         from_attributes = True
 
 class CatalogResponse(BaseModel):
     items: List[Catalog]
-    total: int
+    total: Optional[int] = None
     skip: int
     limit: int
+    next_cursor: Optional[str] = None
 
     class Config:
         from_attributes = True
\ No newline at end of file
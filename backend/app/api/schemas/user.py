@@ -1,5 +1,5 @@
 from pydantic import BaseModel, EmailStr
-from typing import Optional, List
+from typing import Optional, List, Dict
 from datetime import datetime
 
 class UserBase(BaseModel):
@@ -14,6 +14,7 @@ class UserCreate(UserBase):
 class UserResponse(UserBase):
     id: int
     avatar_url: Optional[str] = None
+    avatar_variants: Optional[Dict[str, str]] = None
     role: str = "user"
     is_active: bool = True
     created_at: datetime
@@ -27,6 +28,18 @@ class UserUpdate(BaseModel):
     interests: Optional[List[str]] = None
     avatar_url: Optional[str] = None
 
+class AvatarUploadRequest(BaseModel):
+    content_type: str
+
+class AvatarUploadResponse(BaseModel):
+    url: str
+    fields: Dict[str, str]
+    key: str
+    expires_in: int
+
+class AvatarConfirmRequest(BaseModel):
+    key: str
+
 class Token(BaseModel):
     access_token: str
     refresh_token: str
@@ -35,6 +48,16 @@ class Token(BaseModel):
 class TokenRefresh(BaseModel):
     refresh_token: str
 
+class SessionResponse(BaseModel):
+    id: int
+    user_agent: Optional[str] = None
+    created_at: Optional[datetime] = None
+    last_used_at: Optional[datetime] = None
+    expires_at: datetime
+
+    class Config:
+        from_attributes = True
+
 class LoginRequest(BaseModel):
     email: str
     password: str
\ No newline at end of file
@@ -1,12 +1,14 @@
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, Tuple
 from jose import JWTError, jwt
 import os
 from dotenv import load_dotenv
-import bcrypt
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.api.core.passwords import password_hasher
+from app.api.core.security import access_token_claims
 from app.api.repositories.user import UserRepository
 from app.api.models.user import User
+from app.api.services.sessions import SessionService
 
 load_dotenv()
 
@@ -14,28 +16,11 @@ SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-change-in-production")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
-refresh_tokens_store: dict = {}
-
 class AuthService:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
         self.user_repo = UserRepository(db)
-    
-    def verify_password(self, plain_password: str, hashed_password: str) -> bool:
-        try:
-            return bcrypt.checkpw(
-                plain_password.encode('utf-8'),
-                hashed_password.encode('utf-8')
-            )
-        except ValueError:
-            from passlib.context import CryptContext
-            temp_pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-            return temp_pwd_context.verify(plain_password, hashed_password)
-    
-    def get_password_hash(self, password: str) -> str:
-        salt = bcrypt.gensalt()
-        hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
-        return hashed.decode('utf-8')
+        self.sessions = SessionService(db)
     
     def create_access_token(self, data: dict, expires_delta: Optional[timedelta] = None) -> str:
         to_encode = data.copy()
@@ -47,22 +32,8 @@ class AuthService:
         encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
         return encoded_jwt
     
-    def create_refresh_token(self, user_id: int, email: str) -> str:
-        expire = datetime.utcnow() + timedelta(days=365)
-        to_encode = {
-            "sub": email,
-            "user_id": user_id,
-            "exp": expire,
-            "type": "refresh"
-        }
-        encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
-
-        refresh_tokens_store[encoded_jwt] = {
-            "user_id": user_id,
-            "expires": expire
-        }
-        
-        return encoded_jwt
+    async def create_refresh_token(self, user: User, user_agent: Optional[str] = None) -> str:
+        return await self.sessions.create(user, user_agent)
     
     def verify_token(self, token: str, token_type: str = "access") -> Optional[dict]:
         try:
@@ -73,42 +44,26 @@ class AuthService:
         except JWTError:
             return None
     
-    def refresh_access_token(self, refresh_token: str) -> Optional[str]:
-        payload = self.verify_token(refresh_token, token_type="refresh")
-        if not payload:
-            return None
-
-        if refresh_token not in refresh_tokens_store:
-            return None
-
-        user = self.user_repo.get_by_id(payload.get("user_id"))
-        if not user or not user.is_active:
+    async def refresh_access_token(self, refresh_token: str) -> Optional[Tuple[str, str]]:
+        rotated = await self.sessions.rotate(refresh_token)
+        if not rotated:
             return None
 
-        return self.create_access_token(data={"sub": user.email, "user_id": user.id})
+        user, new_refresh_token = rotated
+        access_token = self.create_access_token(data=access_token_claims(user))
+        return access_token, new_refresh_token
     
-    def revoke_refresh_token(self, refresh_token: str) -> bool:
-        if refresh_token in refresh_tokens_store:
-            del refresh_tokens_store[refresh_token]
-            return True
-        return False
+    async def revoke_refresh_token(self, refresh_token: str) -> bool:
+        return await self.sessions.revoke(refresh_token)
     
-    def revoke_all_user_tokens(self, user_id: int) -> int:
-        revoked = 0
-        tokens_to_remove = [
-            token for token, data in refresh_tokens_store.items()
-            if data.get("user_id") == user_id
-        ]
-        for token in tokens_to_remove:
-            del refresh_tokens_store[token]
-            revoked += 1
-        return revoked
+    async def revoke_all_user_tokens(self, user_id: int) -> int:
+        return await self.sessions.revoke_all(user_id)
     
-    def authenticate_user(self, email: str, password: str) -> Optional[User]:
-        user = self.user_repo.get_by_email(email)
+    async def authenticate_user(self, email: str, password: str) -> Optional[User]:
+        user = await self.user_repo.get_by_email(email)
         if not user:
             return None
-        if not self.verify_password(password, user.hashed_password):
+        if not await password_hasher.verify(password, user.hashed_password):
             return None
         if not user.is_active:
             return None
@@ -0,0 +1,163 @@
+import asyncio
+import json
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Dict, Optional, Set
+from app.api.core.config import settings
+
+Dispatch = Callable[[str, Dict[str, Any]], None]
+
+class BrokerBackend:
+    """Транспорт между воркерами: publish должен довести сообщение до dispatch каждого воркера."""
+
+    async def start(self, dispatch: Dispatch) -> None:
+        raise NotImplementedError
+
+    async def stop(self) -> None:
+        raise NotImplementedError
+
+    async def publish(self, channel: str, message: Dict[str, Any]) -> None:
+        raise NotImplementedError
+
+class InMemoryBrokerBackend(BrokerBackend):
+    """Бэкенд для одного процесса и для тестов."""
+
+    def __init__(self):
+        self._dispatch: Optional[Dispatch] = None
+
+    async def start(self, dispatch: Dispatch) -> None:
+        self._dispatch = dispatch
+
+    async def stop(self) -> None:
+        self._dispatch = None
+
+    async def publish(self, channel: str, message: Dict[str, Any]) -> None:
+        if self._dispatch:
+            self._dispatch(channel, message)
+
+class RedisBrokerBackend(BrokerBackend):
+    """Бэкенд на Redis Pub/Sub для нескольких воркеров.
+
+    При обрыве соединения читатель переподписывается с экспоненциальной
+    паузой; сообщения, опубликованные за время обрыва, теряются.
+    """
+
+    def __init__(self, url: str, prefix: str = "broker:",
+                 retry_delay: float = settings.BROKER_RETRY_DELAY,
+                 retry_max_delay: float = settings.BROKER_RETRY_MAX_DELAY):
+        self.url = url
+        self.prefix = prefix
+        self.retry_delay = retry_delay
+        self.retry_max_delay = retry_max_delay
+        self._redis = None
+        self._pubsub = None
+        self._reader: Optional[asyncio.Task] = None
+
+    async def start(self, dispatch: Dispatch) -> None:
+        import redis.asyncio as redis
+
+        self._redis = redis.from_url(self.url, decode_responses=True)
+        await self._subscribe()
+        self._reader = asyncio.create_task(self._read(dispatch))
+
+    async def _subscribe(self) -> None:
+        self._pubsub = self._redis.pubsub()
+        await self._pubsub.psubscribe(f"{self.prefix}*")
+
+    async def _close_pubsub(self) -> None:
+        if self._pubsub is None:
+            return
+        try:
+            await self._pubsub.aclose()
+        except Exception:
+            pass
+        self._pubsub = None
+
+    def error_backoff(self, errors: int) -> float:
+        return min(self.retry_delay * 2 ** (errors - 1), self.retry_max_delay)
+
+    async def _read(self, dispatch: Dispatch) -> None:
+        errors = 0
+        while True:
+            try:
+                if self._pubsub is None:
+                    await self._subscribe()
+                async for item in self._pubsub.listen():
+                    errors = 0
+                    if item.get("type") != "pmessage":
+                        continue
+                    try:
+                        channel = item["channel"][len(self.prefix):]
+                        dispatch(channel, json.loads(item["data"]))
+                    except (ValueError, KeyError) as e:
+                        print(f"Broker message error: {e}")
+                raise ConnectionError("Redis subscription closed")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                errors += 1
+                delay = self.error_backoff(errors)
+                print(f"Broker connection error: {e!r}, resubscribing in {delay:.0f}s")
+                await self._close_pubsub()
+                await asyncio.sleep(delay)
+
+    async def stop(self) -> None:
+        if self._reader:
+            self._reader.cancel()
+            self._reader = None
+        await self._close_pubsub()
+        if self._redis:
+            await self._redis.aclose()
+            self._redis = None
+
+    async def publish(self, channel: str, message: Dict[str, Any]) -> None:
+        await self._redis.publish(f"{self.prefix}{channel}", json.dumps(message))
+
+class Broker:
+    """Pub/sub внутри процесса: подписчики получают сообщения через asyncio.Queue.
+
+    Медленный подписчик с заполненной очередью пропускает сообщения —
+    догнать историю он может через GET с after_id.
+    """
+
+    def __init__(self, backend: Optional[BrokerBackend] = None, queue_size: int = 100):
+        self.backend = backend or InMemoryBrokerBackend()
+        self.queue_size = queue_size
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = defaultdict(set)
+
+    async def start(self) -> None:
+        await self.backend.start(self._dispatch)
+
+    async def stop(self) -> None:
+        await self.backend.stop()
+
+    async def publish(self, channel: str, message: Dict[str, Any]) -> None:
+        await self.backend.publish(channel, message)
+
+    @asynccontextmanager
+    async def subscribe(self, channel: str) -> AsyncIterator[asyncio.Queue]:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers[channel].add(queue)
+        try:
+            yield queue
+        finally:
+            self._subscribers[channel].discard(queue)
+            if not self._subscribers[channel]:
+                del self._subscribers[channel]
+
+    def subscribers_count(self, channel: str) -> int:
+        return len(self._subscribers.get(channel, ()))
+
+    def _dispatch(self, channel: str, message: Dict[str, Any]) -> None:
+        for queue in list(self._subscribers.get(channel, ())):
+            try:
+                queue.put_nowait(message)
+            except asyncio.QueueFull:
+                pass
+
+def create_broker_backend(url: str) -> BrokerBackend:
+    if url.startswith("redis://") or url.startswith("rediss://"):
+        return RedisBrokerBackend(url)
+    return InMemoryBrokerBackend()
+
+broker = Broker(create_broker_backend(settings.REDIS_URL))
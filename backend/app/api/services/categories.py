@@ -0,0 +1,111 @@
+import asyncio
+import time
+import uuid
+from typing import Dict, List, Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.api.core.config import settings
+from app.api.core.db import AsyncSessionLocal
+from app.api.models.category import Category
+from app.api.schemas.category import CategoryResponse
+from app.api.services.broker import broker
+
+CATEGORIES_CHANNEL = "categories"
+
+class CategoryRegistry:
+    """Все категории в памяти процесса.
+
+    Каждая запись повышает version; реестр перечитывает таблицу, когда
+    загруженная версия отстала. Остальные воркеры узнают о записи через broker,
+    а max_age страхует от потерянного сообщения.
+    """
+
+    def __init__(self, session_factory=AsyncSessionLocal, max_age: float = settings.CATEGORY_REGISTRY_MAX_AGE):
+        self.session_factory = session_factory
+        self.max_age = max_age
+        self.version = 0
+        self.origin = uuid.uuid4().hex
+        self._loaded_version: Optional[int] = None
+        self._loaded_at = 0.0
+        self._by_id: Dict[int, CategoryResponse] = {}
+        self._ordered: List[CategoryResponse] = []
+        self._lock = asyncio.Lock()
+
+    @property
+    def is_fresh(self) -> bool:
+        return (
+            self._loaded_version == self.version
+            and time.monotonic() - self._loaded_at < self.max_age
+        )
+
+    async def load(self, db: Optional[AsyncSession] = None) -> None:
+        async with self._lock:
+            if self.is_fresh:
+                return
+            version = self.version
+            if db is None:
+                async with self.session_factory() as session:
+                    categories = await self._fetch(session)
+            else:
+                categories = await self._fetch(db)
+
+            self._ordered = categories
+            self._by_id = {category.id: category for category in categories}
+            self._loaded_version = version
+            self._loaded_at = time.monotonic()
+
+    async def _fetch(self, db: AsyncSession) -> List[CategoryResponse]:
+        result = await db.execute(select(Category).order_by(Category.name))
+        return [CategoryResponse.model_validate(category) for category in result.scalars().all()]
+
+    async def all(self, db: AsyncSession) -> List[CategoryResponse]:
+        if not self.is_fresh:
+            await self.load(db)
+        return self._ordered
+
+    async def get(self, db: AsyncSession, category_id: int) -> Optional[CategoryResponse]:
+        """Категория по id; промах проверяется в БД — её могли создать в другом воркере."""
+        if not self.is_fresh:
+            await self.load(db)
+        category = self._by_id.get(category_id)
+        if category is not None:
+            return category
+
+        exists = await db.get(Category, category_id)
+        if exists is None:
+            return None
+        self.mark_stale()
+        return CategoryResponse.model_validate(exists)
+
+    async def name(self, db: AsyncSession, category_id: Optional[int]) -> Optional[str]:
+        if not category_id:
+            return None
+        category = await self.get(db, category_id)
+        return category.name if category else None
+
+    def mark_stale(self) -> None:
+        self.version += 1
+
+    async def invalidate(self, db: Optional[AsyncSession] = None) -> None:
+        """Вызывать после коммита записи в categories: перечитать и оповестить воркеры."""
+        self.mark_stale()
+        await self.load(db)
+        # Запись уже закоммичена; без сообщения остальные воркеры перечитают реестр через max_age.
+        try:
+            await broker.publish(CATEGORIES_CHANNEL, {"origin": self.origin, "version": self.version})
+        except Exception as e:
+            print(f"Category registry broadcast error: {e}")
+
+    def clear(self) -> None:
+        self.mark_stale()
+        self._by_id = {}
+        self._ordered = []
+
+async def listen_for_invalidations() -> None:
+    async with broker.subscribe(CATEGORIES_CHANNEL) as queue:
+        while True:
+            message = await queue.get()
+            if message.get("origin") != category_registry.origin:
+                category_registry.mark_stale()
+
+category_registry = CategoryRegistry()
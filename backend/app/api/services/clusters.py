@@ -0,0 +1,123 @@
+import math
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from sqlalchemy import Integer, cast, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.api.core.cache import TTLCache
+from app.api.core.config import settings
+from app.api.models.event import Event
+
+MAX_ZOOM = 20
+MAX_LATITUDE = 85.0511287798
+
+tile_cache = TTLCache(maxsize=settings.MAP_TILE_CACHE_SIZE, ttl=settings.MAP_TILE_CACHE_TTL)
+
+def lon_to_tile_x(longitude: float, zoom: int) -> int:
+    n = 2 ** zoom
+    return min(n - 1, max(0, int((longitude + 180.0) / 360.0 * n)))
+
+def lat_to_tile_y(latitude: float, zoom: int) -> int:
+    n = 2 ** zoom
+    latitude = max(-MAX_LATITUDE, min(MAX_LATITUDE, latitude))
+    rad = math.radians(latitude)
+    y = (1.0 - math.log(math.tan(rad) + 1.0 / math.cos(rad)) / math.pi) / 2.0 * n
+    return min(n - 1, max(0, int(y)))
+
+def tile_bounds(x: int, y: int, zoom: int) -> Tuple[float, float, float, float]:
+    """(west, south, east, north) тайла в градусах."""
+    n = 2 ** zoom
+
+    def tile_lat(ty: int) -> float:
+        return math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * ty / n))))
+
+    west = x / n * 360.0 - 180.0
+    east = (x + 1) / n * 360.0 - 180.0
+    return west, tile_lat(y + 1), east, tile_lat(y)
+
+def _tile_range(min_lon: float, min_lat: float, max_lon: float, max_lat: float, zoom: int):
+    return (
+        lon_to_tile_x(min_lon, zoom), lon_to_tile_x(max_lon, zoom),
+        lat_to_tile_y(max_lat, zoom), lat_to_tile_y(min_lat, zoom)
+    )
+
+def count_tiles(min_lon: float, min_lat: float, max_lon: float, max_lat: float, zoom: int) -> int:
+    """Число тайлов в bbox без построения списка — для проверки лимита."""
+    x_min, x_max, y_min, y_max = _tile_range(min_lon, min_lat, max_lon, max_lat, zoom)
+    return (x_max - x_min + 1) * (y_max - y_min + 1)
+
+def tiles_for_bbox(
+    min_lon: float,
+    min_lat: float,
+    max_lon: float,
+    max_lat: float,
+    zoom: int
+) -> Iterator[Tuple[int, int]]:
+    x_min, x_max, y_min, y_max = _tile_range(min_lon, min_lat, max_lon, max_lat, zoom)
+    for x in range(x_min, x_max + 1):
+        for y in range(y_min, y_max + 1):
+            yield x, y
+
+def _cell_index(expr, dialect_name: str):
+    # Значения неотрицательны, поэтому в SQLite отбрасывание дробной части совпадает с floor.
+    if dialect_name == "sqlite":
+        return cast(expr, Integer)
+    return func.floor(expr)
+
+async def tile_clusters(db: AsyncSession, x: int, y: int, zoom: int) -> List[Dict[str, Any]]:
+    """Кластеры одного тайла: сетка grid x grid, агрегация в БД."""
+    key = (zoom, x, y)
+    cached = tile_cache.get(key)
+    if cached is not None:
+        return cached
+
+    west, south, east, north = tile_bounds(x, y, zoom)
+    grid = settings.MAP_CLUSTER_GRID
+    dialect_name = db.bind.dialect.name
+    cell_x = _cell_index((Event.longitude - west) * (grid / (east - west)), dialect_name).label("cell_x")
+    cell_y = _cell_index((Event.latitude - south) * (grid / (north - south)), dialect_name).label("cell_y")
+
+    result = await db.execute(
+        select(
+            func.count(Event.id),
+            func.avg(Event.latitude),
+            func.avg(Event.longitude),
+            func.min(Event.id),
+            cell_x,
+            cell_y
+        )
+        .where(
+            Event.latitude >= south,
+            Event.latitude < north,
+            Event.longitude >= west,
+            Event.longitude < east
+        )
+        .group_by(cell_x, cell_y)
+    )
+
+    clusters = []
+    for count, latitude, longitude, event_id, _, _ in result.all():
+        clusters.append({
+            "latitude": float(latitude),
+            "longitude": float(longitude),
+            "count": count,
+            "event_id": event_id if count == 1 else None
+        })
+
+    tile_cache.set(key, clusters)
+    return clusters
+
+async def viewport_clusters(
+    db: AsyncSession,
+    bbox: Tuple[float, float, float, float],
+    zoom: int
+) -> List[Dict[str, Any]]:
+    clusters = []
+    for x, y in tiles_for_bbox(*bbox, zoom):
+        clusters.extend(await tile_clusters(db, x, y, zoom))
+    return clusters
+
+def invalidate_point(latitude: Optional[float], longitude: Optional[float]) -> None:
+    """Сбросить закэшированные тайлы всех масштабов, содержащие точку."""
+    if latitude is None or longitude is None:
+        return
+    for zoom in range(MAX_ZOOM + 1):
+        tile_cache.delete((zoom, lon_to_tile_x(longitude, zoom), lat_to_tile_y(latitude, zoom)))
@@ -0,0 +1,49 @@
+import asyncio
+from typing import Dict
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.api.core.db import AsyncSessionLocal
+from app.api.models.attendance import Attendance
+from app.api.models.event import Event
+from app.api.models.group import Group, group_members
+
+async def recalculate_counters(db: AsyncSession) -> Dict[str, int]:
+    """Пересчитать participants_count и members_count по фактическим записям."""
+    participants = (
+        select(func.count(Attendance.id))
+        .where(Attendance.event_id == Event.id)
+        .scalar_subquery()
+    )
+    events_result = await db.execute(
+        update(Event)
+        .where(Event.participants_count != participants)
+        .values(participants_count=participants)
+        .execution_options(synchronize_session=False)
+    )
+
+    members = (
+        select(func.count())
+        .select_from(group_members)
+        .where(group_members.c.group_id == Group.id)
+        .scalar_subquery()
+    )
+    groups_result = await db.execute(
+        update(Group)
+        .where(Group.members_count != members)
+        .values(members_count=members)
+        .execution_options(synchronize_session=False)
+    )
+
+    await db.commit()
+    return {
+        "events_fixed": events_result.rowcount,
+        "groups_fixed": groups_result.rowcount
+    }
+
+async def main():
+    async with AsyncSessionLocal() as db:
+        result = await recalculate_counters(db)
+    print(f"Counters repaired: {result}")
+
+if __name__ == "__main__":
+    asyncio.run(main())
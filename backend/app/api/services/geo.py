@@ -0,0 +1,76 @@
+import math
+from typing import List, Tuple
+from sqlalchemy import and_, case, or_
+
+EARTH_RADIUS_KM = 6371.0088
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    lat1, lon1, lat2, lon2 = map(math.radians, (lat1, lon1, lat2, lon2))
+    a = (
+        math.sin((lat2 - lat1) / 2) ** 2
+        + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+def bounding_box(
+    latitude: float,
+    longitude: float,
+    radius_km: float
+) -> Tuple[float, float, List[Tuple[float, float]]]:
+    """Прямоугольник, гарантированно содержащий круг радиуса radius_km.
+
+    Возвращает (min_lat, max_lat, диапазоны долготы): при переходе через
+    180-й меридиан диапазонов два, у полюса — вся долгота.
+    """
+    delta_lat = math.degrees(radius_km / EARTH_RADIUS_KM)
+    min_lat = max(-90.0, latitude - delta_lat)
+    max_lat = min(90.0, latitude + delta_lat)
+
+    if min_lat <= -90.0 or max_lat >= 90.0:
+        return min_lat, max_lat, [(-180.0, 180.0)]
+
+    delta_lon = math.degrees(
+        math.asin(min(1.0, math.sin(radius_km / EARTH_RADIUS_KM) / math.cos(math.radians(latitude))))
+    )
+    if delta_lon >= 180.0:
+        return min_lat, max_lat, [(-180.0, 180.0)]
+
+    min_lon = longitude - delta_lon
+    max_lon = longitude + delta_lon
+    if min_lon < -180.0:
+        return min_lat, max_lat, [(min_lon + 360.0, 180.0), (-180.0, max_lon)]
+    if max_lon > 180.0:
+        return min_lat, max_lat, [(min_lon, 180.0), (-180.0, max_lon - 360.0)]
+    return min_lat, max_lat, [(min_lon, max_lon)]
+
+def bounding_box_condition(lat_column, lon_column, latitude: float, longitude: float, radius_km: float):
+    min_lat, max_lat, lon_ranges = bounding_box(latitude, longitude, radius_km)
+    return and_(
+        lat_column.between(min_lat, max_lat),
+        or_(*[lon_column.between(low, high) for low, high in lon_ranges])
+    )
+
+# Запас на погрешность приближённого расстояния: оно отсекает углы прямоугольника,
+# но не должно терять точки внутри круга.
+APPROX_DISTANCE_MARGIN = 1.25
+
+def approx_distance_sq(lat_column, lon_column, latitude: float, longitude: float):
+    """Квадрат расстояния в градусах широты по равнопромежуточной проекции.
+
+    Только арифметика, поэтому выражение работает в любой СУБД и годится для
+    ORDER BY; точное расстояние затем считает haversine_km.
+    """
+    scale = math.cos(math.radians(latitude))
+    delta_lon = lon_column - longitude
+    delta_lon = case(
+        (delta_lon > 180, delta_lon - 360),
+        (delta_lon < -180, delta_lon + 360),
+        else_=delta_lon
+    ) * scale
+    delta_lat = lat_column - latitude
+    return delta_lat * delta_lat + delta_lon * delta_lon
+
+def approx_radius_sq(radius_km: float) -> float:
+    """Порог для approx_distance_sq, гарантированно покрывающий круг radius_km."""
+    return (math.degrees(radius_km / EARTH_RADIUS_KM) * APPROX_DISTANCE_MARGIN) ** 2
+
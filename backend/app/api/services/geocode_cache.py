@@ -0,0 +1,142 @@
+import re
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+from sqlalchemy import select
+from sqlalchemy.exc import SQLAlchemyError
+from app.api.core.cache import TTLCache
+from app.api.core.config import settings
+from app.api.core.db import AsyncSessionLocal
+from app.api.models.geocode import GeocodeCacheEntry
+
+MISSING = object()
+
+def normalize_address(address: str) -> str:
+    address = address.casefold().replace("ё", "е")
+    address = re.sub(r"[,.;:\"'«»()]+", " ", address)
+    return re.sub(r"\s+", " ", address).strip()
+
+def reverse_key(latitude: float, longitude: float, precision: int) -> str:
+    return f"{round(latitude, precision):.{precision}f},{round(longitude, precision):.{precision}f}"
+
+class GeocodeCache:
+    """Двухуровневый кэш геокодера: LRU в памяти процесса и таблица geocode_cache.
+
+    Ошибки таблицы не ломают геокодирование — запрос просто уходит в Яндекс.
+    """
+
+    def __init__(
+        self,
+        session_factory=AsyncSessionLocal,
+        ttl: int = settings.GEOCODE_CACHE_TTL,
+        maxsize: int = settings.GEOCODE_CACHE_SIZE,
+        precision: int = settings.GEOCODE_REVERSE_PRECISION
+    ):
+        self.session_factory = session_factory
+        self.ttl = ttl
+        self.precision = precision
+        self.memory = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.db_hits = 0
+        self.db_misses = 0
+
+    async def get_forward(self, address: str) -> Any:
+        entry = await self._get("forward", normalize_address(address))
+        if entry is MISSING:
+            return MISSING
+        return {**entry, "address": address}
+
+    async def set_forward(self, address: str, result: Dict[str, Any]) -> None:
+        await self._set("forward", normalize_address(address), result)
+
+    async def get_reverse(self, latitude: float, longitude: float) -> Any:
+        entry = await self._get("reverse", reverse_key(latitude, longitude, self.precision))
+        if entry is MISSING:
+            return MISSING
+        return entry["address"]
+
+    async def set_reverse(self, latitude: float, longitude: float, address: str) -> None:
+        await self._set(
+            "reverse",
+            reverse_key(latitude, longitude, self.precision),
+            {"latitude": latitude, "longitude": longitude, "address": address}
+        )
+
+    def stats(self) -> Dict[str, int]:
+        memory = self.memory.stats()
+        return {
+            "memory_hits": memory["hits"],
+            "memory_size": memory["size"],
+            "db_hits": self.db_hits,
+            "misses": self.db_misses,
+        }
+
+    async def _get(self, kind: str, key: str) -> Any:
+        value = self.memory.get((kind, key), MISSING)
+        if value is not MISSING:
+            return value
+
+        value = await self._load(kind, key)
+        if value is MISSING:
+            self.db_misses += 1
+            return MISSING
+
+        self.db_hits += 1
+        self.memory.set((kind, key), value)
+        return value
+
+    async def _set(self, kind: str, key: str, value: Dict[str, Any]) -> None:
+        value = {
+            "latitude": value.get("latitude"),
+            "longitude": value.get("longitude"),
+            "address": value.get("address"),
+        }
+        self.memory.set((kind, key), value)
+        await self._store(kind, key, value)
+
+    async def _load(self, kind: str, key: str) -> Any:
+        if self.session_factory is None:
+            return MISSING
+        try:
+            async with self.session_factory() as db:
+                result = await db.execute(
+                    select(GeocodeCacheEntry).where(
+                        GeocodeCacheEntry.kind == kind,
+                        GeocodeCacheEntry.key == key
+                    )
+                )
+                entry = result.scalars().first()
+        except SQLAlchemyError as e:
+            print(f"Geocode cache read error: {e}")
+            return MISSING
+
+        if entry is None:
+            return MISSING
+        expires_at = entry.expires_at
+        if expires_at.tzinfo is None:
+            expires_at = expires_at.replace(tzinfo=timezone.utc)
+        if expires_at <= datetime.now(timezone.utc):
+            return MISSING
+        return {"latitude": entry.latitude, "longitude": entry.longitude, "address": entry.address}
+
+    async def _store(self, kind: str, key: str, value: Dict[str, Any]) -> None:
+        if self.session_factory is None:
+            return
+        expires_at = datetime.now(timezone.utc) + timedelta(seconds=self.ttl)
+        try:
+            async with self.session_factory() as db:
+                result = await db.execute(
+                    select(GeocodeCacheEntry).where(
+                        GeocodeCacheEntry.kind == kind,
+                        GeocodeCacheEntry.key == key
+                    )
+                )
+                entry = result.scalars().first()
+                if entry is None:
+                    entry = GeocodeCacheEntry(kind=kind, key=key)
+                    db.add(entry)
+                entry.latitude = value["latitude"]
+                entry.longitude = value["longitude"]
+                entry.address = value["address"]
+                entry.expires_at = expires_at
+                await db.commit()
+        except SQLAlchemyError as e:
+            print(f"Geocode cache write error: {e}")
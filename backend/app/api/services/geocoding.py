@@ -0,0 +1,228 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Tuple
+from sqlalchemy import and_, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.api.core.config import settings
+from app.api.core.db import AsyncSessionLocal
+from app.api.models.event import Event, GEOCODE_DONE, GEOCODE_FAILED, GEOCODE_PENDING, GEOCODE_PROCESSING
+from app.api.services.clusters import invalidate_point
+from app.api.services.maps import YandexMapsService, yandex_maps_service
+from app.api.services.response_cache import invalidate_events
+
+class GeocodingWorker:
+    """Фоновое геокодирование событий со статусом pending.
+
+    Неудачные попытки откладываются с экспоненциальной задержкой, после
+    max_attempts событие помечается failed. notify() будит воркер сразу,
+    не дожидаясь очередного интервала.
+    """
+
+    def __init__(
+        self,
+        maps_service: YandexMapsService = yandex_maps_service,
+        session_factory=AsyncSessionLocal,
+        interval: float = settings.GEOCODE_WORKER_INTERVAL,
+        batch_size: int = settings.GEOCODE_WORKER_BATCH,
+        max_attempts: int = settings.GEOCODE_MAX_ATTEMPTS,
+        retry_delay: float = settings.GEOCODE_RETRY_DELAY,
+        retry_max_delay: float = settings.GEOCODE_RETRY_MAX_DELAY,
+        claim_timeout: float = settings.GEOCODE_CLAIM_TIMEOUT
+    ):
+        self.maps_service = maps_service
+        self.session_factory = session_factory
+        self.interval = interval
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.retry_max_delay = retry_max_delay
+        self.claim_timeout = claim_timeout
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+
+    async def start(self) -> None:
+        if self._task is not None:
+            return
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        self._wakeup = None
+
+    def notify(self) -> None:
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def retry_after(self, attempts: int) -> timedelta:
+        delay = self.retry_delay * (2 ** (attempts - 1))
+        return timedelta(seconds=min(delay, self.retry_max_delay))
+
+    async def run_once(self) -> int:
+        """Обработать одну пачку готовых к геокодированию событий.
+
+        Три шага, чтобы HTTP-запросы не шли под открытой транзакцией:
+        короткая транзакция захватывает строки (processing с арендой до
+        claim_timeout), геокодирование идёт без соединения с БД, результаты
+        пишутся второй короткой транзакцией. Если за это время событие
+        изменили (другой адрес или статус), результат отбрасывается.
+        """
+        claimed = await self._claim()
+        if not claimed:
+            return 0
+
+        coords = await self.maps_service.geocode_many([location for _, location, _ in claimed])
+
+        done = await self._save(claimed, coords)
+        for latitude, longitude in done:
+            invalidate_point(latitude, longitude)
+        await invalidate_events(*(event_id for event_id, _, _ in claimed))
+        return len(claimed)
+
+    async def _claim(self) -> List[Tuple[int, str, int]]:
+        now = datetime.now(timezone.utc)
+        async with self.session_factory() as db:
+            result = await db.execute(
+                select(Event.id, Event.location, Event.geocode_attempts)
+                .where(
+                    or_(
+                        and_(
+                            Event.geocode_status == GEOCODE_PENDING,
+                            or_(
+                                Event.geocode_next_attempt_at.is_(None),
+                                Event.geocode_next_attempt_at <= now
+                            )
+                        ),
+                        and_(
+                            Event.geocode_status == GEOCODE_PROCESSING,
+                            Event.geocode_next_attempt_at <= now
+                        )
+                    )
+                )
+                .order_by(Event.id)
+                .limit(self.batch_size)
+                .with_for_update(skip_locked=True)
+            )
+            claimed = [tuple(row) for row in result.all()]
+            if claimed:
+                await db.execute(
+                    update(Event)
+                    .where(Event.id.in_([event_id for event_id, _, _ in claimed]))
+                    .values(
+                        geocode_status=GEOCODE_PROCESSING,
+                        geocode_next_attempt_at=now + timedelta(seconds=self.claim_timeout)
+                    )
+                    .execution_options(synchronize_session=False)
+                )
+            await db.commit()
+        return claimed
+
+    async def _save(self, claimed, coords) -> List[Tuple[float, float]]:
+        now = datetime.now(timezone.utc)
+        done = []
+        async with self.session_factory() as db:
+            for (event_id, location, attempts), found in zip(claimed, coords):
+                attempts += 1
+                values = {"geocode_attempts": attempts, "geocode_next_attempt_at": None}
+                if found:
+                    values.update(
+                        latitude=found["latitude"],
+                        longitude=found["longitude"],
+                        geocode_status=GEOCODE_DONE
+                    )
+                elif attempts >= self.max_attempts:
+                    values["geocode_status"] = GEOCODE_FAILED
+                else:
+                    values["geocode_status"] = GEOCODE_PENDING
+                    values["geocode_next_attempt_at"] = now + self.retry_after(attempts)
+
+                result = await db.execute(
+                    update(Event)
+                    .where(
+                        Event.id == event_id,
+                        Event.geocode_status == GEOCODE_PROCESSING,
+                        Event.location == location
+                    )
+                    .values(**values)
+                    .execution_options(synchronize_session=False)
+                )
+                if found and result.rowcount:
+                    done.append((found["latitude"], found["longitude"]))
+            await db.commit()
+        return done
+
+    def error_backoff(self, errors: int) -> float:
+        return min(self.interval * (2 ** (errors - 1)), self.retry_max_delay)
+
+    async def _run(self) -> None:
+        errors = 0
+        while True:
+            # CancelledError не наследует Exception и останавливает воркер как обычно;
+            # любая другая ошибка (БД, HTTP, broker) только откладывает следующий проход.
+            try:
+                processed = await self.run_once()
+            except Exception as e:
+                errors += 1
+                delay = self.error_backoff(errors)
+                print(f"Geocoding worker error: {e!r}, retry in {delay:.0f}s")
+                await asyncio.sleep(delay)
+                continue
+            errors = 0
+
+            if processed >= self.batch_size:
+                continue
+
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+async def queue_missing_coordinates(db: AsyncSession) -> int:
+    """Вернуть в очередь все события без координат, включая failed."""
+    result = await db.execute(
+        update(Event)
+        .where(
+            or_(Event.latitude.is_(None), Event.longitude.is_(None)),
+            Event.geocode_status != GEOCODE_PROCESSING,
+            or_(
+                Event.geocode_status != GEOCODE_PENDING,
+                Event.geocode_attempts > 0
+            )
+        )
+        .values(
+            geocode_status=GEOCODE_PENDING,
+            geocode_attempts=0,
+            geocode_next_attempt_at=None
+        )
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+    return result.rowcount
+
+geocoding_worker = GeocodingWorker()
+
+async def main():
+    async with AsyncSessionLocal() as db:
+        queued = await queue_missing_coordinates(db)
+    print(f"Events queued for geocoding: {queued}")
+
+    await yandex_maps_service.start()
+    worker = GeocodingWorker()
+    try:
+        total = 0
+        while processed := await worker.run_once():
+            total += processed
+        print(f"Events processed: {total}")
+    finally:
+        await yandex_maps_service.stop()
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,123 @@
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+from typing import Dict, Iterable, List, Optional
+from PIL import Image, ImageOps
+from sqlalchemy import update
+from app.api.core.config import settings
+from app.api.core.db import AsyncSessionLocal
+from app.api.core.s3 import avatar_key_from_url, get_s3_client, public_url, run_in_s3_executor
+from app.api.models.user import User
+from app.api.services.user_cache import invalidate_user
+
+WEBP_QUALITY = 80
+
+_image_executor: Optional[ProcessPoolExecutor] = None
+
+def get_image_executor() -> ProcessPoolExecutor:
+    """Пул процессов для Pillow: ресайз упирается в CPU и не должен занимать воркеры API."""
+    global _image_executor
+    if _image_executor is None:
+        _image_executor = ProcessPoolExecutor(
+            max_workers=settings.IMAGE_WORKERS,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    return _image_executor
+
+def shutdown_image_executor() -> None:
+    global _image_executor
+    if _image_executor is not None:
+        _image_executor.shutdown(wait=True, cancel_futures=True)
+        _image_executor = None
+
+def render_avatar_variants(data: bytes, sizes: Iterable[int]) -> Dict[int, bytes]:
+    """Квадратные WebP-миниатюры по центру исходника. Выполняется в дочернем процессе."""
+    sizes = sorted(sizes)
+    with Image.open(BytesIO(data)) as source:
+        # JPEG умеет декодироваться сразу в уменьшенном масштабе — это в разы быстрее.
+        source.draft("RGB", (sizes[-1] * 2, sizes[-1] * 2))
+        image = ImageOps.exif_transpose(source)
+        image = image.convert("RGBA" if "A" in image.getbands() else "RGB")
+
+    variants = {}
+    for size in reversed(sizes):
+        image = ImageOps.fit(image, (size, size), method=Image.LANCZOS)
+        buffer = BytesIO()
+        image.save(buffer, format="WEBP", quality=WEBP_QUALITY, method=4)
+        variants[size] = buffer.getvalue()
+    return variants
+
+def variant_key(key: str, size: int) -> str:
+    return f"{os.path.splitext(key)[0]}_{size}.webp"
+
+async def process_avatar(
+    user_id: int,
+    avatar_url: str,
+    session_factory=AsyncSessionLocal
+) -> Optional[Dict[str, str]]:
+    """Построить миниатюры для загруженного аватара и сохранить их URL у пользователя.
+
+    Если пока шла обработка аватар успели заменить, миниатюры удаляются.
+    """
+    client = get_s3_client()
+    key = avatar_key_from_url(avatar_url)
+    try:
+        obj = await run_in_s3_executor(client.get_object, Bucket=settings.S3_BUCKET, Key=key)
+        data = await run_in_s3_executor(obj["Body"].read)
+
+        loop = asyncio.get_running_loop()
+        rendered = await loop.run_in_executor(
+            get_image_executor(),
+            render_avatar_variants,
+            data,
+            settings.AVATAR_VARIANT_SIZES
+        )
+
+        await asyncio.gather(*[
+            run_in_s3_executor(
+                client.put_object,
+                Bucket=settings.S3_BUCKET,
+                Key=variant_key(key, size),
+                Body=body,
+                ContentType="image/webp",
+                CacheControl="public, max-age=31536000, immutable"
+            )
+            for size, body in rendered.items()
+        ])
+    except Exception as e:
+        print(f"Avatar processing error: {e}")
+        return None
+
+    variants = {str(size): public_url(variant_key(key, size)) for size in sorted(rendered)}
+    async with session_factory() as db:
+        result = await db.execute(
+            update(User)
+            .where(User.id == user_id, User.avatar_url == avatar_url)
+            .values(avatar_variants=variants)
+        )
+        await db.commit()
+
+    if result.rowcount == 0:
+        await delete_avatar_files(None, variants)
+        return None
+    await invalidate_user(user_id)
+    return variants
+
+async def delete_avatar_files(avatar_url: Optional[str], variants: Optional[Dict[str, str]]) -> None:
+    urls: List[str] = list((variants or {}).values())
+    if avatar_url:
+        urls.append(avatar_url)
+    if not urls:
+        return
+
+    client = get_s3_client()
+    try:
+        await run_in_s3_executor(
+            client.delete_objects,
+            Bucket=settings.S3_BUCKET,
+            Delete={"Objects": [{"Key": avatar_key_from_url(url)} for url in urls], "Quiet": True}
+        )
+    except Exception as e:
+        print(f"Error deleting avatar: {e}")
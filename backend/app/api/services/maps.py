@@ -1,87 +1,186 @@
+import asyncio
 import httpx
 from app.api.core.config import settings
-from typing import Optional, Dict, Any
+from app.api.services.geocode_cache import GeocodeCache, MISSING, normalize_address, reverse_key
+from typing import Optional, Dict, Any, List, Tuple
 
 class YandexMapsService:
+    """Клиент геокодера Яндекса.
+
+    Держит один долгоживущий httpx.AsyncClient на процесс: соединения
+    переиспользуются через keep-alive, а семафор ограничивает число
+    одновременных запросов к API. Клиент открывается в lifespan приложения.
+    """
     
-    def __init__(self):
+    def __init__(
+        self,
+        cache: Optional[GeocodeCache] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        concurrency: int = settings.MAPS_HTTP_CONCURRENCY
+    ):
         self.api_key = settings.YANDEX_MAPS_API_KEY
         self.geocoder_url = "https://geocode-maps.yandex.ru/1.x/"
-        self.timeout = 10.0
+        self.timeout = httpx.Timeout(
+            settings.MAPS_HTTP_TIMEOUT,
+            connect=settings.MAPS_HTTP_CONNECT_TIMEOUT
+        )
+        self.limits = httpx.Limits(
+            max_connections=settings.MAPS_HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.MAPS_HTTP_MAX_KEEPALIVE
+        )
+        self.concurrency = concurrency
+        self.transport = transport
+        self.cache = cache or GeocodeCache()
+        self.client: Optional[httpx.AsyncClient] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    async def start(self) -> None:
+        if self.client is not None:
+            return
+        self.client = httpx.AsyncClient(
+            timeout=self.timeout,
+            limits=self.limits,
+            transport=self.transport
+        )
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+
+    async def stop(self) -> None:
+        if self.client is None:
+            return
+        await self.client.aclose()
+        self.client = None
+        self._semaphore = None
+
+    async def _get(self, params: Dict[str, Any]) -> httpx.Response:
+        if self.client is None:
+            await self.start()
+        async with self._semaphore:
+            response = await self.client.get(self.geocoder_url, params=params)
+        response.raise_for_status()
+        return response
     
     async def geocode_address(self, address: str) -> Optional[Dict[str, Any]]:
+        cached = await self.cache.get_forward(address)
+        if cached is not MISSING:
+            return cached
+
+        result = await self._request_geocode(address)
+        if result:
+            await self.cache.set_forward(address, result)
+        return result
+    
+    async def get_address_by_coords(
+        self, 
+        latitude: float, 
+        longitude: float
+    ) -> Optional[str]:
+        cached = await self.cache.get_reverse(latitude, longitude)
+        if cached is not MISSING:
+            return cached
+
+        address = await self._request_reverse_geocode(latitude, longitude)
+        if address:
+            await self.cache.set_reverse(latitude, longitude, address)
+        return address
+    
+    async def geocode_many(self, addresses: List[str]) -> List[Optional[Dict[str, Any]]]:
+        """Геокодировать список адресов: одинаковые адреса запрашиваются один раз,
+        результаты возвращаются в порядке входа, None — для ненайденных."""
+        unique: Dict[str, str] = {}
+        for address in addresses:
+            unique.setdefault(normalize_address(address), address)
+
+        found = await self._gather(self.geocode_address, [(a,) for a in unique.values()])
+        by_key = dict(zip(unique.keys(), found))
+
+        results = []
+        for address in addresses:
+            result = by_key[normalize_address(address)]
+            results.append({**result, "address": address} if result else None)
+        return results
+
+    async def get_addresses_by_coords(
+        self,
+        points: List[Tuple[float, float]]
+    ) -> List[Optional[str]]:
+        unique: Dict[str, Tuple[float, float]] = {}
+        for latitude, longitude in points:
+            unique.setdefault(reverse_key(latitude, longitude, self.cache.precision), (latitude, longitude))
+
+        found = await self._gather(self.get_address_by_coords, list(unique.values()))
+        by_key = dict(zip(unique.keys(), found))
+        return [by_key[reverse_key(lat, lon, self.cache.precision)] for lat, lon in points]
+
+    async def _gather(self, func, args_list: List[tuple]) -> List[Any]:
+        results = await asyncio.gather(*[func(*args) for args in args_list], return_exceptions=True)
+        for args, result in zip(args_list, results):
+            if isinstance(result, Exception):
+                print(f"Yandex Geocoder error for {args}: {result}")
+        return [None if isinstance(result, Exception) else result for result in results]
+    
+    async def _request_geocode(self, address: str) -> Optional[Dict[str, Any]]:
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(
-                    self.geocoder_url,
-                    params={
-                        "apikey": self.api_key,
-                        "geocode": address,
-                        "format": "json",
-                        "lang": "ru_RU"
-                    }
-                )
-                response.raise_for_status()
-                data = response.json()
+            response = await self._get({
+                "apikey": self.api_key,
+                "geocode": address,
+                "format": "json",
+                "lang": "ru_RU"
+            })
+            data = response.json()
+            
+            feature_member = (
+                data.get("response", {})
+                .get("GeoObjectCollection", {})
+                .get("featureMember", [])
+            )
+            
+            if feature_member:
+                geo_object = feature_member[0].get("GeoObject", {})
+                point = geo_object.get("Point", {})
+                pos = point.get("pos", "").split()
                 
-                feature_member = (
-                    data.get("response", {})
-                    .get("GeoObjectCollection", {})
-                    .get("featureMember", [])
-                )
-                
-                if feature_member:
-                    geo_object = feature_member[0].get("GeoObject", {})
-                    point = geo_object.get("Point", {})
-                    pos = point.get("pos", "").split()
-                    
-                    if len(pos) == 2:
-                        return {
-                            "longitude": float(pos[0]),
-                            "latitude": float(pos[1]),
-                            "address": address
-                        }
-                
-                return None
+                if len(pos) == 2:
+                    return {
+                        "longitude": float(pos[0]),
+                        "latitude": float(pos[1]),
+                        "address": address
+                    }
+            
+            return None
                 
-        except (httpx.HTTPError, httpx.ReadTimeout, ValueError, IndexError) as e:
+        except (httpx.HTTPError, ValueError, IndexError) as e:
             print(f"Yandex Geocoder error: {e}")
             return None
     
-    async def get_address_by_coords(
+    async def _request_reverse_geocode(
         self, 
         latitude: float, 
         longitude: float
     ) -> Optional[str]:
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(
-                    self.geocoder_url,
-                    params={
-                        "apikey": self.api_key,
-                        "geocode": f"{longitude},{latitude}",
-                        "format": "json",
-                        "lang": "ru_RU",
-                        "kind": "house"
-                    }
-                )
-                response.raise_for_status()
-                data = response.json()
-                
-                feature_member = (
-                    data.get("response", {})
-                    .get("GeoObjectCollection", {})
-                    .get("featureMember", [])
+            response = await self._get({
+                "apikey": self.api_key,
+                "geocode": f"{longitude},{latitude}",
+                "format": "json",
+                "lang": "ru_RU",
+                "kind": "house"
+            })
+            data = response.json()
+            
+            feature_member = (
+                data.get("response", {})
+                .get("GeoObjectCollection", {})
+                .get("featureMember", [])
+            )
+            
+            if feature_member:
+                return (
+                    feature_member[0]
+                    .get("GeoObject", {})
+                    .get("name", "")
                 )
-                
-                if feature_member:
-                    return (
-                        feature_member[0]
-                        .get("GeoObject", {})
-                        .get("name", "")
-                    )
-                
-                return None
+            
+            return None
                 
         except Exception as e:
             print(f"Yandex Reverse Geocoder error: {e}")
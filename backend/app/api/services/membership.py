@@ -0,0 +1,83 @@
+from typing import Dict, Set, Tuple
+from fastapi import Depends
+from sqlalchemy import delete, exists, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.api.core.cache import TTLCache
+from app.api.core.config import settings
+from app.api.core.db import get_db
+from app.api.models.group import Group, group_members
+
+# Кэшируются только положительные ответы: после вступления в группу
+# пользователь сразу получает доступ, а после выхода в других воркерах
+# доступ сохраняется не дольше MEMBERSHIP_CACHE_TTL секунд.
+membership_cache = TTLCache(maxsize=10000, ttl=settings.MEMBERSHIP_CACHE_TTL)
+
+class MembershipService:
+    def __init__(self, db: AsyncSession, cache: TTLCache = membership_cache):
+        self.db = db
+        self.cache = cache
+        self._request_cache: Dict[Tuple[int, int], bool] = {}
+
+    async def is_member(self, group_id: int, user_id: int, use_cache: bool = True) -> bool:
+        key = (group_id, user_id)
+        if key in self._request_cache:
+            return self._request_cache[key]
+        if use_cache and self.cache.get(key):
+            self._request_cache[key] = True
+            return True
+
+        is_member = bool(await self.db.scalar(
+            select(
+                exists().where(
+                    group_members.c.group_id == group_id,
+                    group_members.c.user_id == user_id
+                )
+            )
+        ))
+        self._request_cache[key] = is_member
+        if is_member:
+            self.cache.set(key, True)
+        return is_member
+
+    async def group_ids_for_user(self, user_id: int) -> Set[int]:
+        result = await self.db.execute(
+            select(group_members.c.group_id).where(group_members.c.user_id == user_id)
+        )
+        return set(result.scalars().all())
+
+    async def add_member(self, group_id: int, user_id: int) -> bool:
+        """Добавить участника; False, если в группе нет свободных мест."""
+        result = await self.db.execute(
+            update(Group)
+            .where(Group.id == group_id, Group.members_count < Group.max_members)
+            .values(members_count=Group.members_count + 1)
+        )
+        if result.rowcount == 0:
+            return False
+
+        await self.db.execute(insert(group_members).values(user_id=user_id, group_id=group_id))
+        self._request_cache[(group_id, user_id)] = True
+        return True
+
+    async def remove_member(self, group_id: int, user_id: int) -> bool:
+        """Удалить участника; False, если он уже не состоял в группе — счётчик тогда не трогается."""
+        result = await self.db.execute(
+            delete(group_members).where(
+                group_members.c.group_id == group_id,
+                group_members.c.user_id == user_id
+            )
+        )
+        self._request_cache[(group_id, user_id)] = False
+        self.cache.delete((group_id, user_id))
+        if result.rowcount != 1:
+            return False
+
+        await self.db.execute(
+            update(Group)
+            .where(Group.id == group_id)
+            .values(members_count=Group.members_count - 1)
+        )
+        return True
+
+def get_membership_service(db: AsyncSession = Depends(get_db)) -> MembershipService:
+    return MembershipService(db)
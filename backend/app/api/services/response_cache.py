@@ -0,0 +1,282 @@
+import hashlib
+import json
+import time
+from typing import Any, Dict, Iterable, Optional, Tuple
+from urllib.parse import urlencode
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from app.api.core.cache import TTLCache
+from app.api.core.config import settings
+from app.api.services.broker import broker
+
+RESPONSE_CACHE_CHANNEL = "response-cache"
+
+CATALOG = "catalog"
+EVENT = "event"
+
+class CachedResponse:
+    """Готовое JSON-тело ответа и его ETag."""
+
+    __slots__ = ("body", "etag")
+
+    def __init__(self, body: bytes, etag: Optional[str] = None):
+        self.body = body
+        self.etag = etag or f'"{hashlib.sha1(body).hexdigest()}"'
+
+    @classmethod
+    def from_payload(cls, payload: Any) -> "CachedResponse":
+        body = json.dumps(jsonable_encoder(payload), ensure_ascii=False, separators=(",", ":"))
+        return cls(body.encode("utf-8"))
+
+    def to_response(self, request: Request) -> Response:
+        headers = {
+            "ETag": self.etag,
+            "Cache-Control": f"public, max-age={settings.RESPONSE_CACHE_MAX_AGE}",
+        }
+        if etag_matches(request.headers.get("if-none-match"), self.etag):
+            return Response(status_code=304, headers=headers)
+        return Response(content=self.body, media_type="application/json", headers=headers)
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == "*" or candidate == etag:
+            return True
+    return False
+
+def normalize_params(params: Dict[str, Any]) -> str:
+    """Ключ из параметров запроса: без пустых значений, в фиксированном порядке, даты в ISO."""
+    items = []
+    for name in sorted(params):
+        value = params[name]
+        if isinstance(value, str):
+            value = value.strip()
+        if value is None or value == "":
+            continue
+        if hasattr(value, "isoformat"):
+            value = value.isoformat()
+        items.append((name, value))
+    return urlencode(items)
+
+# Поколения кэша на момент промаха: локальное и общее (None, если backend недоступен).
+Generation = Tuple[int, Optional[int]]
+
+class ResponseCacheBackend:
+    """Общий для воркеров уровень кэша; namespace сбрасывается целиком одной операцией.
+
+    Каждый сброс повышает общее поколение, а set с generation пишет только
+    если оно не изменилось — иначе ответ мог быть вычислен до сброса.
+    """
+
+    async def generation(self) -> int:
+        raise NotImplementedError
+
+    async def get(self, namespace: str, key: str) -> Optional[CachedResponse]:
+        raise NotImplementedError
+
+    async def set(self, namespace: str, key: str, value: CachedResponse, ttl: float,
+                  generation: Optional[int] = None) -> bool:
+        raise NotImplementedError
+
+    async def delete(self, namespace: str, key: str) -> None:
+        raise NotImplementedError
+
+    async def clear(self, namespace: str) -> None:
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        pass
+
+class RedisResponseCacheBackend(ResponseCacheBackend):
+    """Namespace — хеш в Redis, поэтому сброс каталога это один DEL.
+
+    Срок жизни хранится в самой записи: у полей хеша нет собственного TTL.
+    Поколение — счётчик {prefix}gen, запись сверяется с ним под WATCH/MULTI.
+    """
+
+    def __init__(self, url: Optional[str] = None, client=None, prefix: str = "respcache:"):
+        self.url = url
+        self.prefix = prefix
+        self._redis = client
+
+    def _client(self):
+        if self._redis is None:
+            import redis.asyncio as redis
+
+            self._redis = redis.from_url(self.url, decode_responses=True)
+        return self._redis
+
+    @property
+    def _generation_key(self) -> str:
+        return f"{self.prefix}gen"
+
+    async def generation(self) -> int:
+        return int(await self._client().get(self._generation_key) or 0)
+
+    async def get(self, namespace: str, key: str) -> Optional[CachedResponse]:
+        raw = await self._client().hget(f"{self.prefix}{namespace}", key)
+        if raw is None:
+            return None
+        item = json.loads(raw)
+        if item["expires"] <= time.time():
+            return None
+        return CachedResponse(item["body"].encode("utf-8"), item["etag"])
+
+    async def set(self, namespace: str, key: str, value: CachedResponse, ttl: float,
+                  generation: Optional[int] = None) -> bool:
+        item = json.dumps({"body": value.body.decode("utf-8"), "etag": value.etag, "expires": time.time() + ttl})
+        name = f"{self.prefix}{namespace}"
+        result = {}
+
+        async def attempt(pipe):
+            current = int(await pipe.get(self._generation_key) or 0)
+            result["stored"] = generation is None or current == generation
+            pipe.multi()
+            if result["stored"]:
+                pipe.hset(name, key, item)
+                pipe.expire(name, int(ttl) + 1)
+
+        await self._client().transaction(attempt, self._generation_key)
+        return result["stored"]
+
+    async def delete(self, namespace: str, key: str) -> None:
+        async with self._client().pipeline(transaction=True) as pipe:
+            pipe.incr(self._generation_key)
+            pipe.hdel(f"{self.prefix}{namespace}", key)
+            await pipe.execute()
+
+    async def clear(self, namespace: str) -> None:
+        async with self._client().pipeline(transaction=True) as pipe:
+            pipe.incr(self._generation_key)
+            pipe.delete(f"{self.prefix}{namespace}")
+            await pipe.execute()
+
+    async def close(self) -> None:
+        if self._redis is not None:
+            await self._redis.aclose()
+            self._redis = None
+
+class ResponseCache:
+    """Двухуровневый кэш ответов: память процесса и необязательный общий backend.
+
+    Запись сбрасывает оба уровня и рассылает сброс остальным воркерам через broker.
+    """
+
+    def __init__(self, backend: Optional[ResponseCacheBackend] = None,
+                 ttl: float = settings.RESPONSE_CACHE_TTL,
+                 maxsize: int = settings.RESPONSE_CACHE_SIZE):
+        self.backend = backend
+        self.ttl = ttl
+        self.generation = 0
+        self._memory = {
+            CATALOG: TTLCache(maxsize=maxsize, ttl=ttl),
+            EVENT: TTLCache(maxsize=maxsize, ttl=ttl),
+        }
+
+    async def get(self, namespace: str, key: str) -> Optional[CachedResponse]:
+        memory = self._memory[namespace]
+        cached = memory.get(key)
+        if cached is not None or self.backend is None:
+            return cached
+
+        try:
+            cached = await self.backend.get(namespace, key)
+        except Exception as e:
+            print(f"Response cache read error: {e}")
+            return None
+        if cached is not None:
+            memory.set(key, cached)
+        return cached
+
+    async def snapshot(self) -> Generation:
+        """Поколения до вычисления ответа; передаются в store."""
+        shared = None
+        if self.backend is not None:
+            try:
+                shared = await self.backend.generation()
+            except Exception as e:
+                print(f"Response cache read error: {e}")
+        return self.generation, shared
+
+    async def store(self, namespace: str, key: str, payload: Any,
+                    generation: Optional[Generation] = None) -> CachedResponse:
+        """Сохранить ответ; если с generation успел пройти сброс (в любом воркере), ответ не кэшируется."""
+        cached = CachedResponse.from_payload(payload)
+        local, shared = generation if generation is not None else (self.generation, None)
+        if local != self.generation:
+            return cached
+        # Если общее поколение прочитать не удалось, ответ остаётся только в памяти процесса.
+        if self.backend is not None and (generation is None or shared is not None):
+            try:
+                if not await self.backend.set(namespace, key, cached, self.ttl, shared):
+                    return cached
+            except Exception as e:
+                print(f"Response cache write error: {e}")
+        self._memory[namespace].set(key, cached)
+        return cached
+
+    def drop_local(self, event_ids: Iterable[int] = ()) -> None:
+        self.generation += 1
+        self._memory[CATALOG].clear()
+        for event_id in event_ids:
+            self._memory[EVENT].delete(str(event_id))
+
+    async def invalidate_events(self, *event_ids: int) -> None:
+        """Сбросить каталог целиком и карточки перечисленных событий."""
+        self.drop_local(event_ids)
+        if self.backend is not None:
+            try:
+                await self.backend.clear(CATALOG)
+                for event_id in event_ids:
+                    await self.backend.delete(EVENT, str(event_id))
+            except Exception as e:
+                print(f"Response cache invalidation error: {e}")
+        await self._broadcast({"event_ids": list(event_ids)})
+
+    async def invalidate_all(self) -> None:
+        self.clear()
+        if self.backend is not None:
+            try:
+                for namespace in self._memory:
+                    await self.backend.clear(namespace)
+            except Exception as e:
+                print(f"Response cache invalidation error: {e}")
+        await self._broadcast({"all": True})
+
+    async def _broadcast(self, message: Dict[str, Any]) -> None:
+        # Запись в БД уже закоммичена: недоступный broker не должен превращать её в 500.
+        try:
+            await broker.publish(RESPONSE_CACHE_CHANNEL, message)
+        except Exception as e:
+            print(f"Response cache broadcast error: {e}")
+
+    def clear(self) -> None:
+        self.generation += 1
+        for memory in self._memory.values():
+            memory.clear()
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        return {namespace: memory.stats() for namespace, memory in self._memory.items()}
+
+async def listen_for_invalidations() -> None:
+    async with broker.subscribe(RESPONSE_CACHE_CHANNEL) as queue:
+        while True:
+            message = await queue.get()
+            if message.get("all"):
+                response_cache.clear()
+            else:
+                response_cache.drop_local(message.get("event_ids", ()))
+
+def create_response_cache_backend(url: str) -> Optional[ResponseCacheBackend]:
+    if url.startswith("redis://") or url.startswith("rediss://"):
+        return RedisResponseCacheBackend(url)
+    return None
+
+response_cache = ResponseCache(create_response_cache_backend(settings.REDIS_URL))
+
+async def invalidate_events(*event_ids: int) -> None:
+    await response_cache.invalidate_events(*event_ids)
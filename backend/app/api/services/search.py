@@ -0,0 +1,43 @@
+from typing import Tuple
+from sqlalchemy import and_, case, func, literal_column, or_
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.sql.elements import ColumnElement
+from app.api.models.event import Event, EVENT_SEARCH_CONFIG, EVENT_SEARCH_DOCUMENT
+
+def _postgres_event_search(search: str) -> Tuple[ColumnElement, ColumnElement]:
+    document = literal_column(
+        "(" + EVENT_SEARCH_DOCUMENT.format(prefix="events.") + ")",
+        type_=TSVECTOR
+    )
+    ts_query = func.websearch_to_tsquery(
+        literal_column(f"'{EVENT_SEARCH_CONFIG}'::regconfig"),
+        search
+    )
+    condition = or_(
+        document.op("@@")(ts_query),
+        Event.title.ilike(f"%{search}%")
+    )
+    rank = func.ts_rank_cd(document, ts_query) + func.similarity(Event.title, search)
+    return condition, rank
+
+def _fallback_event_search(search: str) -> Tuple[ColumnElement, ColumnElement]:
+    terms = search.split() or [search]
+    conditions = []
+    rank = None
+    for term in terms:
+        pattern = f"%{term}%"
+        conditions.append(or_(Event.title.ilike(pattern), Event.description.ilike(pattern)))
+        term_rank = case((Event.title.ilike(pattern), 2), else_=0) + case((Event.description.ilike(pattern), 1), else_=0)
+        rank = term_rank if rank is None else rank + term_rank
+    return and_(*conditions), rank
+
+def build_event_search(dialect_name: str, search: str) -> Tuple[ColumnElement, ColumnElement]:
+    """Условие фильтрации и выражение релевантности для поиска по событиям.
+
+    На PostgreSQL используется tsvector-индекс по title/description и
+    pg_trgm-индекс по title, на остальных СУБД — ILIKE по каждому слову.
+    """
+    search = search.strip()
+    if dialect_name == "postgresql":
+        return _postgres_event_search(search)
+    return _fallback_event_search(search)
@@ -0,0 +1,174 @@
+import asyncio
+import hashlib
+import secrets
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Tuple
+from fastapi import Depends
+from jose import JWTError, jwt
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.api.core.config import settings
+from app.api.core.db import AsyncSessionLocal, get_db
+from app.api.core.security import ALGORITHM, SECRET_KEY
+from app.api.models.session import RefreshSession
+from app.api.models.user import User
+
+def hash_token_id(jti: str) -> str:
+    return hashlib.sha256(jti.encode("utf-8")).hexdigest()
+
+def _encode_refresh_token(user: User, jti: str, expires_at: datetime) -> str:
+    return jwt.encode(
+        {
+            "sub": user.email,
+            "user_id": user.id,
+            "jti": jti,
+            "exp": expires_at,
+            "type": "refresh"
+        },
+        SECRET_KEY,
+        algorithm=ALGORITHM
+    )
+
+class SessionService:
+    """Refresh-сессии: по строке на устройство, поиск и отзыв по хешу jti.
+
+    В БД хранится только sha256 от идентификатора токена, так что утечка
+    таблицы не даёт действующих токенов. Каждый refresh ротирует jti той же
+    строки, сохраняя устройство.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    def _new_expiry(self) -> datetime:
+        return datetime.now(timezone.utc) + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+
+    async def create(self, user: User, user_agent: Optional[str] = None) -> str:
+        jti = secrets.token_urlsafe(32)
+        expires_at = self._new_expiry()
+        self.db.add(RefreshSession(
+            token_hash=hash_token_id(jti),
+            user_id=user.id,
+            user_agent=(user_agent or "")[:255] or None,
+            expires_at=expires_at
+        ))
+        await self.db.commit()
+        return _encode_refresh_token(user, jti, expires_at)
+
+    async def _get_by_token(self, refresh_token: str) -> Optional[RefreshSession]:
+        try:
+            payload = jwt.decode(refresh_token, SECRET_KEY, algorithms=[ALGORITHM])
+        except JWTError:
+            return None
+        if payload.get("type") != "refresh" or not payload.get("jti"):
+            return None
+
+        result = await self.db.execute(
+            select(RefreshSession).where(RefreshSession.token_hash == hash_token_id(payload["jti"]))
+        )
+        session = result.scalars().first()
+        if session is None or session.user_id != payload.get("user_id"):
+            return None
+        return session
+
+    async def rotate(self, refresh_token: str) -> Optional[Tuple[User, str]]:
+        """Обменять действующий refresh-токен на новый; старый сразу перестаёт работать.
+
+        Замена хеша — условный UPDATE по старому хешу, поэтому из двух
+        одновременных refresh одним токеном выигрывает только один, а второй
+        получает None, как при повторном использовании.
+        """
+        session = await self._get_by_token(refresh_token)
+        if session is None:
+            return None
+
+        user = await self.db.get(User, session.user_id)
+        if user is None or not user.is_active:
+            return None
+
+        jti = secrets.token_urlsafe(32)
+        expires_at = self._new_expiry()
+        result = await self.db.execute(
+            update(RefreshSession)
+            .where(
+                RefreshSession.id == session.id,
+                RefreshSession.token_hash == session.token_hash
+            )
+            .values(
+                token_hash=hash_token_id(jti),
+                last_used_at=datetime.now(timezone.utc),
+                expires_at=expires_at
+            )
+            .execution_options(synchronize_session=False)
+        )
+        await self.db.commit()
+        if result.rowcount == 0:
+            return None
+        return user, _encode_refresh_token(user, jti, expires_at)
+
+    async def revoke(self, refresh_token: str, user_id: Optional[int] = None) -> bool:
+        session = await self._get_by_token(refresh_token)
+        if session is None or (user_id is not None and session.user_id != user_id):
+            return False
+        await self.db.delete(session)
+        await self.db.commit()
+        return True
+
+    async def revoke_by_id(self, user_id: int, session_id: int) -> bool:
+        result = await self.db.execute(
+            delete(RefreshSession).where(
+                RefreshSession.id == session_id,
+                RefreshSession.user_id == user_id
+            )
+        )
+        await self.db.commit()
+        return result.rowcount > 0
+
+    async def revoke_all(self, user_id: int) -> int:
+        result = await self.db.execute(
+            delete(RefreshSession).where(RefreshSession.user_id == user_id)
+        )
+        await self.db.commit()
+        return result.rowcount
+
+    async def list_for_user(self, user_id: int) -> List[RefreshSession]:
+        result = await self.db.execute(
+            select(RefreshSession)
+            .where(
+                RefreshSession.user_id == user_id,
+                RefreshSession.expires_at > datetime.now(timezone.utc)
+            )
+            .order_by(RefreshSession.last_used_at.desc())
+        )
+        return result.scalars().all()
+
+    async def sweep_expired(self) -> int:
+        result = await self.db.execute(
+            delete(RefreshSession).where(RefreshSession.expires_at <= datetime.now(timezone.utc))
+        )
+        await self.db.commit()
+        return result.rowcount
+
+def get_session_service(db: AsyncSession = Depends(get_db)) -> SessionService:
+    return SessionService(db)
+
+async def sweep_expired_sessions(session_factory=AsyncSessionLocal) -> int:
+    async with session_factory() as db:
+        return await SessionService(db).sweep_expired()
+
+async def run_session_sweeper(interval: float = settings.SESSION_SWEEP_INTERVAL) -> None:
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            removed = await sweep_expired_sessions()
+            if removed:
+                print(f"Expired refresh sessions removed: {removed}")
+        except Exception as e:
+            print(f"Session sweep error: {e}")
+
+async def main():
+    removed = await sweep_expired_sessions()
+    print(f"Expired refresh sessions removed: {removed}")
+
+if __name__ == "__main__":
+    asyncio.run(main())
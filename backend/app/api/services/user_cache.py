@@ -0,0 +1,85 @@
+import asyncio
+from itertools import chain
+from typing import Any, Dict, Optional, Set
+from sqlalchemy import event, inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, make_transient_to_detached
+from app.api.core.cache import TTLCache
+from app.api.core.config import settings
+from app.api.models.user import User
+from app.api.services.broker import broker
+
+USER_CACHE_CHANNEL = "user-cache"
+
+user_cache = TTLCache(maxsize=settings.USER_CACHE_SIZE, ttl=settings.USER_CACHE_TTL)
+
+_broadcasts: Set[asyncio.Task] = set()
+
+def _snapshot(user: User) -> Dict[str, Any]:
+    return {attr.key: getattr(user, attr.key) for attr in inspect(User).column_attrs}
+
+async def load_user(db: AsyncSession, user_id: int) -> Optional[User]:
+    """Пользователь по id: из кэша без запроса к БД или одним db.get при промахе.
+
+    Из кэша собирается detached-объект и присоединяется к сессии через
+    merge(load=False), поэтому обработчики могут менять и коммитить его как обычно.
+    """
+    values = user_cache.get(user_id)
+    if values is None:
+        user = await db.get(User, user_id)
+        if user is not None:
+            user_cache.set(user_id, _snapshot(user))
+        return user
+
+    user = User(**values)
+    make_transient_to_detached(user)
+    return await db.merge(user, load=False)
+
+async def invalidate_user(user_id: int) -> None:
+    """Сбросить запись в этом процессе и дождаться рассылки остальным воркерам."""
+    user_cache.delete(user_id)
+    await _publish(user_id)
+
+async def _publish(user_id: int) -> None:
+    # Вызывается после коммита: недоступный broker не должен превращать запись в 500,
+    # остальные воркеры в худшем случае дождутся USER_CACHE_TTL.
+    try:
+        await broker.publish(USER_CACHE_CHANNEL, {"user_id": user_id})
+    except Exception as e:
+        print(f"User cache broadcast error: {e}")
+
+def _broadcast(user_ids: Set[int]) -> None:
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    for user_id in user_ids:
+        task = loop.create_task(_publish(user_id))
+        _broadcasts.add(task)
+        task.add_done_callback(_broadcasts.discard)
+
+@event.listens_for(Session, "after_flush")
+def _collect_changed_users(session: Session, flush_context) -> None:
+    changed = session.info.setdefault("changed_user_ids", set())
+    for obj in chain(session.dirty, session.deleted):
+        if isinstance(obj, User) and obj.id is not None:
+            changed.add(obj.id)
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_changed_users(session: Session) -> None:
+    changed = session.info.pop("changed_user_ids", None)
+    if not changed:
+        return
+    for user_id in changed:
+        user_cache.delete(user_id)
+    _broadcast(changed)
+
+@event.listens_for(Session, "after_rollback")
+def _forget_changed_users(session: Session) -> None:
+    session.info.pop("changed_user_ids", None)
+
+async def listen_for_invalidations() -> None:
+    async with broker.subscribe(USER_CACHE_CHANNEL) as queue:
+        while True:
+            message = await queue.get()
+            user_cache.delete(message.get("user_id"))
@@ -1,13 +1,55 @@
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.api.core.db import engine, Base, get_db
-from app.api.models import user, event, group, chat, attendance
+from app.api.services.broker import broker
+from app.api.services.maps import yandex_maps_service
+from app.api.services.geocoding import geocoding_worker
+from app.api.services.images import shutdown_image_executor
+from app.api.core.passwords import password_hasher
+from app.api.core.rate_limit import rate_limit_backend
+from app.api.services.user_cache import listen_for_invalidations
+from app.api.services.sessions import run_session_sweeper
+from app.api.services.categories import category_registry, listen_for_invalidations as listen_for_category_invalidations
+from app.api.services.response_cache import response_cache, listen_for_invalidations as listen_for_response_invalidations
+from app.api.core.config import settings
+from app.api.models import user, event, group, chat, attendance, geocode, session
 from app.api.endpoints import auth, events, groups, chat as chat_endpoints, attendance as attendance_endpoints, users, admin, category, maps, seo
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    await broker.start()
+    await category_registry.load()
+    user_cache_listener = asyncio.create_task(listen_for_invalidations())
+    session_sweeper = asyncio.create_task(run_session_sweeper())
+    response_cache_listener = asyncio.create_task(listen_for_response_invalidations())
+    category_listener = asyncio.create_task(listen_for_category_invalidations())
+    await yandex_maps_service.start()
+    if settings.GEOCODE_WORKER_ENABLED:
+        await geocoding_worker.start()
+    yield
+    await geocoding_worker.stop()
+    await yandex_maps_service.stop()
+    shutdown_image_executor()
+    password_hasher.shutdown()
+    user_cache_listener.cancel()
+    session_sweeper.cancel()
+    response_cache_listener.cancel()
+    category_listener.cancel()
+    if response_cache.backend is not None:
+        await response_cache.backend.close()
+    await rate_limit_backend.close()
+    await broker.stop()
+    await engine.dispose()
+
 app = FastAPI(
     title="EventTogether API",
     description="API для управления событиями и группами",
-    version="0.1.0"
+    version="0.1.0",
+    lifespan=lifespan
 )
 
 app.add_middleware(
@@ -18,8 +60,6 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-Base.metadata.create_all(bind=engine)
-
 app.include_router(auth.router, prefix="/auth", tags=["Auth"])
 app.include_router(events.router, prefix="/events", tags=["Events"])
 app.include_router(groups.router, prefix="/groups", tags=["Groups"])
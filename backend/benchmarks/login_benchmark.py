@@ -0,0 +1,122 @@
+"""Нагрузочный сравнительный прогон /auth/login: bcrypt в event loop против пула.
+
+Запуск из каталога backend:
+
+    python -m benchmarks.login_benchmark --logins 40 --concurrency 20
+
+Параллельно с логинами скрипт пингует GET / и печатает задержку этих
+пингов: она показывает, насколько bcrypt блокирует остальные запросы.
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+_db_path = os.path.join(tempfile.mkdtemp(), "bench.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{_db_path}"
+os.environ.setdefault("GEOCODE_WORKER_ENABLED", "false")
+# Бенчмарк многократно логинится в один аккаунт — лимит на аккаунт его бы остановил.
+os.environ["RATE_LIMIT_ENABLED"] = "false"
+
+import httpx
+from app.main import app
+from app.api.core import passwords
+from app.api.core.config import settings
+from app.api.core.db import Base, engine
+from app.api.core.security import get_password_hash, verify_password
+
+EMAIL = "bench@example.com"
+PASSWORD = "benchmark-password"
+
+async def prepare():
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        await client.post("/auth/register", json={"email": EMAIL, "name": "Bench", "password": PASSWORD})
+
+def use_inline_bcrypt():
+    async def verify(plain, hashed):
+        return verify_password(plain, hashed)
+
+    async def hash_(password):
+        return get_password_hash(password)
+
+    passwords.password_hasher.verify = verify
+    passwords.password_hasher.hash = hash_
+
+def restore_pool():
+    for name in ("verify", "hash"):
+        passwords.password_hasher.__dict__.pop(name, None)
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * q))]
+
+async def run(logins: int, concurrency: int):
+    semaphore = asyncio.Semaphore(concurrency)
+    ping_latencies = []
+    done = asyncio.Event()
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        async def login():
+            async with semaphore:
+                response = await client.post("/auth/login", data={"username": EMAIL, "password": PASSWORD})
+                assert response.status_code == 200, response.text
+
+        async def ping():
+            while not done.is_set():
+                started = time.perf_counter()
+                await client.get("/")
+                ping_latencies.append(time.perf_counter() - started)
+                await asyncio.sleep(0.01)
+
+        pinger = asyncio.create_task(ping())
+        started = time.perf_counter()
+        await asyncio.gather(*[login() for _ in range(logins)])
+        elapsed = time.perf_counter() - started
+        done.set()
+        await pinger
+
+    return {
+        "logins_per_s": logins / elapsed,
+        "ping_p50_ms": statistics.median(ping_latencies) * 1000,
+        "ping_p99_ms": percentile(ping_latencies, 0.99) * 1000,
+        "ping_max_ms": max(ping_latencies) * 1000,
+        "pings": len(ping_latencies),
+    }
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--logins", type=int, default=40)
+    parser.add_argument("--concurrency", type=int, default=20)
+    args = parser.parse_args()
+    settings.RATE_LIMIT_ENABLED = False
+
+    try:
+        await prepare()
+
+        use_inline_bcrypt()
+        inline = await run(args.logins, args.concurrency)
+        restore_pool()
+        pooled = await run(args.logins, args.concurrency)
+    finally:
+        restore_pool()
+        passwords.password_hasher.shutdown()
+        await engine.dispose()
+
+    print(f"{'':>14} {'logins/s':>10} {'ping p50':>10} {'ping p99':>10} {'ping max':>10} {'pings':>7}")
+    for name, result in (("inline bcrypt", inline), ("bcrypt pool", pooled)):
+        print(
+            f"{name:>14} {result['logins_per_s']:>10.1f} {result['ping_p50_ms']:>8.1f}ms "
+            f"{result['ping_p99_ms']:>8.1f}ms {result['ping_max_ms']:>8.1f}ms {result['pings']:>7}"
+        )
+    print(f"pool stats: {passwords.password_hasher.stats()}")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,21 +1,31 @@
+import asyncio
 import sys
 import os
 import bcrypt
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("GEOCODE_WORKER_ENABLED", "false")
 
 import pytest
-from typing import Generator
+from contextlib import contextmanager
+from typing import Generator, List
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import NullPool, StaticPool
 
 from app.main import app
 from app.api.core.db import Base, get_db
-from app.api.core.security import create_access_token
+from app.api.core.config import settings
+from app.api.core.s3 import get_s3_client, reset_s3_client
+from app.api.core.security import access_token_claims, create_access_token
 from app.api.models.user import User
+from app.api.services.user_cache import user_cache
+from app.api.core.rate_limit import rate_limit_backend
+from app.api.services.response_cache import response_cache
+from app.api.services.categories import category_registry
 
 SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
 
@@ -27,21 +37,103 @@ engine = create_engine(
 
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
-def override_get_db():
-    try:
-        db = TestingSessionLocal()
+async_engine = create_async_engine(
+    "sqlite+aiosqlite:///./test.db",
+    poolclass=NullPool
+)
+
+TestingAsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False
+)
+
+async def override_get_db():
+    async with TestingAsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
 
 app.dependency_overrides[get_db] = override_get_db
 
 @pytest.fixture(scope="function", autouse=True)
 def setup_database():
     Base.metadata.create_all(bind=engine)
+    user_cache.clear()
+    asyncio.run(rate_limit_backend.reset())
+    response_cache.clear()
+    category_registry.clear()
     yield
     Base.metadata.drop_all(bind=engine)
 
+class QueryCounter:
+    """Считает SQL-запросы приложения к тестовой БД."""
+
+    def __init__(self):
+        self.statements: List[str] = []
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    @contextmanager
+    def budget(self, limit: int):
+        start = self.count
+        yield
+        used = self.statements[start:]
+        assert len(used) <= limit, (
+            f"Query budget exceeded: {len(used)} > {limit}\n" + "\n---\n".join(used)
+        )
+
+@pytest.fixture(scope="function")
+def query_counter():
+    counter = QueryCounter()
+    event.listen(async_engine.sync_engine, "before_cursor_execute", counter)
+    yield counter
+    event.remove(async_engine.sync_engine, "before_cursor_execute", counter)
+
+@pytest.fixture(scope="function")
+def db_engine():
+    return engine
+
+@pytest.fixture(scope="function")
+def db_session():
+    db = TestingSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+@pytest.fixture(scope="function")
+def async_session_factory():
+    return TestingAsyncSessionLocal
+
+@pytest.fixture(scope="session")
+def s3_server():
+    moto_server = pytest.importorskip("moto.server")
+    server = moto_server.ThreadedMotoServer(ip_address="127.0.0.1", port=0, verbose=False)
+    server.start()
+    host, port = server.get_host_and_port()
+    yield f"http://{host}:{port}"
+    server.stop()
+
+@pytest.fixture
+def bucket(s3_server, monkeypatch):
+    monkeypatch.setattr(settings, "S3_ENDPOINT", s3_server)
+    monkeypatch.setattr(settings, "S3_PUBLIC_URL", "http://cdn.example.com")
+    monkeypatch.setattr(settings, "S3_ACCESS_KEY", "testing")
+    monkeypatch.setattr(settings, "S3_SECRET_KEY", "testing")
+    reset_s3_client()
+    client = get_s3_client()
+    client.create_bucket(Bucket=settings.S3_BUCKET)
+    yield client
+    for item in client.list_objects_v2(Bucket=settings.S3_BUCKET).get("Contents", []):
+        client.delete_object(Bucket=settings.S3_BUCKET, Key=item["Key"])
+    client.delete_bucket(Bucket=settings.S3_BUCKET)
+    reset_s3_client()
+
 @pytest.fixture(scope="function")
 def client() -> Generator[TestClient, None, None]:
     with TestClient(app) as c:
@@ -71,7 +163,7 @@ def test_user(client: TestClient):
         db.commit()
         db.refresh(user)
         
-        token = create_access_token(data={"sub": user.email, "role": user.role})
+        token = create_access_token(data=access_token_claims(user))
         
         yield {"user": user, "token": token}
     except Exception:
@@ -1,5 +1,9 @@
+import base64
+import json
 import pytest
 from fastapi.testclient import TestClient
+from sqlalchemy import update
+from app.api.models.event import Event
 
 def test_create_event_success(client: TestClient, test_user):
     token = test_user["token"]
@@ -51,4 +55,154 @@ def test_get_events_pagination(client: TestClient, test_user):
     
     response = client.get("/events/?skip=10&limit=10")
     data = response.json()
-    assert len(data["items"]) == 5
\ No newline at end of file
+    assert len(data["items"]) == 5
+
+def test_get_events_cursor_pagination(client: TestClient, test_user):
+    token = test_user["token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    for i in range(15):
+        client.post("/events/", json={
+            "title": f"Event {i}",
+            "description": "Desc",
+            "date": "2026-12-01T10:00:00",
+            "location": "Moscow",
+            "price": i % 4,
+            "max_participants": 10
+        }, headers=headers)
+
+    seen = []
+    cursor = None
+    pages = 0
+    while True:
+        url = "/events/?pagination=cursor&limit=4&sort_by=price&order=desc"
+        if cursor:
+            url += f"&cursor={cursor}"
+        data = client.get(url).json()
+        assert data["total"] is None
+        seen.extend(item["id"] for item in data["items"])
+        pages += 1
+        cursor = data["next_cursor"]
+        if not cursor:
+            break
+
+    assert pages == 4
+    assert len(seen) == 15
+    assert len(set(seen)) == 15
+
+def test_get_events_cursor_mismatch(client: TestClient, test_user):
+    headers = {"Authorization": f"Bearer {test_user['token']}"}
+    for i in range(3):
+        client.post("/events/", json={
+            "title": f"Event {i}",
+            "description": "Desc",
+            "date": "2026-12-01T10:00:00",
+            "location": "Moscow",
+            "price": 0,
+            "max_participants": 10
+        }, headers=headers)
+
+    data = client.get("/events/?pagination=cursor&limit=2&include_total=true").json()
+    assert data["total"] == 3
+    assert data["next_cursor"]
+
+    response = client.get(f"/events/?cursor={data['next_cursor']}&sort_by=title")
+    assert response.status_code == 400
+
+    response = client.get("/events/?cursor=not-a-cursor")
+    assert response.status_code == 400
+
+@pytest.mark.parametrize("order", ["asc", "desc"])
+def test_get_events_cursor_pagination_with_null_prices(client: TestClient, test_user, db_session, order):
+    headers = {"Authorization": f"Bearer {test_user['token']}"}
+    prices = [2, None, 1, None, 2, None, 0]
+    ids = []
+    for i, price in enumerate(prices):
+        ids.append(client.post("/events/", json={
+            "title": f"Event {i}",
+            "description": "Desc",
+            "date": "2026-12-01T10:00:00",
+            "location": "Moscow",
+            "price": 0,
+            "max_participants": 10
+        }, headers=headers).json()["id"])
+    for event_id, price in zip(ids, prices):
+        db_session.execute(update(Event).where(Event.id == event_id).values(price=price))
+    db_session.commit()
+
+    seen = []
+    cursor = None
+    while True:
+        url = f"/events/?pagination=cursor&limit=2&sort_by=price&order={order}"
+        if cursor:
+            url += f"&cursor={cursor}"
+        response = client.get(url)
+        assert response.status_code == 200
+        seen.extend((item["price"], item["id"]) for item in response.json()["items"])
+        cursor = response.json()["next_cursor"]
+        if not cursor:
+            break
+
+    expected = sorted(zip(prices, ids), key=lambda item: (item[0] is None, item[0] or 0, item[1]))
+    if order == "desc":
+        expected.reverse()
+    assert seen == expected
+    assert client.get(f"/events/{ids[1]}").json()["price"] is None
+
+def crafted_cursor(sort_by: str, order: str, value) -> str:
+    raw = json.dumps({"s": sort_by, "o": order, "v": value, "id": 1}).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+@pytest.mark.parametrize("sort_by,value", [
+    ("date", "abc"),
+    ("date", [1, 2]),
+    ("date", 10),
+    ("created_at", {"dt": "not-a-date"}),
+    ("price", "abc"),
+    ("price", [1, 2]),
+    ("price", True),
+    ("title", None),
+    ("title", 5),
+    ("title", {"dt": "2026-12-01T10:00:00"}),
+])
+def test_get_events_cursor_value_type_checked(client: TestClient, sort_by, value):
+    cursor = crafted_cursor(sort_by, "asc", value)
+    response = client.get(f"/events/?pagination=cursor&sort_by={sort_by}&order=asc&cursor={cursor}")
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid cursor"
+
+@pytest.mark.parametrize("sort_by,value", [
+    ("date", {"dt": "2026-12-01T10:00:00"}),
+    ("price", 10),
+    ("price", 9.5),
+    ("price", None),
+    ("title", "Event"),
+])
+def test_get_events_cursor_valid_value_types(client: TestClient, sort_by, value):
+    cursor = crafted_cursor(sort_by, "asc", value)
+    response = client.get(f"/events/?pagination=cursor&sort_by={sort_by}&order=asc&cursor={cursor}")
+    assert response.status_code == 200
+
+def test_search_events_by_description_and_relevance(client: TestClient, test_user):
+    headers = {"Authorization": f"Bearer {test_user['token']}"}
+    events = [
+        ("Rock festival", "Best bands of the year"),
+        ("Jazz night", "Live music and some rock"),
+        ("Exhibition", "Modern art"),
+    ]
+    for title, description in events:
+        client.post("/events/", json={
+            "title": title,
+            "description": description,
+            "date": "2026-12-01T10:00:00",
+            "location": "Moscow",
+            "price": 0,
+            "max_participants": 10
+        }, headers=headers)
+
+    data = client.get("/events/?search=rock&sort_by=relevance").json()
+    assert data["total"] == 2
+    assert [item["title"] for item in data["items"]] == ["Rock festival", "Jazz night"]
+
+    response = client.get("/events/?search=rock&sort_by=relevance&pagination=cursor")
+    assert response.status_code == 400
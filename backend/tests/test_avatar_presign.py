@@ -0,0 +1,63 @@
+import httpx
+from io import BytesIO
+from PIL import Image
+from fastapi.testclient import TestClient
+from app.api.core.config import settings
+
+def make_png() -> bytes:
+    buffer = BytesIO()
+    Image.new("RGB", (400, 400), (30, 30, 200)).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+def list_keys(bucket):
+    return sorted(item["Key"] for item in bucket.list_objects_v2(Bucket=settings.S3_BUCKET).get("Contents", []))
+
+def request_upload(client: TestClient, headers: dict, content_type: str = "image/png") -> dict:
+    response = client.post("/users/me/avatar/upload-url", json={"content_type": content_type}, headers=headers)
+    assert response.status_code == 200
+    return response.json()
+
+def upload_direct(s3_server: str, upload: dict, data: bytes) -> httpx.Response:
+    url = upload["url"].replace(settings.S3_PUBLIC_URL, s3_server)
+    return httpx.post(url, data=upload["fields"], files={"file": ("avatar", data)})
+
+def test_presigned_upload_and_confirm(client: TestClient, test_user, bucket, s3_server):
+    headers = {"Authorization": f"Bearer {test_user['token']}"}
+    upload = request_upload(client, headers)
+
+    assert upload["key"].startswith(f"avatars/{test_user['user'].id}/")
+    assert upload["fields"]["Content-Type"] == "image/png"
+    assert upload["url"] == f"{settings.S3_PUBLIC_URL}/{settings.S3_BUCKET}"
+    assert upload_direct(s3_server, upload, make_png()).status_code in (200, 204)
+
+    response = client.post("/users/me/avatar/confirm", json={"key": upload["key"]}, headers=headers)
+    assert response.status_code == 200
+    assert response.json()["avatar_url"].endswith(upload["key"])
+
+    me = client.get("/users/me", headers=headers).json()
+    assert me["avatar_url"] == response.json()["avatar_url"]
+    assert sorted(me["avatar_variants"], key=int) == ["64", "128", "256"]
+
+def test_upload_url_rejects_unsupported_type(client: TestClient, test_user, bucket):
+    headers = {"Authorization": f"Bearer {test_user['token']}"}
+    response = client.post("/users/me/avatar/upload-url", json={"content_type": "image/gif"}, headers=headers)
+    assert response.status_code == 400
+
+def test_confirm_rejects_foreign_or_missing_key(client: TestClient, test_user, bucket):
+    headers = {"Authorization": f"Bearer {test_user['token']}"}
+    upload = request_upload(client, headers)
+    foreign_key = upload["key"].replace(f"avatars/{test_user['user'].id}/", "avatars/999/")
+
+    assert client.post("/users/me/avatar/confirm", json={"key": foreign_key}, headers=headers).status_code == 400
+    assert client.post("/users/me/avatar/confirm", json={"key": upload["key"]}, headers=headers).status_code == 400
+    assert client.get("/users/me", headers=headers).json()["avatar_url"] is None
+
+def test_confirm_deletes_non_image(client: TestClient, test_user, bucket, s3_server):
+    headers = {"Authorization": f"Bearer {test_user['token']}"}
+    upload = request_upload(client, headers)
+    upload_direct(s3_server, upload, b"<html>not an image</html>")
+
+    response = client.post("/users/me/avatar/confirm", json={"key": upload["key"]}, headers=headers)
+
+    assert response.status_code == 400
+    assert list_keys(bucket) == []
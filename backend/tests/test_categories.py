@@ -0,0 +1,95 @@
+import asyncio
+from sqlalchemy import update
+from app.api.models.category import Category
+from app.api.models.user import User
+from app.api.services.categories import CATEGORIES_CHANNEL, category_registry, listen_for_invalidations
+from app.api.services.broker import BrokerBackend, broker
+
+def moderator_headers(test_user, db_session):
+    db_session.execute(update(User).where(User.id == test_user["user"].id).values(role="moderator"))
+    db_session.commit()
+    return {"Authorization": f"Bearer {test_user['token']}"}
+
+def test_categories_are_served_from_registry(client, test_user, db_session):
+    headers = moderator_headers(test_user, db_session)
+    assert client.post("/categories/", json={"name": "Музыка"}, headers=headers).status_code == 200
+    version = category_registry.version
+
+    db_session.add(Category(name="Added behind the registry"))
+    db_session.commit()
+    assert [c["name"] for c in client.get("/categories/").json()] == ["Музыка"]
+
+    client.post("/categories/", json={"name": "Авто"}, headers=headers)
+    assert category_registry.version > version
+    assert [c["name"] for c in client.get("/categories/").json()] == [
+        "Added behind the registry", "Авто", "Музыка"
+    ]
+
+def test_rename_refreshes_event_category_name(client, test_user, db_session):
+    headers = moderator_headers(test_user, db_session)
+    category_id = client.post("/categories/", json={"name": "Театр"}, headers=headers).json()["id"]
+
+    event = client.post("/events/", json={
+        "title": "Спектакль", "description": "-", "date": "2026-12-01T19:00:00",
+        "location": "Москва", "price": 0, "max_participants": 10, "category_id": category_id
+    }, headers=headers).json()
+    assert event["category_name"] == "Театр"
+    assert client.get(f"/events/{event['id']}").json()["category_name"] == "Театр"
+
+    client.put(f"/categories/{category_id}", json={"name": "Опера"}, headers=headers)
+    assert client.get(f"/events/{event['id']}").json()["category_name"] == "Опера"
+
+class BrokenBrokerBackend(BrokerBackend):
+    async def publish(self, channel, message):
+        raise ConnectionError("redis is down")
+
+def test_broker_outage_does_not_fail_category_writes(client, test_user, db_session, monkeypatch):
+    headers = moderator_headers(test_user, db_session)
+    monkeypatch.setattr(broker, "backend", BrokenBrokerBackend())
+
+    response = client.post("/categories/", json={"name": "Кино"}, headers=headers)
+    assert response.status_code == 200
+    assert client.put(f"/categories/{response.json()['id']}", json={"name": "Театр"}, headers=headers).status_code == 200
+    assert [c["name"] for c in client.get("/categories/").json()] == ["Театр"]
+
+def test_unknown_category_falls_back_to_database(client, test_user, db_session):
+    headers = moderator_headers(test_user, db_session)
+    client.get("/categories/")
+
+    category = Category(name="Создана другим воркером")
+    db_session.add(category)
+    db_session.commit()
+
+    response = client.post("/events/", json={
+        "title": "Event", "description": "-", "date": "2026-12-01T19:00:00",
+        "location": "Москва", "price": 0, "max_participants": 10, "category_id": category.id
+    }, headers=headers)
+    assert response.status_code == 200
+    assert response.json()["category_name"] == "Создана другим воркером"
+
+    response = client.post("/events/", json={
+        "title": "Event", "description": "-", "date": "2026-12-01T19:00:00",
+        "location": "Москва", "price": 0, "max_participants": 10, "category_id": 999
+    }, headers=headers)
+    assert response.status_code == 400
+
+def test_broadcast_from_other_worker_marks_registry_stale():
+    async def run():
+        await broker.start()
+        listener = asyncio.create_task(listen_for_invalidations())
+        await asyncio.sleep(0)
+
+        version = category_registry.version
+        await broker.publish(CATEGORIES_CHANNEL, {"origin": category_registry.origin, "version": 1})
+        await asyncio.sleep(0.01)
+        own = category_registry.version
+
+        await broker.publish(CATEGORIES_CHANNEL, {"origin": "other-worker", "version": 1})
+        await asyncio.sleep(0.01)
+        listener.cancel()
+        await broker.stop()
+        return version, own, category_registry.version
+
+    version, own, after = asyncio.run(run())
+    assert own == version
+    assert after == version + 1
@@ -0,0 +1,167 @@
+import asyncio
+import json
+import pytest
+from fastapi import status
+from fastapi.websockets import WebSocketDisconnect
+from fastapi.testclient import TestClient
+from sqlalchemy import update
+from app.api.models.user import User
+from app.api.services.broker import RedisBrokerBackend
+
+def register_member(client: TestClient) -> str:
+    client.post("/auth/register", json={"email": "member@example.com", "name": "Member", "password": "password123"})
+    return client.post("/auth/login", data={"username": "member@example.com", "password": "password123"}).json()["access_token"]
+
+def create_group(client: TestClient, headers: dict) -> int:
+    event = client.post("/events/", json={
+        "title": "Meetup",
+        "description": "Desc",
+        "date": "2026-12-01T10:00:00",
+        "location": "Moscow",
+        "price": 0,
+        "max_participants": 10
+    }, headers=headers).json()
+    group = client.post("/groups/", json={"name": "Team", "max_members": 5, "event_id": event["id"]}, headers=headers)
+    return group.json()["id"]
+
+def test_chat_history_pages(client: TestClient, test_user):
+    headers = {"Authorization": f"Bearer {test_user['token']}"}
+    group_id = create_group(client, headers)
+
+    ids = []
+    for i in range(5):
+        response = client.post(f"/chat/groups/{group_id}/messages", json={"text": f"msg {i}"}, headers=headers)
+        assert response.status_code == 200
+        assert response.json()["username"] == "Test User"
+        ids.append(response.json()["id"])
+
+    latest = client.get(f"/chat/groups/{group_id}/messages?limit=2", headers=headers).json()
+    assert [m["id"] for m in latest] == ids[3:]
+
+    older = client.get(f"/chat/groups/{group_id}/messages?limit=2&before_id={ids[3]}", headers=headers).json()
+    assert [m["id"] for m in older] == ids[1:3]
+
+    newer = client.get(f"/chat/groups/{group_id}/messages?after_id={ids[1]}", headers=headers).json()
+    assert [m["id"] for m in newer] == ids[2:]
+
+    assert client.get(f"/chat/groups/{group_id}/messages?after_id={ids[-1]}", headers=headers).json() == []
+
+def test_chat_websocket_receives_new_messages(client: TestClient, test_user):
+    headers = {"Authorization": f"Bearer {test_user['token']}"}
+    group_id = create_group(client, headers)
+
+    with client.websocket_connect(f"/chat/groups/{group_id}/ws?token={test_user['token']}") as websocket:
+        response = client.post(f"/chat/groups/{group_id}/messages", json={"text": "hello"}, headers=headers)
+        message = websocket.receive_json()
+
+    assert message["id"] == response.json()["id"]
+    assert message["text"] == "hello"
+    assert message["username"] == "Test User"
+
+def test_chat_websocket_rejects_invalid_token(client: TestClient, test_user):
+    headers = {"Authorization": f"Bearer {test_user['token']}"}
+    group_id = create_group(client, headers)
+
+    with pytest.raises(WebSocketDisconnect) as exc_info:
+        with client.websocket_connect(f"/chat/groups/{group_id}/ws?token=invalid"):
+            pass
+    assert exc_info.value.code == status.WS_1008_POLICY_VIOLATION
+
+def test_chat_access_follows_membership(client: TestClient, test_user):
+    headers = {"Authorization": f"Bearer {test_user['token']}"}
+    group_id = create_group(client, headers)
+
+    client.post("/auth/register", json={"email": "member@example.com", "name": "Member", "password": "password123"})
+    token = client.post("/auth/login", data={"username": "member@example.com", "password": "password123"}).json()["access_token"]
+    member_headers = {"Authorization": f"Bearer {token}"}
+
+    url = f"/chat/groups/{group_id}/messages"
+    assert client.get(url, headers=member_headers).status_code == 403
+    assert client.get(f"/groups/{group_id}/check-membership", headers=member_headers).json() == {"is_member": False}
+
+    client.post(f"/groups/{group_id}/join", headers=member_headers)
+    assert client.post(url, json={"text": "hi"}, headers=member_headers).status_code == 200
+    assert client.post(f"/groups/{group_id}/join", headers=member_headers).status_code == 400
+
+    groups = client.get("/groups/", headers=member_headers).json()
+    assert groups[0]["current_user_is_member"] is True
+
+    client.post(f"/groups/{group_id}/leave", headers=member_headers)
+    assert client.get(url, headers=member_headers).status_code == 403
+
+def test_chat_websocket_closes_after_member_leaves(client: TestClient, test_user):
+    headers = {"Authorization": f"Bearer {test_user['token']}"}
+    group_id = create_group(client, headers)
+    token = register_member(client)
+    client.post(f"/groups/{group_id}/join", headers={"Authorization": f"Bearer {token}"})
+
+    with client.websocket_connect(f"/chat/groups/{group_id}/ws?token={token}") as websocket:
+        client.post(f"/chat/groups/{group_id}/messages", json={"text": "before"}, headers=headers)
+        assert websocket.receive_json()["text"] == "before"
+
+        client.post(f"/groups/{group_id}/leave", headers={"Authorization": f"Bearer {token}"})
+        client.post(f"/chat/groups/{group_id}/messages", json={"text": "after"}, headers=headers)
+        with pytest.raises(WebSocketDisconnect) as exc_info:
+            websocket.receive_json()
+    assert exc_info.value.code == status.WS_1008_POLICY_VIOLATION
+
+def test_chat_websocket_closes_after_deactivation(client: TestClient, test_user, db_session):
+    headers = {"Authorization": f"Bearer {test_user['token']}"}
+    db_session.execute(update(User).where(User.id == test_user["user"].id).values(role="admin"))
+    db_session.commit()
+    group_id = create_group(client, headers)
+    token = register_member(client)
+    member_headers = {"Authorization": f"Bearer {token}"}
+    client.post(f"/groups/{group_id}/join", headers=member_headers)
+    member_id = client.get("/users/me", headers=member_headers).json()["id"]
+
+    with client.websocket_connect(f"/chat/groups/{group_id}/ws?token={token}") as websocket:
+        client.post(f"/admin/users/{member_id}/toggle-active", headers=headers)
+        client.post(f"/chat/groups/{group_id}/messages", json={"text": "hidden"}, headers=headers)
+        with pytest.raises(WebSocketDisconnect) as exc_info:
+            websocket.receive_json()
+    assert exc_info.value.code == status.WS_1008_POLICY_VIOLATION
+
+class FakePubSub:
+    def __init__(self, items):
+        self.items = items
+
+    async def psubscribe(self, pattern):
+        pass
+
+    async def listen(self):
+        for item in self.items:
+            if isinstance(item, Exception):
+                raise item
+            yield item
+
+    async def aclose(self):
+        pass
+
+class FakeRedis:
+    def __init__(self, *pubsubs):
+        self.pubsubs = list(pubsubs)
+
+    def pubsub(self):
+        return self.pubsubs.pop(0)
+
+def test_redis_broker_resubscribes_after_connection_error():
+    message = {"type": "pmessage", "channel": "broker:chat:1", "data": json.dumps({"text": "hi"})}
+    backend = RedisBrokerBackend("redis://unused", retry_delay=0)
+    backend._redis = FakeRedis(FakePubSub([ConnectionError("connection reset")]), FakePubSub([message]))
+    received = []
+
+    async def run():
+        delivered = asyncio.Event()
+
+        def dispatch(channel, data):
+            received.append((channel, data))
+            delivered.set()
+
+        reader = asyncio.create_task(backend._read(dispatch))
+        await asyncio.wait_for(delivered.wait(), timeout=5)
+        reader.cancel()
+
+    asyncio.run(run())
+    assert received == [("chat:1", {"text": "hi"})]
+    assert RedisBrokerBackend("redis://unused", retry_delay=1, retry_max_delay=30).error_backoff(10) == 30
@@ -0,0 +1,96 @@
+import pytest
+from datetime import datetime, timezone
+from fastapi.testclient import TestClient
+from sqlalchemy import update
+from app.api.models.user import User
+from app.api.models.event import Event, GEOCODE_DONE
+from app.api.services.clusters import lat_to_tile_y, lon_to_tile_x, tile_bounds, tile_cache, tiles_for_bbox, count_tiles
+
+MOSCOW_BBOX = "37.3,55.5,37.9,56.0"
+
+@pytest.fixture(autouse=True)
+def clear_tile_cache():
+    tile_cache.clear()
+    yield
+    tile_cache.clear()
+
+def add_event(db_session, organizer_id: int, latitude: float, longitude: float) -> Event:
+    event = Event(
+        title="Meetup",
+        description="Desc",
+        date=datetime(2026, 12, 1, 10, tzinfo=timezone.utc),
+        location="Moscow",
+        max_participants=10,
+        organizer_id=organizer_id,
+        latitude=latitude,
+        longitude=longitude,
+        geocode_status=GEOCODE_DONE
+    )
+    db_session.add(event)
+    db_session.commit()
+    return event
+
+def test_tile_math_round_trip():
+    x, y = lon_to_tile_x(37.6176, 10), lat_to_tile_y(55.7558, 10)
+    assert (x, y) == (619, 320)
+    west, south, east, north = tile_bounds(x, y, 10)
+    assert west <= 37.6176 < east
+    assert south <= 55.7558 < north
+
+def test_tiles_for_bbox():
+    assert list(tiles_for_bbox(-180, -85, 180, 85, 0)) == [(0, 0)]
+    assert len(list(tiles_for_bbox(-180, -85, 180, 85, 2))) == 16
+    assert count_tiles(-180, -85, 180, 85, 2) == 16
+    assert count_tiles(-180, -85, 180, 85, 20) > 10 ** 11
+
+def test_huge_viewport_is_rejected_before_building_tiles(client: TestClient):
+    response = client.get("/maps/events/clusters", params={"bbox": "-180,-85,180,85", "zoom": 20})
+    assert response.status_code == 400
+
+def test_clusters_group_nearby_events(client: TestClient, test_user, db_session):
+    organizer_id = test_user["user"].id
+    for i in range(5):
+        add_event(db_session, organizer_id, 55.7558 + i * 0.0001, 37.6176)
+    single = add_event(db_session, organizer_id, 55.95, 37.35)
+    add_event(db_session, organizer_id, 59.9386, 30.3141)
+
+    response = client.get("/maps/events/clusters", params={"bbox": MOSCOW_BBOX, "zoom": 9})
+
+    assert response.status_code == 200
+    clusters = sorted(response.json()["clusters"], key=lambda c: c["count"])
+    assert [c["count"] for c in clusters] == [1, 5]
+    assert clusters[0]["event_id"] == single.id
+    assert clusters[1]["event_id"] is None
+    assert clusters[1]["latitude"] == pytest.approx(55.7560, abs=1e-3)
+
+def test_clusters_are_cached_per_tile(client: TestClient, test_user, db_session):
+    event = add_event(db_session, test_user["user"].id, 55.7558, 37.6176)
+    params = {"bbox": MOSCOW_BBOX, "zoom": 9}
+    assert len(client.get("/maps/events/clusters", params=params).json()["clusters"]) == 1
+
+    db_session.execute(update(Event).values(latitude=None, longitude=None))
+    db_session.commit()
+    assert len(client.get("/maps/events/clusters", params=params).json()["clusters"]) == 1
+
+    headers = {"Authorization": f"Bearer {test_user['token']}"}
+    db_session.execute(update(Event).values(latitude=55.7558, longitude=37.6176))
+    db_session.commit()
+    client.delete(f"/events/{event.id}", headers=headers)
+    assert client.get("/maps/events/clusters", params=params).json()["clusters"] == []
+
+def test_admin_delete_drops_cached_tiles(client: TestClient, test_user, db_session):
+    event = add_event(db_session, test_user["user"].id, 55.7558, 37.6176)
+    db_session.execute(update(User).where(User.id == test_user["user"].id).values(role="admin"))
+    db_session.commit()
+    params = {"bbox": MOSCOW_BBOX, "zoom": 9}
+    assert len(client.get("/maps/events/clusters", params=params).json()["clusters"]) == 1
+
+    headers = {"Authorization": f"Bearer {test_user['token']}"}
+    assert client.delete(f"/admin/events/{event.id}", headers=headers).status_code == 200
+    assert client.get("/maps/events/clusters", params=params).json()["clusters"] == []
+
+def test_clusters_validation(client: TestClient):
+    assert client.get("/maps/events/clusters", params={"bbox": "1,2,3", "zoom": 5}).status_code == 400
+    assert client.get("/maps/events/clusters", params={"bbox": "10,0,5,1", "zoom": 5}).status_code == 400
+    assert client.get("/maps/events/clusters", params={"bbox": "-180,-85,180,85", "zoom": 10}).status_code == 400
+    assert client.get("/maps/events/clusters", params={"bbox": MOSCOW_BBOX, "zoom": 25}).status_code == 422
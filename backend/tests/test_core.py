@@ -0,0 +1,31 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.api.core.cache import TTLCache
+from app.api.core.db import get_async_database_url, get_db
+
+def test_async_database_url_uses_async_drivers():
+    assert get_async_database_url("postgresql://u:p@db:5432/app") == "postgresql+psycopg://u:p@db:5432/app"
+    assert get_async_database_url("postgresql+psycopg2://u:p@db/app") == "postgresql+psycopg://u:p@db/app"
+    assert get_async_database_url("sqlite:///./test.db") == "sqlite+aiosqlite:///./test.db"
+    assert get_async_database_url("postgresql+asyncpg://u:p@db/app") == "postgresql+asyncpg://u:p@db/app"
+
+async def test_get_db_yields_async_session():
+    gen = get_db()
+    db = await gen.__anext__()
+    assert isinstance(db, AsyncSession)
+    await gen.aclose()
+
+def test_ttl_cache_expires_and_evicts(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("app.api.core.cache.time.monotonic", lambda: now[0])
+
+    cache = TTLCache(maxsize=2, ttl=10)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+    now[0] += 11
+    assert cache.get("a") is None
+    assert cache.stats() == {"hits": 2, "misses": 2, "size": 1}
@@ -0,0 +1,154 @@
+import asyncio
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.api.endpoints.attendance import create_attendance_record
+from app.api.endpoints.groups import join_group, leave_group
+from app.api.models.event import Event
+from app.api.models.group import Group
+from app.api.models.user import User
+from app.api.schemas.attendance import AttendanceCreate
+from app.api.services.membership import MembershipService
+
+def register_and_login(client: TestClient, email: str) -> dict:
+    client.post("/auth/register", json={"email": email, "name": "Member", "password": "password123"})
+    response = client.post("/auth/login", data={"username": email, "password": "password123"})
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+def create_event(client: TestClient, headers: dict) -> int:
+    response = client.post("/events/", json={
+        "title": "Meetup",
+        "description": "Desc",
+        "date": "2026-12-01T10:00:00",
+        "location": "Moscow",
+        "price": 0,
+        "max_participants": 10
+    }, headers=headers)
+    return response.json()["id"]
+
+def test_attendance_updates_participants_count(client: TestClient, test_user):
+    headers = {"Authorization": f"Bearer {test_user['token']}"}
+    event_id = create_event(client, headers)
+    member_headers = register_and_login(client, "member@example.com")
+
+    client.post("/attendance/", json={"event_id": event_id}, headers=member_headers)
+    client.post("/attendance/", json={"event_id": event_id}, headers=headers)
+
+    assert client.get(f"/events/{event_id}").json()["current_participants"] == 2
+    assert client.get("/events/").json()["items"][0]["current_participants"] == 2
+
+def test_concurrent_attendance_is_counted_once(client: TestClient, test_user, async_session_factory, monkeypatch):
+    headers = {"Authorization": f"Bearer {test_user['token']}"}
+    event_id = create_event(client, headers)
+    barrier = asyncio.Barrier(2)
+    original = AsyncSession.flush
+
+    async def check_then_wait(self, *args, **kwargs):
+        await barrier.wait()
+        return await original(self, *args, **kwargs)
+
+    monkeypatch.setattr(AsyncSession, "flush", check_then_wait)
+
+    async def attend():
+        async with async_session_factory() as db:
+            user = await db.get(User, test_user["user"].id)
+            try:
+                await create_attendance_record(AttendanceCreate(event_id=event_id), db=db, current_user=user)
+                return 200
+            except HTTPException as e:
+                return e.status_code
+
+    async def run():
+        return await asyncio.gather(attend(), attend())
+
+    assert sorted(asyncio.run(run())) == [200, 400]
+    monkeypatch.undo()
+    assert client.get(f"/events/{event_id}").json()["current_participants"] == 1
+
+def test_join_and_leave_update_members_count(client: TestClient, test_user):
+    headers = {"Authorization": f"Bearer {test_user['token']}"}
+    event_id = create_event(client, headers)
+    group = client.post("/groups/", json={"name": "Team", "max_members": 2, "event_id": event_id}, headers=headers).json()
+    assert group["members_count"] == 1
+
+    member_headers = register_and_login(client, "member@example.com")
+    other_headers = register_and_login(client, "other@example.com")
+
+    assert client.post(f"/groups/{group['id']}/join", headers=member_headers).status_code == 200
+    assert client.get(f"/groups/{group['id']}").json()["members_count"] == 2
+
+    response = client.post(f"/groups/{group['id']}/join", headers=other_headers)
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Group is full"
+
+    assert client.post(f"/groups/{group['id']}/leave", headers=member_headers).status_code == 200
+    assert client.get(f"/groups/{group['id']}").json()["members_count"] == 1
+
+def run_after_membership_check(monkeypatch, async_session_factory, email: str, endpoint, group_id: int):
+    """Два одновременных запроса, оба прошедшие проверку членства до записи."""
+    barrier = asyncio.Barrier(2)
+    original = MembershipService.is_member
+
+    async def check_then_wait(self, *args, **kwargs):
+        result = await original(self, *args, **kwargs)
+        await barrier.wait()
+        return result
+
+    monkeypatch.setattr(MembershipService, "is_member", check_then_wait)
+
+    async def call():
+        async with async_session_factory() as db:
+            user = await db.scalar(select(User).where(User.email == email))
+            try:
+                await endpoint(group_id, db=db, current_user=user, membership=MembershipService(db))
+                return 200
+            except HTTPException as e:
+                return e.status_code, e.detail
+
+    async def run():
+        return await asyncio.gather(call(), call())
+
+    results = asyncio.run(run())
+    monkeypatch.undo()
+    return results
+
+def test_concurrent_join_by_same_user_returns_400(client: TestClient, test_user, async_session_factory, monkeypatch):
+    headers = {"Authorization": f"Bearer {test_user['token']}"}
+    event_id = create_event(client, headers)
+    group = client.post("/groups/", json={"name": "Team", "max_members": 5, "event_id": event_id}, headers=headers).json()
+    register_and_login(client, "member@example.com")
+
+    results = run_after_membership_check(monkeypatch, async_session_factory, "member@example.com", join_group, group["id"])
+    assert sorted(results, key=str) == [(400, "Already a member of this group"), 200]
+    assert client.get(f"/groups/{group['id']}").json()["members_count"] == 2
+
+def test_concurrent_leave_decrements_once(client: TestClient, test_user, async_session_factory, monkeypatch):
+    headers = {"Authorization": f"Bearer {test_user['token']}"}
+    event_id = create_event(client, headers)
+    group = client.post("/groups/", json={"name": "Team", "max_members": 5, "event_id": event_id}, headers=headers).json()
+    member_headers = register_and_login(client, "member@example.com")
+    assert client.post(f"/groups/{group['id']}/join", headers=member_headers).status_code == 200
+
+    results = run_after_membership_check(monkeypatch, async_session_factory, "member@example.com", leave_group, group["id"])
+    assert sorted(results, key=str) == [(400, "Not a member of this group"), 200]
+    assert client.get(f"/groups/{group['id']}").json()["members_count"] == 1
+
+def test_recalculate_counters_repairs_drift(client: TestClient, test_user, db_session):
+    db_session.execute(update(User).where(User.id == test_user["user"].id).values(role="admin"))
+    db_session.commit()
+    headers = {"Authorization": f"Bearer {test_user['token']}"}
+    event_id = create_event(client, headers)
+    group = client.post("/groups/", json={"name": "Team", "max_members": 5, "event_id": event_id}, headers=headers).json()
+    client.post("/attendance/", json={"event_id": event_id}, headers=headers)
+
+    db_session.execute(update(Event).values(participants_count=42))
+    db_session.execute(update(Group).values(members_count=0))
+    db_session.commit()
+
+    response = client.post("/admin/maintenance/recalculate-counters", headers=headers)
+    assert response.status_code == 200
+    assert response.json() == {"events_fixed": 1, "groups_fixed": 1}
+
+    assert client.get(f"/events/{event_id}").json()["current_participants"] == 1
+    assert client.get(f"/groups/{group['id']}").json()["members_count"] == 1
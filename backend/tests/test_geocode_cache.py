@@ -0,0 +1,79 @@
+import pytest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock
+from app.api.models.geocode import GeocodeCacheEntry
+from app.api.services.geocode_cache import GeocodeCache, MISSING, normalize_address, reverse_key
+from app.api.services.maps import YandexMapsService
+
+MOSCOW = {"latitude": 55.7558, "longitude": 37.6176, "address": "Москва"}
+
+def test_normalize_address():
+    assert normalize_address("  Москва,  ул. Тверская, 1 ") == "москва ул тверская 1"
+    assert normalize_address("Ёлкино") == normalize_address("елкино")
+
+def test_reverse_key_rounds_coordinates():
+    assert reverse_key(55.755812, 37.617634, 4) == reverse_key(55.755798, 37.617601, 4)
+
+@pytest.mark.asyncio
+async def test_forward_geocode_served_from_cache():
+    service = YandexMapsService(cache=GeocodeCache(session_factory=None))
+    service._request_geocode = AsyncMock(return_value=MOSCOW)
+
+    first = await service.geocode_address("Москва, Тверская 1")
+    second = await service.geocode_address("москва  тверская 1")
+
+    assert first["latitude"] == second["latitude"] == 55.7558
+    assert second["address"] == "москва  тверская 1"
+    assert service._request_geocode.await_count == 1
+    assert service.cache.stats()["memory_hits"] == 1
+
+@pytest.mark.asyncio
+async def test_failed_geocode_is_not_cached():
+    service = YandexMapsService(cache=GeocodeCache(session_factory=None))
+    service._request_geocode = AsyncMock(return_value=None)
+
+    assert await service.geocode_address("Нигде") is None
+    assert await service.geocode_address("Нигде") is None
+    assert service._request_geocode.await_count == 2
+
+@pytest.mark.asyncio
+async def test_reverse_geocode_served_from_cache():
+    service = YandexMapsService(cache=GeocodeCache(session_factory=None))
+    service._request_reverse_geocode = AsyncMock(return_value="Москва, Красная площадь")
+
+    await service.get_address_by_coords(55.75393, 37.62063)
+    address = await service.get_address_by_coords(55.753931, 37.620629)
+
+    assert address == "Москва, Красная площадь"
+    assert service._request_reverse_geocode.await_count == 1
+
+@pytest.mark.asyncio
+async def test_database_tier_shared_between_instances(async_session_factory):
+    await GeocodeCache(session_factory=async_session_factory).set_forward("Москва", MOSCOW)
+
+    cache = GeocodeCache(session_factory=async_session_factory)
+    result = await cache.get_forward("МОСКВА")
+
+    assert result["latitude"] == 55.7558
+    assert cache.stats()["db_hits"] == 1
+
+@pytest.mark.asyncio
+async def test_expired_database_entry_is_ignored(async_session_factory, db_session):
+    db_session.add(GeocodeCacheEntry(
+        kind="forward",
+        key="москва",
+        latitude=55.7558,
+        longitude=37.6176,
+        address="Москва",
+        expires_at=datetime.now(timezone.utc) - timedelta(days=1)
+    ))
+    db_session.commit()
+
+    cache = GeocodeCache(session_factory=async_session_factory)
+    assert await cache.get_forward("Москва") is MISSING
+    assert cache.stats()["misses"] == 1
+
+def test_cache_stats_requires_admin(client, test_user):
+    headers = {"Authorization": f"Bearer {test_user['token']}"}
+    response = client.get("/maps/cache/stats", headers=headers)
+    assert response.status_code == 403
@@ -0,0 +1,246 @@
+import asyncio
+import httpx
+import pytest
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import select, update
+from fastapi.testclient import TestClient
+from app.api.models.user import User
+from app.api.models.event import Event, GEOCODE_DONE, GEOCODE_FAILED, GEOCODE_PENDING, GEOCODE_PROCESSING
+from app.api.services.geocoding import GeocodingWorker, queue_missing_coordinates
+from app.api.services.maps import yandex_maps_service
+
+class FakeMapsService:
+    def __init__(self, results):
+        self.results = results
+        self.calls = []
+
+    async def geocode_many(self, addresses):
+        self.calls.extend(addresses)
+        return [self.results.get(address) for address in addresses]
+
+def add_event(db_session, organizer_id: int, location: str, **fields) -> Event:
+    event = Event(
+        title="Meetup",
+        description="Desc",
+        date=datetime(2026, 12, 1, 10, tzinfo=timezone.utc),
+        location=location,
+        max_participants=10,
+        organizer_id=organizer_id,
+        **fields
+    )
+    db_session.add(event)
+    db_session.commit()
+    return event
+
+def make_worker(async_session_factory, results, **kwargs) -> GeocodingWorker:
+    return GeocodingWorker(
+        maps_service=FakeMapsService(results),
+        session_factory=async_session_factory,
+        **kwargs
+    )
+
+def test_create_event_does_not_wait_for_geocoder(client: TestClient, test_user, monkeypatch):
+    async def fail(address):
+        raise AssertionError("geocoder called on the request path")
+
+    monkeypatch.setattr(yandex_maps_service, "geocode_address", fail)
+    headers = {"Authorization": f"Bearer {test_user['token']}"}
+
+    response = client.post("/events/", json={
+        "title": "Meetup",
+        "description": "Desc",
+        "date": "2026-12-01T10:00:00",
+        "location": "Moscow",
+        "price": 0,
+        "max_participants": 10
+    }, headers=headers)
+
+    assert response.status_code == 200
+    assert response.json()["geocode_status"] == GEOCODE_PENDING
+    assert response.json()["latitude"] is None
+
+@pytest.mark.asyncio
+async def test_worker_fills_coordinates(async_session_factory, db_session, test_user):
+    event = add_event(db_session, test_user["user"].id, "Moscow")
+    worker = make_worker(async_session_factory, {"Moscow": {"latitude": 55.75, "longitude": 37.61}})
+
+    assert await worker.run_once() == 1
+    assert await worker.run_once() == 0
+
+    db_session.refresh(event)
+    assert event.geocode_status == GEOCODE_DONE
+    assert (event.latitude, event.longitude) == (55.75, 37.61)
+    assert event.geocode_attempts == 1
+
+@pytest.mark.asyncio
+async def test_worker_backs_off_and_gives_up(async_session_factory, db_session, test_user):
+    event = add_event(db_session, test_user["user"].id, "Nowhere")
+    worker = make_worker(async_session_factory, {}, max_attempts=2, retry_delay=0)
+
+    assert await worker.run_once() == 1
+    db_session.refresh(event)
+    assert event.geocode_status == GEOCODE_PENDING
+    assert event.geocode_attempts == 1
+    assert event.geocode_next_attempt_at is not None
+
+    assert await worker.run_once() == 1
+    db_session.refresh(event)
+    assert event.geocode_status == GEOCODE_FAILED
+    assert await worker.run_once() == 0
+
+@pytest.mark.asyncio
+async def test_retry_is_postponed(async_session_factory, db_session, test_user):
+    add_event(db_session, test_user["user"].id, "Nowhere")
+    worker = make_worker(async_session_factory, {}, retry_delay=60)
+
+    assert await worker.run_once() == 1
+    assert await worker.run_once() == 0
+    assert worker.retry_after(1).total_seconds() == 60
+    assert worker.retry_after(3).total_seconds() == 240
+
+@pytest.mark.asyncio
+async def test_backfill_requeues_events_without_coordinates(async_session_factory, db_session, test_user):
+    organizer_id = test_user["user"].id
+    failed = add_event(db_session, organizer_id, "Moscow", geocode_status=GEOCODE_FAILED, geocode_attempts=5)
+    add_event(db_session, organizer_id, "Kazan", geocode_status=GEOCODE_DONE, latitude=55.79, longitude=49.12)
+
+    async with async_session_factory() as db:
+        assert await queue_missing_coordinates(db) == 1
+
+    worker = make_worker(async_session_factory, {"Moscow": {"latitude": 55.75, "longitude": 37.61}})
+    assert await worker.run_once() == 1
+    assert worker.maps_service.calls == ["Moscow"]
+
+    db_session.refresh(failed)
+    assert failed.geocode_status == GEOCODE_DONE
+
+class HookedMapsService(FakeMapsService):
+    def __init__(self, results, hook):
+        super().__init__(results)
+        self.hook = hook
+
+    async def geocode_many(self, addresses):
+        await self.hook()
+        return await super().geocode_many(addresses)
+
+@pytest.mark.asyncio
+async def test_rows_are_claimed_and_committed_before_geocoding(async_session_factory, db_session, test_user):
+    event = add_event(db_session, test_user["user"].id, "Moscow")
+    seen = []
+
+    async def hook():
+        async with async_session_factory() as db:
+            seen.append(await db.scalar(select(Event.geocode_status).where(Event.id == event.id)))
+
+    worker = GeocodingWorker(
+        maps_service=HookedMapsService({"Moscow": {"latitude": 55.75, "longitude": 37.61}}, hook),
+        session_factory=async_session_factory
+    )
+    assert await worker.run_once() == 1
+    assert seen == [GEOCODE_PROCESSING]
+
+    db_session.refresh(event)
+    assert event.geocode_status == GEOCODE_DONE
+
+@pytest.mark.asyncio
+async def test_result_is_dropped_if_location_changed_meanwhile(async_session_factory, db_session, test_user):
+    event = add_event(db_session, test_user["user"].id, "Moscow")
+
+    async def hook():
+        async with async_session_factory() as db:
+            await db.execute(update(Event).where(Event.id == event.id).values(
+                location="Kazan", geocode_status=GEOCODE_PENDING, geocode_attempts=0
+            ))
+            await db.commit()
+
+    worker = GeocodingWorker(
+        maps_service=HookedMapsService({"Moscow": {"latitude": 55.75, "longitude": 37.61}}, hook),
+        session_factory=async_session_factory
+    )
+    assert await worker.run_once() == 1
+
+    db_session.refresh(event)
+    assert event.geocode_status == GEOCODE_PENDING
+    assert event.latitude is None
+
+@pytest.mark.asyncio
+async def test_expired_claim_is_picked_up_again(async_session_factory, db_session, test_user):
+    stale = add_event(
+        db_session, test_user["user"].id, "Moscow",
+        geocode_status=GEOCODE_PROCESSING,
+        geocode_next_attempt_at=datetime.now(timezone.utc) - timedelta(minutes=1)
+    )
+    add_event(
+        db_session, test_user["user"].id, "Kazan",
+        geocode_status=GEOCODE_PROCESSING,
+        geocode_next_attempt_at=datetime.now(timezone.utc) + timedelta(minutes=5)
+    )
+    worker = make_worker(async_session_factory, {"Moscow": {"latitude": 55.75, "longitude": 37.61}})
+
+    assert await worker.run_once() == 1
+    assert worker.maps_service.calls == ["Moscow"]
+    db_session.refresh(stale)
+    assert stale.geocode_status == GEOCODE_DONE
+
+@pytest.mark.asyncio
+async def test_worker_survives_unexpected_errors(async_session_factory, db_session, test_user):
+    event = add_event(db_session, test_user["user"].id, "Moscow")
+
+    class FlakyMapsService(FakeMapsService):
+        async def geocode_many(self, addresses):
+            if not self.calls:
+                self.calls.append("boom")
+                raise httpx.ConnectError("geocoder is down")
+            return await super().geocode_many(addresses)
+
+    worker = GeocodingWorker(
+        maps_service=FlakyMapsService({"Moscow": {"latitude": 55.75, "longitude": 37.61}}),
+        session_factory=async_session_factory,
+        interval=0.01,
+        claim_timeout=0
+    )
+    await worker.start()
+    try:
+        for _ in range(200):
+            await asyncio.sleep(0.01)
+            async with async_session_factory() as db:
+                if await db.scalar(select(Event.geocode_status).where(Event.id == event.id)) == GEOCODE_DONE:
+                    break
+        assert worker._task is not None and not worker._task.done()
+    finally:
+        await worker.stop()
+
+    db_session.refresh(event)
+    assert event.geocode_status == GEOCODE_DONE
+    assert worker.error_backoff(3) == pytest.approx(0.04)
+
+def test_location_change_requeues_geocoding(client: TestClient, test_user, db_session):
+    event = add_event(
+        db_session, test_user["user"].id, "Moscow",
+        geocode_status=GEOCODE_DONE, latitude=55.75, longitude=37.61
+    )
+    headers = {"Authorization": f"Bearer {test_user['token']}"}
+
+    response = client.put(f"/events/{event.id}", json={"location": "Kazan"}, headers=headers)
+
+    assert response.status_code == 200
+    assert response.json()["geocode_status"] == GEOCODE_PENDING
+    assert response.json()["latitude"] is None
+
+
+def test_admin_location_change_requeues_geocoding(client: TestClient, test_user, db_session):
+    db_session.execute(update(User).where(User.id == test_user["user"].id).values(role="moderator"))
+    db_session.commit()
+    event = add_event(
+        db_session, test_user["user"].id, "Moscow",
+        geocode_status=GEOCODE_DONE, latitude=55.75, longitude=37.61, geocode_attempts=2
+    )
+    headers = {"Authorization": f"Bearer {test_user['token']}"}
+
+    response = client.put(f"/admin/events/{event.id}", json={"location": "Kazan"}, headers=headers)
+
+    assert response.status_code == 200
+    db_session.refresh(event)
+    assert event.geocode_status == GEOCODE_PENDING
+    assert (event.latitude, event.longitude) == (None, None)
+    assert event.geocode_attempts == 0
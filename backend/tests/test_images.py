@@ -0,0 +1,78 @@
+from io import BytesIO
+import pytest
+from PIL import Image
+from fastapi.testclient import TestClient
+from app.api.core.config import settings
+from app.api.core.s3 import avatar_key_from_url, stream_avatar_upload
+from app.api.models.user import User
+from app.api.services.images import process_avatar, render_avatar_variants, variant_key
+
+def make_image(size=(800, 600), fmt="JPEG") -> bytes:
+    buffer = BytesIO()
+    Image.new("RGB", size, (200, 30, 30)).save(buffer, format=fmt)
+    return buffer.getvalue()
+
+async def upload(data: bytes, user_id: int) -> str:
+    async def chunks():
+        yield data
+    return await stream_avatar_upload(chunks(), user_id)
+
+def list_keys(bucket):
+    return sorted(item["Key"] for item in bucket.list_objects_v2(Bucket=settings.S3_BUCKET).get("Contents", []))
+
+def test_render_avatar_variants():
+    variants = render_avatar_variants(make_image(), (64, 128, 256))
+
+    assert sorted(variants) == [64, 128, 256]
+    for size, data in variants.items():
+        with Image.open(BytesIO(data)) as image:
+            assert image.format == "WEBP"
+            assert image.size == (size, size)
+    assert len(variants[64]) < len(variants[256])
+
+def test_render_keeps_transparency():
+    buffer = BytesIO()
+    Image.new("RGBA", (300, 300), (0, 0, 0, 0)).save(buffer, format="PNG")
+    variants = render_avatar_variants(buffer.getvalue(), (64,))
+    with Image.open(BytesIO(variants[64])) as image:
+        assert image.mode == "RGBA"
+
+def test_variant_key():
+    assert variant_key("avatars/1/abc.jpg", 64) == "avatars/1/abc_64.webp"
+
+@pytest.mark.asyncio
+async def test_process_avatar_stores_variants(bucket, test_user, db_session, async_session_factory):
+    user = db_session.get(User, test_user["user"].id)
+    url = await upload(make_image(), user.id)
+    user.avatar_url = url
+    db_session.commit()
+
+    variants = await process_avatar(user.id, url, session_factory=async_session_factory)
+
+    assert sorted(variants, key=int) == ["64", "128", "256"]
+    key = avatar_key_from_url(url)
+    assert list_keys(bucket) == sorted([key] + [variant_key(key, size) for size in (64, 128, 256)])
+    db_session.refresh(user)
+    assert user.avatar_variants == variants
+
+@pytest.mark.asyncio
+async def test_process_avatar_discards_stale_variants(bucket, test_user, async_session_factory):
+    user = test_user["user"]
+    url = await upload(make_image(), user.id)
+
+    assert await process_avatar(user.id, url, session_factory=async_session_factory) is None
+    assert list_keys(bucket) == [avatar_key_from_url(url)]
+
+def test_avatar_upload_exposes_variants(client: TestClient, test_user, bucket):
+    headers = {"Authorization": f"Bearer {test_user['token']}"}
+
+    response = client.post("/users/me/avatar", files={"file": ("a.png", make_image(fmt="PNG"), "image/png")}, headers=headers)
+    assert response.status_code == 200
+
+    me = client.get("/users/me", headers=headers).json()
+    assert sorted(me["avatar_variants"], key=int) == ["64", "128", "256"]
+    assert me["avatar_variants"]["64"].endswith("_64.webp")
+
+    assert client.delete("/users/me/avatar", headers=headers).status_code == 200
+    assert list_keys(bucket) == []
+    assert client.get("/users/me", headers=headers).json()["avatar_variants"] is None
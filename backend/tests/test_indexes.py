@@ -0,0 +1,51 @@
+import re
+import pytest
+from sqlalchemy import select
+from app.api.models.attendance import Attendance
+from app.api.models.chat import ChatMessage
+from app.api.models.event import Event
+from app.api.models.group import group_members
+from app.api.services.geo import bounding_box_condition
+
+def explain(engine, statement):
+    sql = str(statement.compile(dialect=engine.dialect, compile_kwargs={"literal_binds": True}))
+    with engine.connect() as conn:
+        rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}").all()
+    return [row[-1] for row in rows]
+
+def assert_uses_index(plan, index_name):
+    for detail in plan:
+        assert not re.match(r"^SCAN \w+$", detail), f"sequential scan: {plan}"
+        assert "TEMP B-TREE" not in detail, f"sort without index: {plan}"
+    assert any(index_name in detail for detail in plan), plan
+
+@pytest.mark.parametrize("statement, index_name", [
+    (
+        select(Event).where(Event.category_id == 1).order_by(Event.date, Event.id).limit(10),
+        "ix_events_category_date",
+    ),
+    (select(Event).order_by(Event.date.desc(), Event.id.desc()).limit(10), "ix_events_date_id"),
+    (select(Event).order_by(Event.price, Event.id).limit(10), "ix_events_price_id"),
+    (select(Event).order_by(Event.title, Event.id).limit(10), "ix_events_title_id"),
+    (select(Event).order_by(Event.created_at, Event.id).limit(10), "ix_events_created_at_id"),
+    (
+        select(Attendance).where(Attendance.user_id == 1, Attendance.event_id == 2),
+        "ix_attendance_user_event",
+    ),
+    (select(Attendance).where(Attendance.event_id == 2), "ix_attendance_event_id"),
+    (
+        select(Event).where(bounding_box_condition(Event.latitude, Event.longitude, 55.75, 37.61, 5)),
+        "ix_events_lat_lon",
+    ),
+    (
+        select(ChatMessage).where(ChatMessage.group_id == 1, ChatMessage.id > 10).order_by(ChatMessage.id),
+        "ix_chat_messages_group_id_id",
+    ),
+    (
+        select(ChatMessage).where(ChatMessage.group_id == 1).order_by(ChatMessage.id.desc()).limit(50),
+        "ix_chat_messages_group_id_id",
+    ),
+    (select(group_members.c.user_id).where(group_members.c.group_id == 1), "ix_group_members_group_user"),
+])
+def test_hot_queries_use_indexes(db_engine, statement, index_name):
+    assert_uses_index(explain(db_engine, statement), index_name)
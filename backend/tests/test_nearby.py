@@ -0,0 +1,97 @@
+import math
+import pytest
+from datetime import datetime, timezone
+from fastapi.testclient import TestClient
+from app.api.models.event import Event, GEOCODE_DONE
+from app.api.services.geo import EARTH_RADIUS_KM, bounding_box, haversine_km
+
+def add_event(db_session, organizer_id: int, title: str, latitude, longitude) -> Event:
+    event = Event(
+        title=title,
+        description="Desc",
+        date=datetime(2026, 12, 1, 10, tzinfo=timezone.utc),
+        location=title,
+        max_participants=10,
+        organizer_id=organizer_id,
+        latitude=latitude,
+        longitude=longitude,
+        geocode_status=GEOCODE_DONE
+    )
+    db_session.add(event)
+    db_session.commit()
+    return event
+
+def destination(latitude: float, longitude: float, bearing: float, distance_km: float):
+    lat1, lon1, theta = map(math.radians, (latitude, longitude, bearing))
+    delta = distance_km / EARTH_RADIUS_KM
+    lat2 = math.asin(math.sin(lat1) * math.cos(delta) + math.cos(lat1) * math.sin(delta) * math.cos(theta))
+    lon2 = lon1 + math.atan2(
+        math.sin(theta) * math.sin(delta) * math.cos(lat1),
+        math.cos(delta) - math.sin(lat1) * math.sin(lat2)
+    )
+    return math.degrees(lat2), (math.degrees(lon2) + 540) % 360 - 180
+
+def test_haversine_moscow_to_saint_petersburg():
+    assert haversine_km(55.7558, 37.6176, 59.9386, 30.3141) == pytest.approx(634, abs=2)
+
+def test_bounding_box_contains_circle():
+    min_lat, max_lat, lon_ranges = bounding_box(55.75, 37.61, 10)
+    assert haversine_km(55.75, 37.61, max_lat, 37.61) == pytest.approx(10, abs=0.01)
+    assert len(lon_ranges) == 1
+    low, high = lon_ranges[0]
+    assert haversine_km(55.75, 37.61, 55.75, high) >= 10
+    assert haversine_km(55.75, 37.61, 55.75, low) >= 10
+
+def test_bounding_box_wraps_antimeridian():
+    _, _, lon_ranges = bounding_box(65.0, 179.9, 50)
+    assert len(lon_ranges) == 2
+    assert lon_ranges[1][0] == -180.0
+
+def test_nearby_events_sorted_by_distance(client: TestClient, test_user, db_session):
+    organizer_id = test_user["user"].id
+    add_event(db_session, organizer_id, "Kremlin", 55.7520, 37.6175)
+    add_event(db_session, organizer_id, "Gorky Park", 55.7298, 37.6031)
+    add_event(db_session, organizer_id, "Zelenograd", 55.9825, 37.1814)
+    add_event(db_session, organizer_id, "Saint Petersburg", 59.9386, 30.3141)
+    add_event(db_session, organizer_id, "Not geocoded", None, None)
+
+    response = client.get("/events/nearby", params={"lat": 55.7558, "lon": 37.6176, "radius_km": 10})
+
+    assert response.status_code == 200
+    items = response.json()["items"]
+    assert [item["title"] for item in items] == ["Kremlin", "Gorky Park"]
+    assert items[0]["distance_km"] < items[1]["distance_km"] <= 10
+
+def test_nearby_events_limit_and_validation(client: TestClient, test_user, db_session):
+    organizer_id = test_user["user"].id
+    for i in range(3):
+        add_event(db_session, organizer_id, f"Event {i}", 55.75 + i * 0.01, 37.61)
+
+    response = client.get("/events/nearby", params={"lat": 55.75, "lon": 37.61, "radius_km": 5, "limit": 2})
+    assert [item["title"] for item in response.json()["items"]] == ["Event 0", "Event 1"]
+
+    assert client.get("/events/nearby", params={"lat": 95, "lon": 37.61}).status_code == 422
+    assert client.get("/events/nearby", params={"lat": 55.75, "lon": 37.61, "radius_km": 0}).status_code == 422
+
+def test_nearby_limits_candidates_in_sql(client: TestClient, test_user, db_session, query_counter):
+    organizer_id = test_user["user"].id
+    for i in range(30):
+        add_event(db_session, organizer_id, f"Event {i:02d}", 55.75 + i * 0.001, 37.61)
+
+    response = client.get("/events/nearby", params={"lat": 55.75, "lon": 37.61, "radius_km": 50, "limit": 5})
+
+    assert [item["title"] for item in response.json()["items"]] == [f"Event {i:02d}" for i in range(5)]
+    selects = [sql for sql in query_counter.statements if sql.lstrip().upper().startswith("SELECT")]
+    assert len(selects) == 1 and "LIMIT" in selects[0].upper()
+
+@pytest.mark.parametrize("latitude,longitude", [(60.0, 30.0), (-45.0, 179.5)])
+def test_nearby_keeps_points_near_the_edge(client: TestClient, test_user, db_session, latitude, longitude):
+    organizer_id = test_user["user"].id
+    for bearing in range(0, 360, 45):
+        add_event(db_session, organizer_id, f"In {bearing}", *destination(latitude, longitude, bearing, 199))
+        add_event(db_session, organizer_id, f"Out {bearing}", *destination(latitude, longitude, bearing, 201))
+
+    response = client.get("/events/nearby", params={"lat": latitude, "lon": longitude, "radius_km": 200, "limit": 50})
+
+    assert sorted(item["title"] for item in response.json()["items"]) == sorted(f"In {b}" for b in range(0, 360, 45))
+
@@ -0,0 +1,77 @@
+import asyncio
+import time
+import pytest
+from fastapi.testclient import TestClient
+from app.api.core import passwords
+from app.api.core.passwords import PasswordHasher, PasswordHasherBusy
+from app.api.core.security import get_password_hash
+
+@pytest.mark.asyncio
+async def test_hash_and_verify_off_loop():
+    hasher = PasswordHasher(max_workers=2, max_queue=4)
+    try:
+        hashed = await hasher.hash("secret")
+        assert await hasher.verify("secret", hashed)
+        assert not await hasher.verify("wrong", hashed)
+    finally:
+        hasher.shutdown()
+
+    stats = hasher.stats()
+    assert stats["completed"] == 3
+    assert stats["rejected"] == 0
+    assert stats["avg_run_ms"] > 0
+
+@pytest.mark.asyncio
+async def test_event_loop_stays_responsive():
+    hasher = PasswordHasher(max_workers=1, max_queue=8)
+    hashed = get_password_hash("secret")
+    lags = []
+
+    async def ticker():
+        for _ in range(20):
+            started = time.perf_counter()
+            await asyncio.sleep(0.005)
+            lags.append(time.perf_counter() - started - 0.005)
+
+    try:
+        await asyncio.gather(ticker(), *[hasher.verify("secret", hashed) for _ in range(4)])
+    finally:
+        hasher.shutdown()
+
+    assert max(lags) < 0.1
+
+@pytest.mark.asyncio
+async def test_queue_limit_rejects_overflow():
+    hasher = PasswordHasher(max_workers=1, max_queue=1)
+    hashed = get_password_hash("secret")
+    try:
+        results = await asyncio.gather(
+            *[hasher.verify("secret", hashed) for _ in range(4)],
+            return_exceptions=True
+        )
+    finally:
+        hasher.shutdown()
+
+    assert results[:2] == [True, True]
+    assert all(isinstance(result, PasswordHasherBusy) for result in results[2:])
+    assert hasher.stats()["rejected"] == 2
+
+def test_login_returns_503_when_hasher_is_saturated(client: TestClient, test_user, monkeypatch):
+    async def busy(*args):
+        raise PasswordHasherBusy()
+
+    monkeypatch.setattr(passwords.password_hasher, "verify", busy)
+
+    response = client.post("/auth/login", data={"username": "test@example.com", "password": "securepassword123"})
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+
+def test_register_and_login_use_pool(client: TestClient):
+    completed = passwords.password_hasher.stats()["completed"]
+
+    client.post("/auth/register", json={"email": "pool@example.com", "name": "Pool", "password": "password123"})
+    response = client.post("/auth/login", data={"username": "pool@example.com", "password": "password123"})
+
+    assert response.status_code == 200
+    assert passwords.password_hasher.stats()["completed"] == completed + 2
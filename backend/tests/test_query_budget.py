@@ -0,0 +1,55 @@
+from sqlalchemy import update
+from app.api.models.user import User
+
+def _create_event(client, headers, title, category_id=None):
+    response = client.post("/events/", json={
+        "title": title,
+        "description": "Desc",
+        "date": "2026-12-01T10:00:00",
+        "location": "Moscow",
+        "price": 0,
+        "max_participants": 10,
+        "category_id": category_id
+    }, headers=headers)
+    assert response.status_code == 200
+    return response.json()
+
+def test_create_and_get_event_query_budget(client, test_user, db_session, query_counter):
+    db_session.execute(update(User).where(User.id == test_user["user"].id).values(role="moderator"))
+    db_session.commit()
+    headers = {"Authorization": f"Bearer {test_user['token']}"}
+    category_id = client.post("/categories/", json={"name": "Музыка"}, headers=headers).json()["id"]
+
+    with query_counter.budget(2):
+        event = _create_event(client, headers, "Concert", category_id)
+    assert event["organizer_name"] == "Test User"
+    assert event["category_name"] == "Музыка"
+    assert event["created_at"] is not None
+
+    with query_counter.budget(1):
+        detail = client.get(f"/events/{event['id']}").json()
+    assert detail["category_name"] == "Музыка"
+
+def test_attendance_query_budget_does_not_grow_with_records(client, test_user, query_counter):
+    headers = {"Authorization": f"Bearer {test_user['token']}"}
+    events = [_create_event(client, headers, f"Event {i}") for i in range(5)]
+
+    for event in events:
+        with query_counter.budget(5):
+            response = client.post("/attendance/", json={"event_id": event["id"]}, headers=headers)
+        assert response.json()["event_title"] == event["title"]
+        assert response.json()["date"] is not None
+
+    with query_counter.budget(2):
+        records = client.get("/attendance/my", headers=headers).json()
+    assert sorted(r["event_title"] for r in records) == [e["title"] for e in events]
+
+def test_catalog_query_budget(client, test_user, query_counter):
+    headers = {"Authorization": f"Bearer {test_user['token']}"}
+    for i in range(12):
+        _create_event(client, headers, f"Event {i}")
+
+    with query_counter.budget(2):
+        response = client.get("/events/?limit=10")
+    assert len(response.json()["items"]) == 10
+    assert all(item["organizer_name"] == "Test User" for item in response.json()["items"])
@@ -0,0 +1,93 @@
+import asyncio
+import pytest
+from app.api.core.rate_limit import (
+    InMemoryRateLimitBackend,
+    RateLimitBackend,
+    RedisRateLimitBackend,
+    login_rate_limit,
+    register_rate_limit,
+    parse_rate,
+)
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+def _exercise_bucket(backend, clock):
+    async def run():
+        assert [await backend.take("k", 3, 30) for _ in range(3)] == [0, 0, 0]
+        assert await backend.take("k", 3, 30) == pytest.approx(10)
+        assert await backend.take("other", 3, 30) == 0
+
+        clock.now += 10
+        assert await backend.take("k", 3, 30) == 0
+        assert await backend.take("k", 3, 30) == pytest.approx(10)
+
+        clock.now += 1000
+        assert [await backend.take("k", 3, 30) for _ in range(3)] == [0, 0, 0]
+
+        await backend.reset()
+        assert await backend.take("k", 3, 30) == 0
+        await backend.close()
+
+    asyncio.run(run())
+
+def test_parse_rate():
+    assert parse_rate("5/60") == (5, 60.0)
+
+def test_in_memory_token_bucket():
+    clock = FakeClock()
+    _exercise_bucket(InMemoryRateLimitBackend(clock=clock), clock)
+
+def test_in_memory_backend_evicts_oldest_keys():
+    backend = InMemoryRateLimitBackend(max_keys=2)
+
+    async def run():
+        for key in ("a", "b", "c"):
+            await backend.take(key, 1, 60)
+        return list(backend._buckets)
+
+    assert asyncio.run(run()) == ["b", "c"]
+
+def test_redis_token_bucket():
+    fakeredis = pytest.importorskip("fakeredis.aioredis")
+    clock = FakeClock()
+    backend = RedisRateLimitBackend(client=fakeredis.FakeRedis(decode_responses=True), clock=clock)
+    _exercise_bucket(backend, clock)
+
+def test_login_is_limited_per_account(client, test_user, monkeypatch):
+    monkeypatch.setattr(login_rate_limit, "per_account", (2, 60))
+    monkeypatch.setattr(login_rate_limit, "_backend", InMemoryRateLimitBackend(clock=FakeClock()))
+    form = {"username": "test@example.com", "password": "wrong"}
+
+    assert client.post("/auth/login", data=form).status_code == 401
+    assert client.post("/auth/login", data=form).status_code == 401
+
+    response = client.post("/auth/login", data={**form, "password": "securepassword123"})
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "30"
+
+    other = client.post("/auth/login", data={"username": "other@example.com", "password": "x"})
+    assert other.status_code == 401
+
+def test_register_is_limited_per_ip(client, monkeypatch):
+    monkeypatch.setattr(register_rate_limit, "per_ip", (1, 3600))
+    monkeypatch.setattr(register_rate_limit, "_backend", InMemoryRateLimitBackend(clock=FakeClock()))
+    payload = {"email": "new@example.com", "name": "New", "password": "password123"}
+
+    assert client.post("/auth/register", json=payload).status_code == 201
+    response = client.post("/auth/register", json={**payload, "email": "next@example.com"})
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "3600"
+
+def test_backend_outage_lets_requests_through(client, test_user, monkeypatch):
+    class BrokenBackend(RateLimitBackend):
+        async def take(self, key, capacity, period):
+            raise ConnectionError("redis is down")
+
+    monkeypatch.setattr(login_rate_limit, "_backend", BrokenBackend())
+    response = client.post("/auth/login", data={"username": "test@example.com", "password": "securepassword123"})
+    assert response.status_code == 200
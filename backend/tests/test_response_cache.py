@@ -0,0 +1,146 @@
+import asyncio
+from datetime import datetime
+import pytest
+from app.api.models.event import Event
+from app.api.services.broker import BrokerBackend, broker
+from app.api.services.response_cache import (
+    CATALOG,
+    EVENT,
+    ResponseCache,
+    RedisResponseCacheBackend,
+    etag_matches,
+    normalize_params,
+)
+
+def _event_payload(title):
+    return {
+        "title": title,
+        "description": "Desc",
+        "date": "2026-12-01T10:00:00",
+        "location": "Moscow",
+        "price": 0,
+        "max_participants": 10
+    }
+
+def _headers(test_user):
+    return {"Authorization": f"Bearer {test_user['token']}"}
+
+def test_normalize_params_ignores_order_and_empty_values():
+    first = normalize_params({"limit": 10, "search": " jazz ", "category_id": None})
+    second = normalize_params({"search": "jazz", "limit": 10})
+    assert first == second
+    assert normalize_params({"date_from": datetime(2026, 1, 1)}) == "date_from=2026-01-01T00%3A00%3A00"
+
+def test_etag_matches():
+    assert etag_matches('"a", W/"b"', '"b"')
+    assert etag_matches("*", '"a"')
+    assert not etag_matches('"a"', '"b"')
+    assert not etag_matches(None, '"a"')
+
+def test_catalog_is_cached_until_write(client, test_user, db_session):
+    client.post("/events/", json=_event_payload("First"), headers=_headers(test_user))
+
+    first = client.get("/events/?limit=10")
+    assert first.status_code == 200
+    assert first.headers["Cache-Control"].startswith("public, max-age=")
+    etag = first.headers["ETag"]
+
+    db_session.add(Event(title="Hidden", description="-", date=datetime(2026, 12, 1), location="Moscow",
+                         price=0, max_participants=5, organizer_id=test_user["user"].id))
+    db_session.commit()
+
+    cached = client.get("/events/?limit=10&search=")
+    assert cached.json() == first.json()
+    assert client.get("/events/", params={"limit": 10}, headers={"If-None-Match": etag}).status_code == 304
+
+    client.post("/events/", json=_event_payload("Second"), headers=_headers(test_user))
+    fresh = client.get("/events/?limit=10", headers={"If-None-Match": etag})
+    assert fresh.status_code == 200
+    assert fresh.json()["total"] == 3
+    assert fresh.headers["ETag"] != etag
+
+def test_event_detail_etag_and_invalidation(client, test_user):
+    event_id = client.post("/events/", json=_event_payload("Talk"), headers=_headers(test_user)).json()["id"]
+
+    response = client.get(f"/events/{event_id}")
+    assert response.status_code == 200
+    assert response.json()["title"] == "Talk"
+    etag = response.headers["ETag"]
+    assert client.get(f"/events/{event_id}", headers={"If-None-Match": etag}).status_code == 304
+
+    client.put(f"/events/{event_id}", json={"title": "Talk v2"}, headers=_headers(test_user))
+    updated = client.get(f"/events/{event_id}", headers={"If-None-Match": etag})
+    assert updated.status_code == 200
+    assert updated.json()["title"] == "Talk v2"
+
+    client.delete(f"/events/{event_id}", headers=_headers(test_user))
+    assert client.get(f"/events/{event_id}").status_code == 404
+
+def test_store_skips_responses_computed_before_invalidation():
+    cache = ResponseCache()
+
+    async def run():
+        generation = await cache.snapshot()
+        await cache.invalidate_events(1)
+        await cache.store(CATALOG, "k", {"items": []}, generation)
+        return await cache.get(CATALOG, "k")
+
+    assert asyncio.run(run()) is None
+
+def test_shared_tier_is_visible_to_other_workers():
+    fakeredis = pytest.importorskip("fakeredis.aioredis")
+    client = fakeredis.FakeRedis(decode_responses=True)
+    worker_a = ResponseCache(RedisResponseCacheBackend(client=client))
+    worker_b = ResponseCache(RedisResponseCacheBackend(client=client))
+
+    async def run():
+        stored = await worker_a.store(CATALOG, "k", {"items": [1]})
+        shared = await worker_b.get(CATALOG, "k")
+        assert shared.body == stored.body and shared.etag == stored.etag
+
+        await worker_a.invalidate_events(1)
+        worker_b.clear()
+        assert await worker_b.get(CATALOG, "k") is None
+
+    asyncio.run(run())
+
+@pytest.mark.parametrize("invalidate", [
+    lambda cache: cache.invalidate_events(1),
+    lambda cache: cache.invalidate_all(),
+])
+def test_shared_tier_skips_responses_computed_before_other_worker_invalidation(invalidate):
+    fakeredis = pytest.importorskip("fakeredis.aioredis")
+    client = fakeredis.FakeRedis(decode_responses=True)
+    worker_a = ResponseCache(RedisResponseCacheBackend(client=client))
+    worker_b = ResponseCache(RedisResponseCacheBackend(client=client))
+
+    async def run():
+        catalog_generation = await worker_a.snapshot()
+        event_generation = await worker_a.snapshot()
+        await invalidate(worker_b)
+
+        await worker_a.store(CATALOG, "k", {"items": ["stale"]}, catalog_generation)
+        await worker_a.store(EVENT, "1", {"title": "stale"}, event_generation)
+        for worker in (worker_a, worker_b):
+            assert await worker.get(CATALOG, "k") is None
+            assert await worker.get(EVENT, "1") is None
+
+        fresh = await worker_a.store(CATALOG, "k", {"items": ["fresh"]}, await worker_a.snapshot())
+        assert (await worker_b.get(CATALOG, "k")).body == fresh.body
+
+    asyncio.run(run())
+
+class BrokenBrokerBackend(BrokerBackend):
+    async def publish(self, channel, message):
+        raise ConnectionError("redis is down")
+
+def test_broker_outage_does_not_fail_committed_writes(client, test_user, monkeypatch):
+    monkeypatch.setattr(broker, "backend", BrokenBrokerBackend())
+    headers = _headers(test_user)
+
+    created = client.post("/events/", json=_event_payload("Concert"), headers=headers)
+    assert created.status_code == 200
+    event_id = created.json()["id"]
+    assert client.put(f"/events/{event_id}", json={"title": "Gig"}, headers=headers).status_code == 200
+    assert client.get(f"/events/{event_id}").json()["title"] == "Gig"
+    assert client.delete(f"/events/{event_id}", headers=headers).status_code == 200
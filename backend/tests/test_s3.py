@@ -0,0 +1,167 @@
+import asyncio
+import threading
+import pytest
+from fastapi.testclient import TestClient
+from starlette.requests import Request
+from app.api.core import s3
+from app.api.core.config import settings
+from app.api.core.uploads import iter_form_file
+from app.api.services.images import delete_avatar_files
+
+PNG = b"\x89PNG\r\n\x1a\n" + b"\x00" * 56
+MB = 1024 * 1024
+
+async def chunked(data: bytes, size: int = 64 * 1024, consumed: list = None):
+    for offset in range(0, len(data), size):
+        if consumed is not None:
+            consumed.append(offset)
+        yield data[offset:offset + size]
+
+def test_client_is_shared(bucket):
+    assert s3.get_s3_client() is bucket
+    assert bucket.meta.config.max_pool_connections == settings.S3_MAX_POOL_CONNECTIONS
+
+def test_avatar_key_from_url(monkeypatch):
+    monkeypatch.setattr(settings, "S3_PUBLIC_URL", "http://cdn.example.com")
+    url = f"http://cdn.example.com/{settings.S3_BUCKET}/avatars/1/a.png?v=2"
+    assert s3.avatar_key_from_url(url) == "avatars/1/a.png"
+
+@pytest.mark.asyncio
+async def test_upload_and_delete_run_in_executor(bucket, monkeypatch):
+    threads = []
+
+    def recording(method):
+        def call(**kwargs):
+            threads.append(threading.current_thread().name)
+            return method(**kwargs)
+        return call
+
+    monkeypatch.setattr(bucket, "put_object", recording(bucket.put_object))
+    monkeypatch.setattr(bucket, "delete_objects", recording(bucket.delete_objects))
+    url = await s3.stream_avatar_upload(chunked(PNG), 7)
+
+    key = s3.avatar_key_from_url(url)
+    assert url == f"http://cdn.example.com/{settings.S3_BUCKET}/{key}"
+    assert bucket.head_object(Bucket=settings.S3_BUCKET, Key=key)["ContentType"] == "image/png"
+
+    await delete_avatar_files(url, None)
+    assert len(threads) == 2 and all(name.startswith("s3") for name in threads)
+    assert "Contents" not in bucket.list_objects_v2(Bucket=settings.S3_BUCKET)
+
+@pytest.mark.asyncio
+async def test_concurrent_uploads(bucket):
+    urls = await asyncio.gather(*[
+        s3.stream_avatar_upload(chunked(PNG), i) for i in range(10)
+    ])
+    assert len(set(urls)) == 10
+    assert bucket.list_objects_v2(Bucket=settings.S3_BUCKET)["KeyCount"] == 10
+
+def test_avatar_endpoints(client: TestClient, test_user, bucket):
+    headers = {"Authorization": f"Bearer {test_user['token']}"}
+
+    first = client.post("/users/me/avatar", files={"file": ("a.png", PNG, "image/png")}, headers=headers)
+    second = client.post("/users/me/avatar", files={"file": ("b.png", PNG, "image/png")}, headers=headers)
+    assert first.status_code == second.status_code == 200
+
+    keys = [item["Key"] for item in bucket.list_objects_v2(Bucket=settings.S3_BUCKET)["Contents"]]
+    assert keys == [s3.avatar_key_from_url(second.json()["avatar_url"])]
+
+    assert client.delete("/users/me/avatar", headers=headers).status_code == 200
+    assert "Contents" not in bucket.list_objects_v2(Bucket=settings.S3_BUCKET)
+
+def test_avatar_endpoint_rejects_fake_image(client: TestClient, test_user, bucket):
+    headers = {"Authorization": f"Bearer {test_user['token']}"}
+    response = client.post("/users/me/avatar", files={"file": ("a.png", b"<?php echo 1; ?>", "image/png")}, headers=headers)
+    assert response.status_code == 400
+    assert "Contents" not in bucket.list_objects_v2(Bucket=settings.S3_BUCKET)
+
+def test_avatar_endpoint_rejects_by_content_length(client: TestClient, test_user, monkeypatch):
+    monkeypatch.setattr(settings, "AVATAR_MAX_SIZE", 1024)
+    headers = {"Authorization": f"Bearer {test_user['token']}"}
+    body = PNG + b"\x00" * (64 * 1024)
+    response = client.post("/users/me/avatar", files={"file": ("a.png", body, "image/png")}, headers=headers)
+    assert response.status_code == 413
+
+def test_avatar_endpoint_rejects_declared_type(client: TestClient, test_user, bucket):
+    headers = {"Authorization": f"Bearer {test_user['token']}"}
+    response = client.post("/users/me/avatar", files={"file": ("a.gif", PNG, "image/gif")}, headers=headers)
+    assert response.status_code == 400
+    assert "Contents" not in bucket.list_objects_v2(Bucket=settings.S3_BUCKET)
+
+def multipart_request(body: bytes, boundary: str, chunk_size: int, received: list) -> Request:
+    chunks = [body[i:i + chunk_size] for i in range(0, len(body), chunk_size)]
+
+    async def receive():
+        index = len(received)
+        received.append(index)
+        return {"type": "http.request", "body": chunks[index], "more_body": index + 1 < len(chunks)}
+
+    scope = {
+        "type": "http",
+        "method": "POST",
+        "headers": [(b"content-type", f"multipart/form-data; boundary={boundary}".encode())],
+    }
+    return Request(scope, receive)
+
+@pytest.mark.asyncio
+async def test_form_file_is_parsed_while_the_body_arrives():
+    boundary = "xyz"
+    payload = PNG + b"\x01" * (256 * 1024)
+    body = (
+        f"--{boundary}\r\nContent-Disposition: form-data; name=\"note\"\r\n\r\nhi\r\n"
+        f"--{boundary}\r\nContent-Disposition: form-data; name=\"file\"; filename=\"a.png\"\r\n"
+        f"Content-Type: image/png\r\n\r\n"
+    ).encode() + payload + f"\r\n--{boundary}--\r\n".encode()
+
+    received = []
+    data = b"".join([chunk async for chunk in iter_form_file(
+        multipart_request(body, boundary, 16 * 1024, received), "file", ["image/png"]
+    )])
+    assert data == payload
+
+    received = []
+    with pytest.raises(s3.UploadValidationError):
+        await s3.stream_avatar_upload(
+            iter_form_file(multipart_request(body, boundary, 16 * 1024, received), "file", ["image/png"]),
+            3,
+            max_size=64 * 1024
+        )
+    assert len(received) < len(body) // (16 * 1024) // 2
+
+def test_sniff_image_type():
+    assert s3.sniff_image_type(b"\xff\xd8\xff\xe0") == "image/jpeg"
+    assert s3.sniff_image_type(PNG[:12]) == "image/png"
+    assert s3.sniff_image_type(b"RIFF\x00\x00\x00\x00WEBP") == "image/webp"
+    assert s3.sniff_image_type(b"GIF89a") is None
+
+@pytest.mark.asyncio
+async def test_small_avatar_uses_single_put(bucket):
+    url = await s3.stream_avatar_upload(chunked(PNG), 3)
+
+    key = s3.avatar_key_from_url(url)
+    assert key.startswith("avatars/3/") and key.endswith(".png")
+    head = bucket.head_object(Bucket=settings.S3_BUCKET, Key=key)
+    assert head["ContentLength"] == len(PNG)
+    assert head["ContentType"] == "image/png"
+
+@pytest.mark.asyncio
+async def test_large_avatar_uses_multipart(bucket):
+    data = PNG + b"\x01" * (11 * MB)
+    url = await s3.stream_avatar_upload(chunked(data, MB), 3, max_size=20 * MB, part_size=5 * MB)
+
+    key = s3.avatar_key_from_url(url)
+    head = bucket.head_object(Bucket=settings.S3_BUCKET, Key=key)
+    assert head["ContentLength"] == len(data)
+    assert head["ETag"].endswith('-3"')
+
+@pytest.mark.asyncio
+async def test_oversized_avatar_rejected_while_streaming(bucket):
+    consumed = []
+    data = PNG + b"\x01" * (12 * MB)
+
+    with pytest.raises(s3.UploadValidationError):
+        await s3.stream_avatar_upload(chunked(data, MB, consumed), 3, max_size=6 * MB, part_size=5 * MB)
+
+    assert len(consumed) == 7
+    assert "Uploads" not in bucket.list_multipart_uploads(Bucket=settings.S3_BUCKET)
+    assert "Contents" not in bucket.list_objects_v2(Bucket=settings.S3_BUCKET)
@@ -1,67 +1,192 @@
+import asyncio
+import httpx
 import pytest
-from unittest.mock import patch, MagicMock, AsyncMock
 from app.api.services.maps import YandexMapsService
+from app.api.services.geocode_cache import GeocodeCache
 
-@pytest.mark.asyncio
-async def test_geocode_success():
-    service = YandexMapsService()
-    
-    mock_response_data = {
-        "response": {
-            "GeoObjectCollection": {
-                "featureMember": [
-                    {
-                        "GeoObject": {
-                            "Point": {"pos": "37.6176 55.7558"},
-                            "name": "Москва"
-                        }
+MOSCOW_RESPONSE = {
+    "response": {
+        "GeoObjectCollection": {
+            "featureMember": [
+                {
+                    "GeoObject": {
+                        "Point": {"pos": "37.6176 55.7558"},
+                        "name": "Москва"
                     }
-                ]
-            }
+                }
+            ]
+        }
+    }
+}
+
+EMPTY_RESPONSE = {
+    "response": {
+        "GeoObjectCollection": {
+            "featureMember": []
         }
     }
-    
-    mock_response = MagicMock()
-    mock_response.status_code = 200
-    mock_response.json.return_value = mock_response_data
-    mock_response.raise_for_status.return_value = None
-    
-    mock_client = MagicMock()
-    mock_client.get = AsyncMock(return_value=mock_response)
-    
-    mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-    mock_client.__aexit__ = AsyncMock(return_value=None)
-
-    with patch('httpx.AsyncClient', return_value=mock_client):
+}
+
+def make_service(handler, **kwargs) -> YandexMapsService:
+    return YandexMapsService(
+        cache=GeocodeCache(session_factory=None),
+        transport=httpx.MockTransport(handler),
+        **kwargs
+    )
+
+@pytest.mark.asyncio
+async def test_geocode_success():
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, json=MOSCOW_RESPONSE)
+
+    service = make_service(handler)
+    await service.start()
+    try:
         result = await service.geocode_address("Москва")
-        
-        assert result is not None
-        assert result["latitude"] == 55.7558
-        assert result["longitude"] == 37.6176
+    finally:
+        await service.stop()
+
+    assert result is not None
+    assert result["latitude"] == 55.7558
+    assert result["longitude"] == 37.6176
+    assert requests[0].url.params["geocode"] == "Москва"
 
 @pytest.mark.asyncio
 async def test_geocode_not_found():
-    service = YandexMapsService()
-    
-    mock_response_data = {
-        "response": {
-            "GeoObjectCollection": {
-                "featureMember": []
-            }
-        }
-    }
-    
-    mock_response = MagicMock()
-    mock_response.status_code = 200
-    mock_response.json.return_value = mock_response_data
-    mock_response.raise_for_status.return_value = None
-    
-    mock_client = MagicMock()
-    mock_client.get = AsyncMock(return_value=mock_response)
-    mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-    mock_client.__aexit__ = AsyncMock(return_value=None)
-
-    with patch('httpx.AsyncClient', return_value=mock_client):
+    service = make_service(lambda request: httpx.Response(200, json=EMPTY_RESPONSE))
+    await service.start()
+    try:
         result = await service.geocode_address("НеуществующийАдрес12345")
-        
-        assert result is None
\ No newline at end of file
+    finally:
+        await service.stop()
+
+    assert result is None
+
+@pytest.mark.asyncio
+async def test_geocode_http_error_returns_none():
+    service = make_service(lambda request: httpx.Response(503))
+    await service.start()
+    try:
+        assert await service.geocode_address("Москва") is None
+        assert await service.get_address_by_coords(55.75, 37.61) is None
+    finally:
+        await service.stop()
+
+@pytest.mark.asyncio
+async def test_geocode_timeout_returns_none():
+    def handler(request: httpx.Request) -> httpx.Response:
+        raise httpx.ConnectTimeout("timeout", request=request)
+
+    service = make_service(handler)
+    await service.start()
+    try:
+        assert await service.geocode_address("Москва") is None
+    finally:
+        await service.stop()
+
+@pytest.mark.asyncio
+async def test_client_is_shared_between_requests():
+    service = make_service(lambda request: httpx.Response(200, json=MOSCOW_RESPONSE))
+    await service.start()
+    client = service.client
+    try:
+        await service.geocode_address("Москва")
+        await service.get_address_by_coords(55.7558, 37.6176)
+        assert service.client is client
+        assert not client.is_closed
+    finally:
+        await service.stop()
+
+    assert client.is_closed
+    assert service.client is None
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_are_capped():
+    in_flight = 0
+    peak = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return httpx.Response(200, json=MOSCOW_RESPONSE)
+
+    service = make_service(handler, concurrency=2)
+    await service.start()
+    try:
+        results = await asyncio.gather(*[
+            service.geocode_address(f"Москва, дом {i}") for i in range(8)
+        ])
+    finally:
+        await service.stop()
+
+    assert all(result is not None for result in results)
+    assert peak == 2
+
+@pytest.mark.asyncio
+async def test_geocode_many_dedupes_and_keeps_order():
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request.url.params["geocode"])
+        if request.url.params["geocode"] == "Нигде":
+            return httpx.Response(200, json=EMPTY_RESPONSE)
+        return httpx.Response(200, json=MOSCOW_RESPONSE)
+
+    service = make_service(handler)
+    await service.start()
+    try:
+        results = await service.geocode_many(["Москва", "Нигде", "москва", "Москва"])
+    finally:
+        await service.stop()
+
+    assert sorted(requests) == ["Москва", "Нигде"]
+    assert [r["address"] if r else None for r in results] == ["Москва", None, "москва", "Москва"]
+
+@pytest.mark.asyncio
+async def test_get_addresses_by_coords_dedupes_nearby_points():
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request.url.params["geocode"])
+        return httpx.Response(200, json=MOSCOW_RESPONSE)
+
+    service = make_service(handler)
+    await service.start()
+    try:
+        results = await service.get_addresses_by_coords([(55.75581, 37.61761), (55.755812, 37.617611), (59.93, 30.33)])
+    finally:
+        await service.stop()
+
+    assert len(requests) == 2
+    assert results == ["Москва", "Москва", "Москва"]
+
+def test_geocode_batch_endpoint(client, test_user, monkeypatch):
+    from app.api.services.maps import yandex_maps_service
+
+    async def fake_request(address):
+        if address == "Нигде":
+            return None
+        return {"latitude": 55.7558, "longitude": 37.6176, "address": address}
+
+    monkeypatch.setattr(yandex_maps_service, "cache", GeocodeCache(session_factory=None))
+    monkeypatch.setattr(yandex_maps_service, "_request_geocode", fake_request)
+    headers = {"Authorization": f"Bearer {test_user['token']}"}
+
+    response = client.post("/maps/geocode/batch", json={"addresses": ["Москва", "Нигде"]}, headers=headers)
+
+    assert response.status_code == 200
+    items = response.json()["items"]
+    assert items[0] == {"address": "Москва", "latitude": 55.7558, "longitude": 37.6176, "error": None}
+    assert items[1]["address"] == "Нигде"
+    assert items[1]["error"] is not None
+
+def test_geocode_batch_limits(client, test_user):
+    headers = {"Authorization": f"Bearer {test_user['token']}"}
+    assert client.post("/maps/geocode/batch", json={"addresses": []}, headers=headers).status_code == 422
+    assert client.post("/maps/geocode/batch", json={"addresses": ["Москва"]}).status_code == 401
@@ -0,0 +1,108 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from jose import jwt
+from app.api.core.security import SECRET_KEY, ALGORITHM
+from app.api.models.session import RefreshSession
+from app.api.services.sessions import SessionService, hash_token_id, sweep_expired_sessions
+
+def _login(client, user_agent):
+    response = client.post(
+        "/auth/login",
+        data={"username": "test@example.com", "password": "securepassword123"},
+        headers={"User-Agent": user_agent}
+    )
+    assert response.status_code == 200
+    return response.json()
+
+def _auth(tokens):
+    return {"Authorization": f"Bearer {tokens['access_token']}"}
+
+def test_login_from_several_devices_keeps_all_sessions(client, test_user):
+    phone = _login(client, "phone")
+    laptop = _login(client, "laptop")
+
+    sessions = client.get("/auth/sessions", headers=_auth(laptop)).json()
+    assert sorted(s["user_agent"] for s in sessions) == ["laptop", "phone"]
+
+    assert client.post("/auth/refresh", json={"refresh_token": phone["refresh_token"]}).status_code == 200
+    assert client.post("/auth/refresh", json={"refresh_token": laptop["refresh_token"]}).status_code == 200
+
+def test_only_token_hash_is_stored(client, test_user, db_session):
+    tokens = _login(client, "phone")
+    jti = jwt.decode(tokens["refresh_token"], SECRET_KEY, algorithms=[ALGORITHM])["jti"]
+
+    stored = db_session.query(RefreshSession).one()
+    assert stored.token_hash == hash_token_id(jti)
+    assert stored.user_id == test_user["user"].id
+
+def test_refresh_rotates_token(client, test_user):
+    tokens = _login(client, "phone")
+
+    response = client.post("/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert response.status_code == 200
+    rotated = response.json()
+    assert rotated["refresh_token"] != tokens["refresh_token"]
+
+    reused = client.post("/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert reused.status_code == 401
+    assert client.post("/auth/refresh", json={"refresh_token": rotated["refresh_token"]}).status_code == 200
+
+def test_logout_revokes_only_current_device(client, test_user):
+    phone = _login(client, "phone")
+    laptop = _login(client, "laptop")
+
+    response = client.post("/auth/logout", json={"refresh_token": phone["refresh_token"]}, headers=_auth(phone))
+    assert response.status_code == 200
+
+    assert client.post("/auth/refresh", json={"refresh_token": phone["refresh_token"]}).status_code == 401
+    assert client.post("/auth/refresh", json={"refresh_token": laptop["refresh_token"]}).status_code == 200
+
+def test_logout_all_and_revoke_by_id(client, test_user):
+    phone = _login(client, "phone")
+    laptop = _login(client, "laptop")
+
+    sessions = client.get("/auth/sessions", headers=_auth(laptop)).json()
+    phone_id = next(s["id"] for s in sessions if s["user_agent"] == "phone")
+    assert client.delete(f"/auth/sessions/{phone_id}", headers=_auth(laptop)).status_code == 200
+    assert client.delete(f"/auth/sessions/{phone_id}", headers=_auth(laptop)).status_code == 404
+    assert client.post("/auth/refresh", json={"refresh_token": phone["refresh_token"]}).status_code == 401
+
+    _login(client, "tablet")
+    response = client.post("/auth/logout-all", headers=_auth(laptop))
+    assert response.json()["revoked"] == 2
+    assert client.post("/auth/refresh", json={"refresh_token": laptop["refresh_token"]}).status_code == 401
+
+def test_sweep_removes_expired_sessions(test_user, db_session, async_session_factory):
+    now = datetime.now(timezone.utc)
+    user_id = test_user["user"].id
+    db_session.add_all([
+        RefreshSession(token_hash=hash_token_id("old"), user_id=user_id, expires_at=now - timedelta(days=1)),
+        RefreshSession(token_hash=hash_token_id("live"), user_id=user_id, expires_at=now + timedelta(days=1)),
+    ])
+    db_session.commit()
+
+    assert asyncio.run(sweep_expired_sessions(async_session_factory)) == 1
+    db_session.expire_all()
+    assert [s.token_hash for s in db_session.query(RefreshSession).all()] == [hash_token_id("live")]
+
+def test_concurrent_refresh_with_same_token_succeeds_once(client, test_user, async_session_factory, monkeypatch):
+    tokens = _login(client, "phone")
+    barrier = asyncio.Barrier(2)
+    original = SessionService._get_by_token
+
+    async def lookup_then_wait(self, refresh_token):
+        session = await original(self, refresh_token)
+        await barrier.wait()
+        return session
+
+    monkeypatch.setattr(SessionService, "_get_by_token", lookup_then_wait)
+
+    async def refresh():
+        async with async_session_factory() as db:
+            return await SessionService(db).rotate(tokens["refresh_token"])
+
+    async def run():
+        return await asyncio.gather(refresh(), refresh())
+
+    results = asyncio.run(run())
+    assert sum(result is not None for result in results) == 1
@@ -0,0 +1,87 @@
+from fastapi.testclient import TestClient
+from jose import jwt
+from sqlalchemy import event, update
+from app.api.core.security import ALGORITHM, SECRET_KEY
+from app.api.models.user import User
+from app.api.services.broker import BrokerBackend, broker
+from app.api.services.user_cache import user_cache
+
+def register_and_login(client: TestClient, email: str) -> dict:
+    client.post("/auth/register", json={"email": email, "name": "Member", "password": "password123"})
+    response = client.post("/auth/login", data={"username": email, "password": "password123"})
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+def make_admin(client: TestClient, db_session) -> dict:
+    headers = register_and_login(client, "admin@example.com")
+    db_session.execute(update(User).where(User.email == "admin@example.com").values(role="admin"))
+    db_session.commit()
+    return headers
+
+def test_access_token_carries_identity_claims(client: TestClient):
+    headers = register_and_login(client, "member@example.com")
+    claims = jwt.decode(headers["Authorization"].split()[1], SECRET_KEY, algorithms=[ALGORITHM])
+    assert claims["user_id"] == 1
+    assert "role" not in claims
+
+def test_cached_user_skips_users_query(client: TestClient, async_session_factory):
+    headers = register_and_login(client, "member@example.com")
+    assert client.get("/users/me", headers=headers).status_code == 200
+
+    statements = []
+    engine = async_session_factory.kw["bind"].sync_engine
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        response = client.get("/users/me", headers=headers)
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    assert response.json()["email"] == "member@example.com"
+    assert not [s for s in statements if "FROM users" in s]
+
+def test_profile_update_is_visible_immediately(client: TestClient):
+    headers = register_and_login(client, "member@example.com")
+    client.get("/users/me", headers=headers)
+
+    client.put("/users/me", json={"name": "Renamed"}, headers=headers)
+
+    assert client.get("/users/me", headers=headers).json()["name"] == "Renamed"
+
+def test_role_change_invalidates_cache(client: TestClient, db_session):
+    admin_headers = make_admin(client, db_session)
+    headers = register_and_login(client, "member@example.com")
+    member_id = client.get("/users/me", headers=headers).json()["id"]
+    assert member_id in user_cache
+
+    response = client.patch(f"/admin/users/{member_id}/role", params={"new_role": "moderator"}, headers=admin_headers)
+    assert response.status_code == 200
+
+    assert member_id not in user_cache
+    assert client.get("/users/me", headers=headers).json()["role"] == "moderator"
+
+def test_deactivation_rejects_token_immediately(client: TestClient, db_session):
+    admin_headers = make_admin(client, db_session)
+    headers = register_and_login(client, "member@example.com")
+    member_id = client.get("/users/me", headers=headers).json()["id"]
+
+    client.post(f"/admin/users/{member_id}/toggle-active", headers=admin_headers)
+
+    assert client.get("/users/me", headers=headers).status_code == 401
+
+class BrokenBrokerBackend(BrokerBackend):
+    async def publish(self, channel, message):
+        raise ConnectionError("redis is down")
+
+def test_broker_outage_does_not_fail_admin_user_updates(client: TestClient, db_session, monkeypatch):
+    admin_headers = make_admin(client, db_session)
+    headers = register_and_login(client, "member@example.com")
+    member_id = client.get("/users/me", headers=headers).json()["id"]
+    monkeypatch.setattr(broker, "backend", BrokenBrokerBackend())
+
+    response = client.patch(f"/admin/users/{member_id}/role", params={"new_role": "moderator"}, headers=admin_headers)
+    assert response.status_code == 200
+    assert client.post(f"/admin/users/{member_id}/toggle-active", headers=admin_headers).status_code == 200
+    assert client.get("/users/me", headers=headers).status_code == 401